@@ -1,118 +0,0 @@
-import pandas as pd
-from statsmodels.tsa.vector_ar.var_model import VAR
-import os
-
-def explore_var_lags(data):
-    """
-    Explores the optimal lag length for a VAR model, builds a VAR model with 5 lags, and evaluates the results.
-    Saves outputs to results/models/.
-    Returns the DataFrame for further processing.
-    """
-    # Ensure the models directory exists
-    os.makedirs("results/models", exist_ok=True)
-
-    # Task 13-14: Select optimal lag length
-    def select_var_lags(vardf, maxlags=8, ic='aic'):
-        """
-        Select the optimal lag length for a VAR model based on an information criterion.
-
-        Parameters:
-        - vardf: pandas DataFrame with time series variables
-        - maxlags: int, maximum number of lags to test (default=8)
-        - ic: str, information criterion to use ('aic', 'bic', 'hqic') (default='aic')
-
-        Returns:
-        - optimal_lag: int, the lag length with the lowest information criterion
-        """
-        # Dictionary to store information criteria values for each lag length
-        ic_values = {}
-
-        # Fit VAR models for each lag length from 1 to maxlags
-        for lag in range(1, maxlags + 1):
-            try:
-                # Fit the VAR model with the current lag length
-                model = VAR(vardf).fit(lag)
-                # Store the information criterion value
-                if ic == 'aic':
-                    ic_values[lag] = model.aic
-                elif ic == 'bic':
-                    ic_values[lag] = model.bic
-                elif ic == 'hqic':
-                    ic_values[lag] = model.hqic
-                else:
-                    raise ValueError("Invalid information criterion. Use 'aic', 'bic', or 'hqic'.")
-            except Exception as e:
-                print(f"Error fitting VAR with {lag} lags: {e}")
-                continue
-
-        # Check if any models were successfully fitted
-        if not ic_values:
-            raise ValueError("No valid VAR models were fitted.")
-
-        # Find the lag length with the minimum information criterion value
-        optimal_lag = min(ic_values, key=ic_values.get)
-        print(f"Optimal lag length based on {ic.upper()}: {optimal_lag}")
-        return optimal_lag
-
-    # Run the function to find the optimal lag length
-    vardf = data[['unempgr', 'dfedrate', 'inflat']]
-    optimal_lag = select_var_lags(vardf, maxlags=8, ic='aic')
-    with open("results/models/lag_selection.txt", "w") as f:
-        f.write(f"Optimal lag length based on AIC: {optimal_lag}\n")
-
-    # Build VAR model with 5 lags and evaluate
-    model = VAR(vardf)
-    results = model.fit(maxlags=5)  # Build with 5 lags as specified
-    print("VAR Model Summary (5 lags):")
-    print(results.summary())
-
-    # Save VAR model summary and interpretation
-    with open("results/models/var_model_summary_5_lags.txt", "w") as f:
-        f.write(str(results.summary()))
-    with open("results/models/var_model_interpretation_5_lags.txt", "w") as f:
-        f.write("VAR Model Interpretation (5 lags):\n\n")
-        for var in results.names:
-            f.write(f"Equation for {var}:\n")
-            for lag in range(1, 6):
-                for exog_var in results.names:
-                    coef = results.params[f"L{lag}.{exog_var}"][var]
-                    pval = results.pvalues[f"L{lag}.{exog_var}"][var]
-                    f.write(f"  L{lag}.{exog_var}: Coefficient = {coef:.4f}, p-value = {pval:.4f}\n")
-            f.write("\n")
-
-    # Show that model.select_order suggests 5 lags is a great choice
-    model_comparison = model.select_order(maxlags=8)
-    print("\nModel Comparison for Lag Selection (AIC):")
-    print(model_comparison.summary())
-    with open("results/models/model_comparison.txt", "w") as f:
-        f.write("Model Comparison for Lag Selection (AIC):\n")
-        f.write(str(model_comparison.summary()))
-
-    # Comments on the results
-    comments = """
-Comments on VAR Model with 5 Lags:
-- The model summary shows the coefficients and p-values for each lag up to 5 lags.
-- For unempgr equation, the lagged values of dfedrate (e.g., L1.dfedrate) have significant p-values (< 0.05), indicating that past changes in the federal funds rate influence unemployment growth.
-- For inflat equation, the coefficients for lagged dfedrate are not consistently significant, suggesting limited predictive power, consistent with later Granger Causality findings.
-- The model.select_order() output suggests that 5 lags minimize the AIC, confirming that 5 lags is a reasonable choice for capturing the dynamics of the system.
-"""
-    with open("results/models/lag_selection_comments.txt", "w") as f:
-        f.write(comments)
-
-    return vardf
-
-if __name__ == "__main__":
-    from import_data import import_data
-    from merge_data import merge_data
-    from eda import perform_eda
-    from stationarity_test import test_stationarity
-    from feature_engineering import feature_engineering
-    from stationarity_check import check_stationarity
-    unemp_q, inflat_q, fedfund_q = import_data()
-    df = merge_data(unemp_q, inflat_q, fedfund_q)
-    df = perform_eda(df)
-    df = test_stationarity(df)
-    df = feature_engineering(df)
-    stationary_df = check_stationarity(df)
-    vardf = explore_var_lags(stationary_df)
-    print("Lag exploration and VAR model building completed")
\ No newline at end of file
@@ -0,0 +1,8 @@
+"""
+Evaluating monetary policy impact on inflation and unemployment using a VAR model.
+
+The package is imported by the `monetary-var` command before any subcommand runs, so it
+deliberately imports nothing: each stage module is loaded only when it is needed.
+"""
+
+__version__ = "0.1.0"
@@ -0,0 +1,4 @@
+import sys
+from monetary_var.cli import main
+
+sys.exit(main())
@@ -0,0 +1,119 @@
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from monetary_var.var_lag_sweep import TRENDS
+from monetary_var.tracing import traced
+
+
+def _regressors(history, t, trend):
+    """
+    Regressors of observation t given the preceding rows `history` (oldest first):
+    deterministic terms, then y[t-1], ..., y[t-lags].
+    """
+    row = []
+    if trend in ('c', 'ct'):
+        row.append(1.0)
+    if trend == 'ct':
+        row.append(float(t + 1))
+    return np.concatenate([row, history[::-1].ravel()])
+
+
+def _design_row(values, t, lags, trend):
+    return _regressors(values[t - lags:t], t, trend)
+
+
+def _full_fit(values, first, last, lags, trend):
+    """
+    Least-squares fit on targets first..last-1; returns the inverse cross-product P and coefficients B.
+    """
+    X = np.array([_design_row(values, t, lags, trend) for t in range(first, last)])
+    P = np.linalg.inv(X.T @ X)
+    return P, P @ (X.T @ values[first:last])
+
+
+def _forecast(B, values, origin, lags, steps, trend):
+    history = np.vstack([values[origin - lags:origin], np.empty((steps, values.shape[1]))])
+    for h in range(steps):
+        history[lags + h] = _regressors(history[h:lags + h], origin + h, trend) @ B
+    return history[lags:]
+
+
+def _backtest_chunk(values, origins, lags, steps, window, trend, refit_every):
+    """
+    Forecasts from a run of consecutive origins. The first origin is fitted directly; every
+    later origin updates the previous fit recursively (Sherman-Morrison rank-one updates of
+    the inverse cross-product): the newest observation is added and, for rolling windows,
+    the oldest one is dropped. A full refit every refit_every origins bounds numerical drift.
+    """
+    forecasts = np.empty((len(origins), steps, values.shape[1]))
+    P = B = None
+    for i, origin in enumerate(origins):
+        first = lags if window is None else origin - window + lags
+        if P is None or i % refit_every == 0:
+            P, B = _full_fit(values, first, origin, lags, trend)
+        else:
+            # Add the observation that entered the sample
+            x = _design_row(values, origin - 1, lags, trend)
+            Px = P @ x
+            gain = Px / (1.0 + x @ Px)
+            B = B + np.outer(gain, values[origin - 1] - x @ B)
+            P = P - np.outer(gain, Px)
+            if window is not None:
+                # Drop the observation that left the rolling window
+                x = _design_row(values, first - 1, lags, trend)
+                Px = P @ x
+                gain = Px / (1.0 - x @ Px)
+                B = B - np.outer(gain, values[first - 1] - x @ B)
+                P = P + np.outer(gain, Px)
+        forecasts[i] = _forecast(B, values, origin, lags, steps, trend)
+    return forecasts
+
+
+@traced("backtest")
+def backtest(data, lags=3, steps=8, min_train=40, window=None, trend='c', refit_every=40, n_jobs=1):
+    """
+    Rolling-origin backtest of a VAR model: h-step forecasts from every origin in the sample.
+
+    Parameters:
+    - data: pandas DataFrame with the (stationary) time series variables
+    - lags: int, VAR lag order (default=3)
+    - steps: int, forecast horizon (default=8)
+    - min_train: int, observations in the first training sample of an expanding backtest (default=40)
+    - window: int, optional, fixed training window length for a rolling backtest
+      (default=None, expanding window)
+    - trend: str, 'n', 'c' or 'ct' (default='c')
+    - refit_every: int, origins between full refits that reset the recursive updates (default=40)
+    - n_jobs: int, number of worker processes origins are split across (default=1, in process)
+
+    Returns:
+    - forecasts: NumPy array with shape (n_origins, steps, k), origin x horizon x variable
+    - actuals: NumPy array with the realised values, same shape as forecasts
+    - origins: DatetimeIndex (or index) of the last training observation of each origin
+
+    Only origins with all `steps` realised values are included, so forecasts and actuals can be
+    passed straight to calculate_forecast_metrics.
+    """
+    if trend not in TRENDS:
+        raise ValueError("Invalid trend. Use 'n', 'c' or 'ct'.")
+    values = np.asarray(data.values, dtype=float)
+    nobs, k = values.shape
+    first_origin = window if window is not None else min_train
+    n_params = TRENDS[trend] + k * lags
+    if first_origin - lags <= n_params:
+        raise ValueError("Training sample is too short for the number of lags and variables.")
+    origins = np.arange(first_origin, nobs - steps + 1)
+    if len(origins) == 0:
+        raise ValueError("Not enough observations for a single backtest origin.")
+
+    chunks = [c for c in np.array_split(origins, max(1, n_jobs)) if len(c)]
+    args = (lags, steps, window, trend, refit_every)
+    if len(chunks) == 1:
+        forecasts = _backtest_chunk(values, origins, *args)
+    else:
+        with ProcessPoolExecutor(max_workers=len(chunks)) as pool:
+            parts = pool.map(_backtest_chunk, [values] * len(chunks), chunks,
+                             *[[a] * len(chunks) for a in args])
+            forecasts = np.concatenate(list(parts))
+
+    actuals = np.stack([values[o:o + steps] for o in origins])
+    return forecasts, actuals, data.index[origins - 1]
@@ -0,0 +1,235 @@
+import json
+import os
+import re
+import sys
+import time
+import traceback
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import redirect_stdout
+from datetime import datetime
+import pandas as pd
+from monetary_var.fred_cache import DEFAULT_CACHE_DIR
+
+# A manifest is a JSON list of datasets (or {"datasets": [...]}), each naming its FRED series:
+#   {"name": "uk", "unemployment": "LRHUTTTTGBM156S", "inflation": "CPALTT01GBM659N",
+#    "policy_rate": "IRSTCI01GBM156N", "start": "1980-01-01", "end": "2019-12-31"}
+# start and end are optional (default: the 1970-2019 sample of import_data).
+SERIES_KEYS = ('unemployment', 'inflation', 'policy_rate')
+COLUMNS = ['unempgr', 'dfedrate', 'inflat']
+GRANGER_PAIRS = [('dfedrate', 'unempgr'), ('dfedrate', 'inflat'), ('unempgr', 'inflat')]
+
+
+def load_manifest(path):
+    """
+    Reads and validates a batch manifest.
+
+    Parameters:
+    - path: str, JSON file with a list of dataset definitions (see the top of this module)
+
+    Returns:
+    - list of dict, one per dataset
+    """
+    with open(path) as f:
+        manifest = json.load(f)
+    datasets = manifest['datasets'] if isinstance(manifest, dict) else manifest
+    names = set()
+    for dataset in datasets:
+        name = dataset.get('name', '')
+        if not re.fullmatch(r"[A-Za-z0-9_.-]+", name) or name in ('.', '..'):
+            raise ValueError(f"Dataset names must be unique plain directory names, got {name!r}")
+        if name in names:
+            raise ValueError(f"Duplicate dataset name {name!r} in {path}")
+        missing = [key for key in SERIES_KEYS if key not in dataset]
+        if missing:
+            raise ValueError(f"Dataset {name!r} does not name its {', '.join(missing)} series")
+        names.add(name)
+    return datasets
+
+
+def _import_kwargs(dataset):
+    """
+    Translates a manifest entry into keyword arguments for import_data.
+    """
+    kwargs = {'series_ids': tuple(dataset[key] for key in SERIES_KEYS)}
+    for key in ('start', 'end'):
+        if key in dataset:
+            kwargs[key] = datetime.fromisoformat(dataset[key])
+    return kwargs
+
+
+def summarize(artifacts):
+    """
+    Extracts the key results of one pipeline run: the lag order chosen by AIC, the pairwise
+    Granger causality p-values (lag 3, as in granger_causality) and the forecast accuracy in levels.
+
+    Parameters:
+    - artifacts: dict, artifacts returned by main.main for the full pipeline
+
+    Returns:
+    - dict mapping summary column names to values
+    """
+    from monetary_var.var_lag_sweep import lag_sweep, select_lag
+    from monetary_var.granger_matrix import pairwise_granger
+    from monetary_var.evaluate_forecast import calculate_forecast_metrics
+
+    vardf = artifacts['vardf']
+    row = {'nobs': len(vardf), 'lag_aic': select_lag(lag_sweep(vardf, maxlags=8), ic='aic')}
+
+    pairwise = pairwise_granger(artifacts['train'][COLUMNS][1:], maxlag=3)
+    for cause, effect in GRANGER_PAIRS:
+        i, j = pairwise['names'].index(cause), pairwise['names'].index(effect)
+        row[f"granger_p_{cause}_{effect}"] = float(pairwise['F_pvalue'][2, i, j])
+
+    forecast = artifacts['df_fc_levels'][COLUMNS]
+    metrics = calculate_forecast_metrics(forecast, artifacts['test_levels'][COLUMNS])
+    for var in COLUMNS:
+        row[f"rmse_{var}"] = metrics[var]['RMSE']
+        row[f"mae_{var}"] = metrics[var]['MAE']
+    return row
+
+
+def run_job(dataset, output_dir, fred_cache_dir, no_plots=False):
+    """
+    Runs the full pipeline for one dataset in its own directory, output_dir/<name>, which holds
+    its results/, stage cache and log. Stages run serially: the batch parallelises across jobs.
+    Errors are caught and reported in the returned row, so one failing dataset never stops the batch.
+
+    Parameters:
+    - dataset: dict, manifest entry
+    - output_dir: str, absolute batch output directory
+    - fred_cache_dir: str, absolute path of the FRED cache shared by all jobs
+    - no_plots: bool, skip all plots (default=False)
+
+    Returns:
+    - dict, the summary row of the job (see summarize) with 'status', 'error' and 'seconds'
+    """
+    from monetary_var import plotting
+    from monetary_var.main import main
+
+    started = time.perf_counter()
+    job_dir = os.path.join(output_dir, dataset['name'])
+    os.makedirs(job_dir, exist_ok=True)
+    os.environ['FRED_CACHE_DIR'] = fred_cache_dir
+    # All jobs record into one results store, each run labelled with its dataset
+    os.environ['VAR_RESULTS_DB'] = os.path.join(output_dir, "results.db")
+    cwd = os.getcwd()
+    os.chdir(job_dir)
+    try:
+        with open("pipeline.log", "w") as log, redirect_stdout(log):
+            artifacts = main(serial=True, no_plots=no_plots, dataset=_import_kwargs(dataset),
+                             run_label=dataset['name'])
+            row = summarize(artifacts)
+        row.update(status='ok', error='')
+    except Exception as error:
+        with open("error.txt", "w") as f:
+            f.write(traceback.format_exc())
+        row = {'status': 'failed', 'error': f"{type(error).__name__}: {error}"}
+    finally:
+        # The plot pool of this worker would otherwise keep it alive when the batch pool shuts down
+        plotting.shutdown_plots()
+        os.chdir(cwd)
+    row['seconds'] = round(time.perf_counter() - started, 2)
+    return row
+
+
+def _run_jobs(datasets, max_workers, output_dir, fred_cache_dir, no_plots, report):
+    """
+    Runs jobs on a process pool with at most max_workers submitted at a time, so the jobs in
+    flight when a worker dies (which breaks the pool) are known. The pool is then replaced and
+    the remaining jobs carry on.
+
+    Returns:
+    - dict of summary rows by dataset name, and the list of datasets in flight when a pool broke
+    """
+    queue = deque(datasets)
+    rows, crashed = {}, []
+    while queue:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            running = {}
+            while queue or running:
+                while queue and len(running) < max_workers:
+                    dataset = queue.popleft()
+                    running[pool.submit(run_job, dataset, output_dir, fred_cache_dir, no_plots)] = dataset
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                broken = False
+                for future in done:
+                    dataset = running.pop(future)
+                    try:
+                        rows[dataset['name']] = future.result()
+                    except BrokenProcessPool:
+                        broken = True
+                        crashed.append(dataset)
+                        continue
+                    except Exception as error:
+                        rows[dataset['name']] = {'status': 'failed', 'error': f"{type(error).__name__}: {error}"}
+                    report(dataset['name'], rows[dataset['name']])
+                if broken:
+                    # Every job still in flight went down with the pool
+                    crashed.extend(running.values())
+                    break
+    return rows, crashed
+
+
+def run_batch(datasets, output_dir="results/batch", max_workers=2, fred_cache_dir=None,
+              no_plots=False):
+    """
+    Runs the pipeline for many datasets (countries, series sets) on a process pool and collects
+    their key outputs into one table.
+
+    At most max_workers pipelines run at once. Each job writes under output_dir/<name>/ so runs
+    never overwrite each other, while all jobs share one FRED cache and record into one results
+    store, output_dir/results.db, with runs labelled by dataset name. A job that raises is recorded
+    as failed and the others carry on. A worker that dies (crash, out of memory) takes down the
+    jobs running beside it: the pool is replaced for the jobs not started yet, and the jobs that
+    were in flight are run again one at a time, so only the one whose worker dies on its own is
+    recorded as failed.
+
+    Parameters:
+    - datasets: list of dict, dataset definitions (see load_manifest)
+    - output_dir: str, batch output directory (default='results/batch')
+    - max_workers: int, maximum number of concurrent pipelines (default=2)
+    - fred_cache_dir: str, optional, FRED cache directory (default: FRED_CACHE_DIR or data/fred_cache)
+    - no_plots: bool, skip all plots (default=False)
+
+    Returns:
+    - DataFrame indexed by dataset name, also saved as output_dir/summary.csv and summary.txt
+    """
+    output_dir = os.path.abspath(output_dir)
+    fred_cache_dir = os.path.abspath(fred_cache_dir or os.environ.get("FRED_CACHE_DIR", DEFAULT_CACHE_DIR))
+    os.makedirs(output_dir, exist_ok=True)
+
+    def report(name, row):
+        print(f"[{row['status']:>7}] {name}" + (f": {row['error']}" if row['status'] != 'ok' else ""))
+
+    rows, crashed = _run_jobs(datasets, max_workers, output_dir, fred_cache_dir, no_plots, report)
+    for dataset in crashed:
+        # Alone in its own pool: a broken pool now means this job killed its worker
+        retried, lost = _run_jobs([dataset], 1, output_dir, fred_cache_dir, no_plots, report)
+        rows.update(retried)
+        if lost:
+            rows[dataset['name']] = {'status': 'failed', 'error': "BrokenProcessPool: the worker process died"}
+            report(dataset['name'], rows[dataset['name']])
+
+    # Rows in manifest order, status columns first
+    summary = pd.DataFrame.from_dict(rows, orient='index').reindex([d['name'] for d in datasets])
+    summary.index.name = 'dataset'
+    first = ['status', 'seconds']
+    summary = summary.reindex(columns=first + [c for c in summary.columns if c not in first + ['error']] + ['error'])
+    for column in ('nobs', 'lag_aic'):
+        if column in summary:
+            summary[column] = summary[column].astype('Int64')
+    summary.to_csv(os.path.join(output_dir, "summary.csv"))
+    with open(os.path.join(output_dir, "summary.txt"), "w") as f:
+        f.write(summary.drop(columns='error').to_string(float_format=lambda x: f"{x:.4f}"))
+        failed = summary[summary['status'] != 'ok']
+        for name, error in failed['error'].items():
+            f.write(f"\n{name}: {error}")
+        f.write("\n")
+    return summary
+
+
+if __name__ == "__main__":
+    summary = run_batch(load_manifest(sys.argv[1]))
+    print(summary.drop(columns='error').to_string())
@@ -0,0 +1,292 @@
+import numpy as np
+import pandas as pd
+from scipy.linalg import cho_factor, cho_solve
+from scipy.special import multigammaln
+from monetary_var.var_cache import frame_hash
+from monetary_var.var_lag_sweep import lag_design, TRENDS
+from monetary_var.tracing import traced
+
+# Cross-products of recent datasets, so every prior on the same data reuses one pass over it
+_CROSS_CACHE = {}
+_CROSS_CACHE_SIZE = 16
+
+DEFAULT_LAMBDAS = np.geomspace(0.01, 5.0, 30)
+
+
+def cross_products(data, maxlags, trend='c'):
+    """
+    Computes (once per dataset) everything a conjugate VAR posterior needs from the data:
+    Z'Z, Z'Y and Y'Y of the max-lag design on its common sample, and the residual standard
+    deviation of a univariate AR(maxlags) per variable (the scale of the Minnesota prior).
+    Because the lag p design is a leading block of columns of the max-lag design, the
+    cross-products of every lag order are leading blocks of these.
+
+    Parameters:
+    - data: pandas DataFrame with the (stationary) time series variables
+    - maxlags: int, largest lag order
+    - trend: str, 'n', 'c' or 'ct' (default='c')
+
+    Returns:
+    - dict with ZZ, ZY, YY, nobs, k, ntrend, maxlags and sigma (AR residual std per variable)
+    """
+    key = (frame_hash(data), maxlags, trend)
+    if key in _CROSS_CACHE:
+        return _CROSS_CACHE[key]
+    Z, Y = lag_design(data.values, maxlags, trend, full_rank=False)
+    T, k = Y.shape
+    ntrend = TRENDS[trend]
+    sigma = np.empty(k)
+    for j in range(k):
+        own = np.hstack([Z[:, :ntrend], Z[:, ntrend + j::k]])
+        resid = Y[:, j] - own @ np.linalg.lstsq(own, Y[:, j], rcond=None)[0]
+        sigma[j] = np.sqrt(resid @ resid / max(T - own.shape[1], 1))
+    cp = {'ZZ': Z.T @ Z, 'ZY': Z.T @ Y, 'YY': Y.T @ Y, 'nobs': T, 'k': k,
+          'ntrend': ntrend, 'maxlags': maxlags, 'sigma': sigma}
+    if len(_CROSS_CACHE) >= _CROSS_CACHE_SIZE:
+        _CROSS_CACHE.pop(next(iter(_CROSS_CACHE)))
+    _CROSS_CACHE[key] = cp
+    return cp
+
+
+def minnesota_prior(sigma, lags, ntrend, lam, lag_decay=1.0, own_lag_mean=0.0, const_var=1e6):
+    """
+    Conjugate (normal-inverse-Wishart) Minnesota prior B | S ~ MN(B0, S (x) diag(omega)),
+    S ~ IW(S0, nu0).
+
+    The prior standard deviation of the coefficient on lag l of variable j in equation i is
+    lam / l**lag_decay * sigma_i / sigma_j (sigma_i enters through S, whose prior mean is
+    diag(sigma**2)); deterministic terms get a diffuse prior.
+
+    Parameters:
+    - sigma: NumPy array, scale of each variable (AR residual standard deviations)
+    - lags: int, lag order
+    - ntrend: int, number of deterministic terms
+    - lam: float, overall tightness (smaller shrinks harder towards B0)
+    - lag_decay: float, how fast the prior tightens with the lag (default=1.0)
+    - own_lag_mean: float, prior mean of each variable's own first lag (default=0.0, for stationary data;
+      use 1.0 for random walks)
+    - const_var: float, prior variance of deterministic terms (default=1e6)
+
+    Returns:
+    - (B0, omega, S0, nu0)
+    """
+    k = len(sigma)
+    B0 = np.zeros((ntrend + k * lags, k))
+    B0[ntrend + np.arange(k), np.arange(k)] = own_lag_mean
+    lag = np.repeat(np.arange(1, lags + 1), k)
+    omega = np.concatenate([np.full(ntrend, const_var),
+                            (lam / (lag ** lag_decay * np.tile(sigma, lags))) ** 2])
+    nu0 = k + 2
+    S0 = np.diag(sigma ** 2) * (nu0 - k - 1)
+    return B0, omega, S0, nu0
+
+
+def _posterior(ZZ, ZY, YY, T, B0, omega, S0, nu0):
+    """
+    Closed-form conjugate posterior and log marginal likelihood from cross-products.
+    """
+    k = YY.shape[0]
+    prec = ZZ + np.diag(1.0 / omega)
+    factor = cho_factor(prec, lower=True)
+    Bn = cho_solve(factor, B0 / omega[:, None] + ZY)
+    Sn = S0 + YY + B0.T @ (B0 / omega[:, None]) - Bn.T @ prec @ Bn
+    Sn = (Sn + Sn.T) / 2
+    nun = nu0 + T
+    logdet_prec = 2 * np.log(np.diag(factor[0])).sum()
+    log_ml = (-T * k / 2 * np.log(np.pi)
+              + multigammaln(nun / 2, k) - multigammaln(nu0 / 2, k)
+              - k / 2 * (logdet_prec + np.log(omega).sum())
+              + nu0 / 2 * np.linalg.slogdet(S0)[1] - nun / 2 * np.linalg.slogdet(Sn)[1])
+    return Bn, factor, Sn, nun, log_ml
+
+
+def log_marginal_likelihood(cp, lags, lams=DEFAULT_LAMBDAS, **prior):
+    """
+    Log marginal likelihood of the lag `lags` model for every tightness in lams, on the common
+    sample of the cross-products (so different lag orders are comparable). Only k x k and
+    m x m algebra per grid point: the data are never touched again.
+
+    Parameters:
+    - cp: dict from cross_products(); lags must not exceed cp['maxlags']
+    - lags: int, lag order
+    - lams: array-like, overall tightness values (default: 30 values from 0.01 to 5)
+    - **prior: further minnesota_prior options (lag_decay, own_lag_mean, const_var)
+
+    Returns:
+    - pandas Series of log marginal likelihoods indexed by lambda
+    """
+    m = cp['ntrend'] + cp['k'] * lags
+    ZZ, ZY = cp['ZZ'][:m, :m], cp['ZY'][:m]
+    values = []
+    for lam in lams:
+        B0, omega, S0, nu0 = minnesota_prior(cp['sigma'], lags, cp['ntrend'], lam, **prior)
+        values.append(_posterior(ZZ, ZY, cp['YY'], cp['nobs'], B0, omega, S0, nu0)[-1])
+    return pd.Series(values, index=pd.Index(np.asarray(lams, dtype=float), name='lambda'),
+                     name='log_ml')
+
+
+class BayesianVARResults:
+    """
+    Posterior of a conjugate Minnesota BVAR, with the parts of statsmodels' VARResults the
+    pipeline uses: params (posterior mean, rows 'const', 'L1.x', ...), stderr (posterior
+    standard deviations), coefs, intercept, k_ar, names, nobs, sigma_u (posterior mean),
+    forecast() and summary(). Adds posterior_draws(), simulate_forecast() and
+    forecast_interval() for predictive densities.
+    """
+    def __init__(self, Bn, factor, Sn, nun, names, k_ar, trend, lam, log_ml, log_ml_grid, n_totobs):
+        k = len(names)
+        ntrend = TRENDS[trend]
+        rows = ['const', 'trend'][:ntrend] + [f"L{lag}.{name}" for lag in range(1, k_ar + 1) for name in names]
+        self.names = list(names)
+        self.neqs = k
+        self.k_ar = k_ar
+        self.trend = trend
+        self.k_trend = ntrend
+        self.lam = lam
+        self.log_ml = log_ml
+        self.log_ml_grid = log_ml_grid
+        self.n_totobs = n_totobs
+        self.nobs = n_totobs - k_ar
+        self.Bn, self.Sn, self.nun = Bn, Sn, nun
+        # Posterior covariance of B's rows: Omega_n = (Omega0^-1 + Z'Z)^-1
+        self.omega_n = cho_solve(factor, np.eye(len(Bn)))
+        sigma_mean = Sn / (nun - k - 1)
+        self.params = pd.DataFrame(Bn, index=rows, columns=self.names)
+        self.stderr = pd.DataFrame(np.sqrt(np.outer(np.diag(self.omega_n), np.diag(sigma_mean))),
+                                   index=rows, columns=self.names)
+        self.sigma_u = pd.DataFrame(sigma_mean, index=self.names, columns=self.names)
+        self.coefs = Bn[ntrend:].reshape(k_ar, k, k).transpose(0, 2, 1)
+        self.intercept = Bn[0] if trend in ('c', 'ct') else np.zeros(k)
+
+    def _regressors(self, history, h):
+        """
+        Regressor rows (n, m) for forecast step h from histories of shape (n, k_ar + steps, k).
+        """
+        n = history.shape[0]
+        deterministic = np.tile([1.0, float(self.n_totobs + h + 1)][:self.k_trend], (n, 1))
+        lagged = history[:, h:self.k_ar + h][:, ::-1].reshape(n, -1)
+        return np.hstack([deterministic, lagged])
+
+    def forecast(self, y, steps):
+        """
+        Iterated point forecasts at the posterior mean, like VARResults.forecast.
+
+        Parameters:
+        - y: array-like, the last k_ar observations (oldest first)
+        - steps: int, number of periods to forecast
+
+        Returns:
+        - NumPy array with shape (steps, k)
+        """
+        y = np.asarray(y, dtype=float)[-self.k_ar:]
+        history = np.concatenate([y, np.empty((steps, self.neqs))])[None]
+        for h in range(steps):
+            history[:, self.k_ar + h] = self._regressors(history, h) @ self.Bn
+        return history[0, self.k_ar:]
+
+    def posterior_draws(self, n_draws=1000, seed=None):
+        """
+        Draws (B, S) from the posterior, all draws at once. S^-1 ~ Wishart(Sn^-1, nun) uses
+        the Bartlett decomposition S^-1 = (L A)(L A)' with L = chol(Sn^-1) and A lower
+        triangular (chi draws on the diagonal, normals below), so S = R R' with
+        R = (L A)^-T; then B = Bn + chol(Omega_n) E R' with E standard normal.
+
+        Parameters:
+        - n_draws: int, number of draws (default=1000)
+        - seed: int or numpy Generator, optional, random seed
+
+        Returns:
+        - (B, S, R): arrays with shapes (n_draws, m, k), (n_draws, k, k) and (n_draws, k, k),
+          R being a square root of each S
+        """
+        rng = np.random.default_rng(seed)
+        k, m = self.neqs, len(self.Bn)
+        L = np.linalg.cholesky(np.linalg.inv(self.Sn))
+        A = np.tril(rng.standard_normal((n_draws, k, k)), -1)
+        A[:, np.arange(k), np.arange(k)] = np.sqrt(rng.chisquare(self.nun - np.arange(k), size=(n_draws, k)))
+        R = np.linalg.inv(L @ A).transpose(0, 2, 1)
+        S = R @ R.transpose(0, 2, 1)
+        P = np.linalg.cholesky(self.omega_n)
+        # chol(Omega_n) E for all draws as one (m x m) @ (m x n_draws * k) product
+        PE = (P @ rng.standard_normal((m, n_draws * k))).reshape(m, n_draws, k).transpose(1, 0, 2)
+        B = self.Bn + PE @ R.transpose(0, 2, 1)
+        return B, S, R
+
+    def simulate_forecast(self, y, steps, n_draws=1000, seed=None):
+        """
+        Simulates the predictive distribution: for every posterior draw (B, S), iterates the
+        VAR forward with N(0, S) shocks. All draws are simulated together.
+
+        Parameters:
+        - y: array-like, the last k_ar observations (oldest first)
+        - steps: int, number of periods to forecast
+        - n_draws: int, number of simulated paths (default=1000)
+        - seed: int, optional, random seed
+
+        Returns:
+        - NumPy array with shape (n_draws, steps, k)
+        """
+        rng = np.random.default_rng(seed)
+        B, _, R = self.posterior_draws(n_draws, rng)
+        shocks = np.einsum('nsi,nji->nsj', rng.standard_normal((n_draws, steps, self.neqs)), R)
+        y = np.asarray(y, dtype=float)[-self.k_ar:]
+        history = np.concatenate([np.broadcast_to(y, (n_draws, self.k_ar, self.neqs)),
+                                  np.empty((n_draws, steps, self.neqs))], axis=1)
+        for h in range(steps):
+            history[:, self.k_ar + h] = np.einsum('nm,nmk->nk', self._regressors(history, h), B) + shocks[:, h]
+        return history[:, self.k_ar:]
+
+    def forecast_interval(self, y, steps, alpha=0.05, n_draws=1000, seed=None):
+        """
+        Point forecasts with predictive bands, like VARResults.forecast_interval.
+
+        Returns:
+        - (point, lower, upper), each with shape (steps, k): the posterior-mean forecast and the
+          alpha/2 and 1 - alpha/2 quantiles of the simulated predictive distribution
+        """
+        paths = self.simulate_forecast(y, steps, n_draws, seed)
+        lower, upper = np.quantile(paths, [alpha / 2, 1 - alpha / 2], axis=0)
+        return self.forecast(y, steps), lower, upper
+
+    def summary(self):
+        """
+        Returns a text summary: hyperparameters and posterior means (standard deviations).
+        """
+        lines = [f"Bayesian VAR, Minnesota normal-inverse-Wishart prior, {self.k_ar} lags",
+                 f"lambda = {self.lam:.4g}, log marginal likelihood = {self.log_ml:.4f}, nobs = {self.nobs}",
+                 ""]
+        for name in self.names:
+            lines.append(f"Equation for {name}: posterior mean (posterior std)")
+            for row in self.params.index:
+                lines.append(f"  {row:<20}{self.params.loc[row, name]:>12.4f} ({self.stderr.loc[row, name]:.4f})")
+            lines.append("")
+        lines.append("Posterior mean of the residual covariance:")
+        lines.append(self.sigma_u.round(6).to_string())
+        return "\n".join(lines) + "\n"
+
+
+@traced("bayesian_var")
+def bayesian_var(data, lags, lam=None, lams=DEFAULT_LAMBDAS, trend='c', **prior):
+    """
+    Fits a conjugate Bayesian VAR with a Minnesota prior (see minnesota_prior). The posterior is
+    in closed form, so there is no sampling in the fit. Unless lam is given, the overall
+    tightness maximises the marginal likelihood over the lams grid; every grid point reuses
+    the cached cross-products of the data.
+
+    Parameters:
+    - data: pandas DataFrame with the (stationary) time series variables
+    - lags: int, lag order
+    - lam: float, optional, fixed overall tightness
+    - lams: array-like, tightness grid for marginal likelihood selection (default: 30 values from 0.01 to 5)
+    - trend: str, 'n', 'c' or 'ct' (default='c')
+    - **prior: further minnesota_prior options (lag_decay, own_lag_mean, const_var)
+
+    Returns:
+    - BayesianVARResults
+    """
+    cp = cross_products(data, lags, trend)
+    grid = log_marginal_likelihood(cp, lags, [lam] if lam is not None else lams, **prior)
+    best = float(grid.idxmax())
+    B0, omega, S0, nu0 = minnesota_prior(cp['sigma'], lags, cp['ntrend'], best, **prior)
+    Bn, factor, Sn, nun, log_ml = _posterior(cp['ZZ'], cp['ZY'], cp['YY'], cp['nobs'], B0, omega, S0, nu0)
+    return BayesianVARResults(Bn, factor, Sn, nun, data.columns, lags, trend, best, log_ml, grid, len(data))
@@ -0,0 +1,275 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+import numpy as np
+import pandas as pd
+
+# Benchmark suite: times the pipeline stages on simulated VAR data across a grid of sizes,
+# records peak memory, and compares against a stored baseline to flag regressions.
+# Nothing here touches FRED, so results only depend on the code and the machine.
+
+BASELINE = "results/benchmarks/baseline.json"
+LATEST = "results/benchmarks/latest.json"
+
+# The first three simulated variables carry the pipeline's names, so stages that select them
+# (granger_causality) run unchanged; further variables are named x4, x5, ...
+NAMES = ['unempgr', 'dfedrate', 'inflat']
+
+GRID = {'nobs': [200, 1000, 5000], 'neqs': [3, 6, 12], 'lags': [2]}
+QUICK_GRID = {'nobs': [200, 800], 'neqs': [3, 6], 'lags': [2]}
+
+
+def simulate_var(nobs, neqs=3, lags=2, seed=0, radius=0.9, burn=200):
+    """
+    Simulates a stable VAR(p) process with random coefficients and correlated Gaussian shocks.
+
+    The lag matrices are drawn at random and rescaled (A_l -> c**l A_l, which scales every root of
+    the companion matrix by c) so that the largest root has modulus radius.
+
+    Parameters:
+    - nobs: int, number of observations returned
+    - neqs: int, number of variables (default=3)
+    - lags: int, lag order p (default=2)
+    - seed: int, random seed (default=0)
+    - radius: float, modulus of the largest companion root, below 1 for stability (default=0.9)
+    - burn: int, initial observations discarded so the start values do not matter (default=200)
+
+    Returns:
+    - DataFrame with a quarterly DatetimeIndex
+    """
+    rng = np.random.default_rng(seed)
+    coefs = rng.normal(scale=1 / np.sqrt(neqs * lags), size=(lags, neqs, neqs))
+    companion = np.zeros((neqs * lags, neqs * lags))
+    companion[:neqs] = np.hstack(list(coefs))
+    companion[neqs:, :-neqs] = np.eye(neqs * (lags - 1))
+    scale = radius / np.abs(np.linalg.eigvals(companion)).max()
+    coefs *= (scale ** np.arange(1, lags + 1))[:, None, None]
+
+    intercept = rng.normal(scale=0.1, size=neqs)
+    mixing = rng.normal(size=(neqs, neqs))
+    chol = np.linalg.cholesky(0.5 * np.eye(neqs) + 0.5 * mixing @ mixing.T / neqs)
+    shocks = rng.standard_normal((nobs + burn, neqs)) @ chol.T
+
+    y = np.zeros((nobs + burn + lags, neqs))
+    for t in range(lags, len(y)):
+        y[t] = intercept + shocks[t - lags] + sum(coefs[l] @ y[t - l - 1] for l in range(lags))
+
+    names = NAMES[:neqs] + [f"x{i + 1}" for i in range(len(NAMES), neqs)]
+    index = pd.date_range("1970-03-31", periods=nobs, freq="QE")
+    return pd.DataFrame(y[-nobs:], index=index, columns=names)
+
+
+def _clear_caches():
+    """
+    Empties the in-memory result caches, so every repetition measures the computation itself.
+    """
+    from monetary_var import bayesian_var, correlogram, unit_root, var_cache, var_lag_sweep
+    var_cache._FITS.clear()
+    correlogram._CORRELOGRAMS.clear()
+    unit_root._RESULTS.clear()
+    bayesian_var._CROSS_CACHE.clear()
+    var_lag_sweep._SWEEP_CACHE.clear()
+
+
+# Benchmark cases, named after the stages they time. Each maps to (prepare, run):
+# prepare(data) builds the arguments outside the timed region, run(*args) is timed.
+def _select_var_lags(data):
+    from monetary_var.var_lag_sweep import lag_sweep, select_lag
+    return select_lag(lag_sweep(data, maxlags=8), ic='aic')
+
+
+def _compare_var_lags(data):
+    from monetary_var.compare_var_lags import compare_var_lags
+    return compare_var_lags(data, lags_list=[3, 4, 5, 6, 8])
+
+
+def _split_and_model(data):
+    from monetary_var.split_and_model import split_and_model
+    return split_and_model(data)
+
+
+def _granger_causality(data):
+    from monetary_var.granger_causality import granger_causality
+    return granger_causality(data)
+
+
+def _stationarity_tests(data):
+    from monetary_var.unit_root import run_unit_root_tests
+    return run_unit_root_tests({name: data[name] for name in data.columns}, tests=('adf',))
+
+
+def _correlogram(data):
+    from monetary_var.correlogram import correlogram
+    return correlogram(data, nlags=10, cross=True)
+
+
+def _prepare_metrics(data):
+    from monetary_var.split_and_model import split_and_model
+    train, test, df_fc = split_and_model(data)
+    return df_fc, test
+
+
+def _forecast_metrics(forecast, actual):
+    from monetary_var.evaluate_forecast import calculate_forecast_metrics
+    return calculate_forecast_metrics(forecast, actual)
+
+
+CASES = {
+    'select_var_lags': (lambda data: (data,), _select_var_lags),
+    'compare_var_lags': (lambda data: (data,), _compare_var_lags),
+    'split_and_model': (lambda data: (data,), _split_and_model),
+    'granger_causality': (lambda data: (data,), _granger_causality),
+    'stationarity_tests': (lambda data: (data,), _stationarity_tests),
+    'correlogram': (lambda data: (data,), _correlogram),
+    'forecast_metrics': (_prepare_metrics, _forecast_metrics),
+}
+
+
+def time_case(run, args, repeat=3):
+    """
+    Times run(*args): repeat timed calls with cold caches, then one call under tracemalloc for the
+    peak memory (tracing slows the call down, so it is not timed).
+
+    Returns:
+    - dict with 'seconds' (median), 'seconds_min' and 'peak_mb'
+    """
+    times = []
+    for _ in range(repeat):
+        _clear_caches()
+        started = time.perf_counter()
+        run(*args)
+        times.append(time.perf_counter() - started)
+    _clear_caches()
+    tracemalloc.start()
+    try:
+        run(*args)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {'seconds': statistics.median(times), 'seconds_min': min(times), 'peak_mb': peak / 2 ** 20}
+
+
+def cli_startup(repeat=3):
+    """
+    Wall time of `python -m monetary_var --help` in a fresh interpreter (import cost of the CLI).
+    """
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, "-m", "monetary_var", "--help"], check=True,
+                       stdout=subprocess.DEVNULL)
+        times.append(time.perf_counter() - started)
+    return {'seconds': statistics.median(times), 'seconds_min': min(times), 'peak_mb': float('nan')}
+
+
+def run_benchmarks(grid=None, cases=None, repeat=3, seed=0, verbose=True):
+    """
+    Runs every benchmark case for every combination of the size grid.
+
+    Stages run in a scratch directory with their own results store, so benchmarking never touches
+    results/ or the real store; the caches of the fit engines are emptied before each call.
+
+    Parameters:
+    - grid: dict with lists 'nobs', 'neqs' (at least 3) and 'lags' (default: GRID)
+    - cases: list of str, optional, names from CASES to run (default: all, plus 'cli_startup')
+    - repeat: int, timed calls per case and size (default=3)
+    - seed: int, seed of the simulated data (default=0)
+    - verbose: bool, print one line per measurement (default=True)
+
+    Returns:
+    - DataFrame with one row per case and size: case, nobs, neqs, lags, seconds, seconds_min, peak_mb
+    """
+    grid = grid or GRID
+    names = cases or list(CASES) + ['cli_startup']
+    rows = []
+
+    def add(row):
+        rows.append(row)
+        if verbose:
+            size = "" if row['case'] == 'cli_startup' else f" nobs={row['nobs']} neqs={row['neqs']} lags={row['lags']}"
+            print(f"{row['case']:<20}{size:<30}{row['seconds']:>10.4f}s {row['peak_mb']:>9.1f} MB")
+
+    cwd, environ = os.getcwd(), dict(os.environ)
+    with tempfile.TemporaryDirectory() as scratch:
+        os.chdir(scratch)
+        os.environ['VAR_RESULTS_DB'] = os.path.join(scratch, "results.db")
+        for key in ('VAR_RUN_ID', 'UNIT_ROOT_CACHE_DIR'):
+            os.environ.pop(key, None)
+        # No on-disk fit cache: every repetition fits
+        os.environ['VAR_FIT_CACHE_DIR'] = ''
+        try:
+            for nobs in grid['nobs']:
+                for neqs in grid['neqs']:
+                    for lags in grid['lags']:
+                        data = simulate_var(nobs, neqs, lags, seed=seed)
+                        for name in names:
+                            if name not in CASES:
+                                continue
+                            prepare, run = CASES[name]
+                            with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+                                result = time_case(run, prepare(data), repeat)
+                            add({'case': name, 'nobs': nobs, 'neqs': neqs, 'lags': lags, **result})
+        finally:
+            os.chdir(cwd)
+            os.environ.clear()
+            os.environ.update(environ)
+    if 'cli_startup' in names:
+        # Process start-up is noisier than in-process timings: take more samples
+        add({'case': 'cli_startup', 'nobs': 0, 'neqs': 0, 'lags': 0, **cli_startup(max(repeat, 10))})
+    return pd.DataFrame(rows)
+
+
+def save_results(results, path=LATEST):
+    """
+    Saves benchmark results as JSON (records), e.g. as the baseline.
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as f:
+        json.dump({'created': time.strftime("%Y-%m-%dT%H:%M:%S"), 'python': sys.version.split()[0],
+                   'results': results.to_dict(orient='records')}, f, indent=1)
+
+
+def load_results(path=BASELINE):
+    """
+    Loads benchmark results saved by save_results.
+    """
+    with open(path) as f:
+        return pd.DataFrame(json.load(f)['results'])
+
+
+def compare(results, baseline, tolerance=0.25, min_seconds=0.01):
+    """
+    Compares benchmark results with a baseline.
+
+    Times are compared on the fastest call (seconds_min), the least noisy estimate of the cost of
+    the code itself. A measurement is a regression when that time exceeds the baseline by more
+    than tolerance (relative), or its peak memory does. Timings below min_seconds in both runs
+    are too noisy to judge and are never flagged.
+
+    Parameters:
+    - results, baseline: DataFrames from run_benchmarks / load_results
+    - tolerance: float, allowed relative slowdown (default=0.25)
+    - min_seconds: float, noise floor for timings (default=0.01)
+
+    Returns:
+    - DataFrame of the measurements present in both, with time and memory ratios and a 'regression' flag
+    """
+    keys = ['case', 'nobs', 'neqs', 'lags']
+    merged = results.merge(baseline, on=keys, suffixes=('', '_baseline'))
+    merged['time_ratio'] = merged['seconds_min'] / merged['seconds_min_baseline']
+    merged['memory_ratio'] = merged['peak_mb'] / merged['peak_mb_baseline']
+    timed = merged[['seconds_min', 'seconds_min_baseline']].max(axis=1) >= min_seconds
+    merged['regression'] = ((merged['time_ratio'] > 1 + tolerance) & timed) | (merged['memory_ratio'] > 1 + tolerance)
+    return merged[keys + ['seconds_min', 'seconds_min_baseline', 'time_ratio', 'peak_mb', 'peak_mb_baseline',
+                          'memory_ratio', 'regression']]
+
+
+if __name__ == "__main__":
+    results = run_benchmarks(QUICK_GRID if "--quick" in sys.argv else GRID)
+    save_results(results)
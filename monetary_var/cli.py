@@ -0,0 +1,370 @@
+import argparse
+import csv
+import os
+import sys
+
+# Only the standard library is imported here: pandas, statsmodels and matplotlib are loaded
+# inside the subcommands that need them, so `--help` and the cached commands start instantly.
+# Reports are rendered from the results store (reports.py), which needs only sqlite3.
+
+FORECAST_CSV = "results/models/forecast.csv"
+ONLINE_FORECAST_CSV = "results/models/online_forecast.csv"
+SCENARIOS_CSV = "results/models/scenarios.csv"
+LEADERBOARD_CSV = "results/models/model_search.csv"
+LEADERBOARD_COLUMNS = ['variables', 'transforms', 'trend', 'lags', 'score', 'rmse_unemployment', 'rmse_inflation',
+                       'origins', 'stopped']
+CONCLUSION = "results/conclusion.txt"
+REPORT_SECTIONS = [
+    ("Forecast metrics", 'forecast_metrics'),
+    ("Granger causality", 'granger_matrix'),
+    ("Variance decomposition", 'fevd'),
+]
+
+
+def _run(args, targets):
+    """
+    Brings the given pipeline stages (and their ancestors) up to date; see main.py.
+    """
+    from monetary_var.main import main
+    return main(targets, args.force, args.workers, args.serial, args.no_plots, trace=args.trace)
+
+
+def _print_file(path, title=None):
+    """
+    Prints a results file, returning False if it has not been written yet.
+    """
+    if not os.path.exists(path):
+        print(f"{path} not found; run the pipeline first", file=sys.stderr)
+        return False
+    if title:
+        print(f"== {title} ==")
+    with open(path) as f:
+        print(f.read().rstrip())
+    return True
+
+
+def _print_report(report, title=None, name=None, run_id=None, label=None):
+    """
+    Renders a report from the results store, returning False if it has not been recorded yet.
+    """
+    from monetary_var.reports import render
+    try:
+        text = render(report, name, run_id, label)
+    except (LookupError, ValueError) as error:
+        print(error, file=sys.stderr)
+        return False
+    if title:
+        print(f"== {title} ==")
+    print(text.rstrip())
+    return True
+
+
+def _print_csv(path):
+    """
+    Prints a CSV file as an aligned table using only the csv module.
+    """
+    if not os.path.exists(path):
+        print(f"{path} not found; run `forecast` without --cached first", file=sys.stderr)
+        return False
+    with open(path, newline="") as f:
+        rows = list(csv.reader(f))
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    for row in rows:
+        print("  ".join(cell.rjust(width) for cell, width in zip(row, widths)))
+    return True
+
+
+def fetch(args):
+    """
+    Downloads (or refreshes the local cache of) the FRED series and summarises them.
+    """
+    from monetary_var.import_data import import_data
+    # Without --offline the FRED_OFFLINE environment variable decides (see fred_cache.py)
+    for frame in import_data(offline=args.offline or None, refresh=args.refresh):
+        print(f"{frame.columns[0]}: {len(frame)} quarters, "
+              f"{frame.index[0]:%Y-%m-%d} to {frame.index[-1]:%Y-%m-%d}")
+    return 0
+
+
+def fit(args):
+    """
+    Selects the lag order and fits the VAR models, then prints the lag comparison.
+    """
+    _run(args, ['compare_var_lags', 'split_and_model'])
+    return 0 if _print_report('lag_comparison') else 1
+
+
+def forecast(args):
+    """
+    Produces the 8-quarter forecast in levels and saves it to results/models/forecast.csv.
+    With --cached the saved forecast is printed without running (or importing) the pipeline.
+    """
+    if not args.cached:
+        artifacts = _run(args, ['invert_transformation'])
+        os.makedirs(os.path.dirname(FORECAST_CSV), exist_ok=True)
+        artifacts['df_fc_levels'].to_csv(FORECAST_CSV, index_label='DATE', float_format='%.4f')
+    return 0 if _print_csv(FORECAST_CSV) else 1
+
+
+def update(args):
+    """
+    Appends newly released quarters to the online model (see online_update.py) and re-forecasts,
+    without refitting the lag selection or rerunning the modelling stages. The first call builds
+    the online model from split_and_model.
+    """
+    from monetary_var.online_update import load_state, init_state, append_quarters, refit, forecast, save_state
+    state = None if args.rebuild else load_state()
+    if state is None:
+        artifacts = _run(args, ['split_and_model', 'feature_engineering'])
+        state = init_state(artifacts['train'], artifacts['df'], refit_every=args.refit_every)
+    else:
+        artifacts = _run(args, ['feature_engineering'])
+        state['refit_every'] = args.refit_every
+    added = append_quarters(state, artifacts['df'])
+    if args.refit:
+        refit(state)
+    save_state(state)
+    print(f"Appended {added} quarter(s); model sample ends {state['data'].index[-1]:%Y-%m-%d} "
+          f"({state['updates']} update(s) since the last full refit)")
+    df_fc = forecast(state, args.steps)
+    df_fc.to_csv(ONLINE_FORECAST_CSV, index_label='DATE', float_format='%.4f')
+    return 0 if _print_csv(ONLINE_FORECAST_CSV) else 1
+
+
+def scenario(args):
+    """
+    Forecasts unemployment and inflation conditional on federal funds rate paths (see
+    conditional_forecast.py) and saves them to results/models/scenarios.csv, one row per
+    scenario and quarter.
+    """
+    import numpy as np
+    import pandas as pd
+    from monetary_var.conditional_forecast import policy_scenarios
+    from monetary_var.var_cache import fit_var
+    paths = [[float(value) for value in path.split(",")] for path in args.path or []]
+    if len({len(path) for path in paths}) > 1:
+        print("All --path scenarios must have the same number of quarters", file=sys.stderr)
+        return 1
+    artifacts = _run(args, ['split_and_model', 'feature_engineering'])
+    train, df = artifacts['train'], artifacts['df']
+    if paths:
+        names = [f"path {i + 1}" for i in range(len(paths))]
+    else:
+        # The rate moved by each change at the forecast origin and held there
+        last = df.loc[:train.index[-1], 'fedrate'].iloc[-1]
+        paths = [[last + change] * args.steps for change in args.change]
+        names = [f"{change:+g}" for change in args.change]
+    levels = policy_scenarios(fit_var(train, 3), train, df, fedrate=np.array(paths), steps=args.steps,
+                              shocks=['dfedrate'] if args.policy_shock else None)
+    columns = [column for column in levels if column != 'dates']
+    frames = [pd.DataFrame({'scenario': name, 'DATE': levels['dates'],
+                            **{column: levels[column][i] for column in columns}})
+              for i, name in enumerate(names)]
+    os.makedirs(os.path.dirname(SCENARIOS_CSV), exist_ok=True)
+    pd.concat(frames).to_csv(SCENARIOS_CSV, index=False, float_format='%.4f')
+    return 0 if _print_csv(SCENARIOS_CSV) else 1
+
+
+def search(args):
+    """
+    Ranks VAR configurations (variable sets, transforms, lag orders, trends) by out-of-sample
+    forecast accuracy (see model_search.py) and prints the top of the leaderboard saved in
+    results/models/model_search.csv. With --cached the saved leaderboard is printed without running.
+    """
+    if not args.cached:
+        from monetary_var.model_search import model_search, candidate_grid
+        artifacts = _run(args, ['feature_engineering'])
+        model_search(artifacts['df'], candidate_grid(range(1, args.max_lags + 1), args.trends),
+                     min_train=args.min_train, margin=None if args.no_stop else args.margin,
+                     n_jobs=args.jobs, path=LEADERBOARD_CSV, reuse=not args.fresh)
+    if not os.path.exists(LEADERBOARD_CSV):
+        print(f"{LEADERBOARD_CSV} not found; run `search` without --cached first", file=sys.stderr)
+        return 1
+    with open(LEADERBOARD_CSV, newline="") as f:
+        rows = list(csv.DictReader(f))
+    table = [['rank'] + LEADERBOARD_COLUMNS]
+    for rank, row in enumerate(rows[:args.top], start=1):
+        table.append([str(rank)] + [f"{float(row[c]):.4f}" if c.startswith(('score', 'rmse')) else row[c]
+                                    for c in LEADERBOARD_COLUMNS])
+    widths = [max(len(row[i]) for row in table) for i in range(len(table[0]))]
+    for row in table:
+        print("  ".join(cell.rjust(width) for cell, width in zip(row, widths)))
+    print(f"score: RMSE relative to a no-change forecast, mean of the unemployment rate and inflation "
+          f"({len(rows)} candidates, {rows[0]['settings'] if rows else ''})")
+    return 0
+
+
+def granger(args):
+    """
+    Runs the Granger causality tests and prints the causality matrix.
+    """
+    _run(args, ['granger_causality'])
+    return 0 if _print_report('granger_matrix') else 1
+
+
+def report(args):
+    """
+    Brings the whole pipeline up to date (unless --cached) and prints the key findings.
+    """
+    if not args.cached:
+        _run(args, None)
+    printed = [_print_file(CONCLUSION, "Conclusion")]
+    printed += [_print_report(report, title) for title, report in REPORT_SECTIONS]
+    return 0 if all(printed) else 1
+
+
+def show(args):
+    """
+    Renders one report from the results store without running the pipeline.
+    """
+    return 0 if _print_report(args.report, name=args.name, run_id=args.run, label=args.label) else 1
+
+
+def runs(args):
+    """
+    Lists the runs recorded in the results store.
+    """
+    from monetary_var.results_store import list_runs
+    for row in list_runs():
+        print(f"{row['run_id']}  {row['created']}  {row['label'] or ''}".rstrip())
+    return 0
+
+
+def batch(args):
+    """
+    Runs the pipeline for every dataset of a JSON manifest (see batch.py) and prints the summary.
+    """
+    from monetary_var.batch import load_manifest, run_batch
+    summary = run_batch(load_manifest(args.manifest), args.output, args.workers, no_plots=args.no_plots)
+    print(summary.drop(columns='error').to_string(float_format=lambda x: f"{x:.4f}"))
+    return 0 if (summary['status'] == 'ok').all() else 1
+
+
+def bench(args):
+    """
+    Runs the benchmark suite on simulated VAR data (see benchmark.py) and compares it with the
+    saved baseline; exits with 1 if a measurement regressed.
+    """
+    from monetary_var import benchmark
+    grid = benchmark.QUICK_GRID if args.quick else benchmark.GRID
+    results = benchmark.run_benchmarks(grid, args.cases or None, args.repeat)
+    benchmark.save_results(results)
+    if args.save_baseline:
+        benchmark.save_results(results, args.baseline)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; rerun with --save-baseline to create one", file=sys.stderr)
+        return 0
+    comparison = benchmark.compare(results, benchmark.load_results(args.baseline), args.tolerance)
+    print(comparison.to_string(index=False, float_format=lambda x: f"{x:.4f}"))
+    regressions = comparison[comparison['regression']]
+    for _, row in regressions.iterrows():
+        print(f"REGRESSION: {row['case']} nobs={row['nobs']} neqs={row['neqs']} "
+              f"time x{row['time_ratio']:.2f}, memory x{row['memory_ratio']:.2f}", file=sys.stderr)
+    return 1 if len(regressions) else 0
+
+
+def build_parser():
+    """
+    Builds the argument parser for the `monetary-var` command.
+    """
+    pipeline = argparse.ArgumentParser(add_help=False)
+    pipeline.add_argument("--force", nargs="*", default=[], help="stages to rerun even if cached")
+    pipeline.add_argument("--workers", type=int, default=4, help="maximum concurrent stages")
+    pipeline.add_argument("--serial", action="store_true", help="run stages one at a time in process")
+    pipeline.add_argument("--no-plots", action="store_true", help="headless run: skip all plots")
+    pipeline.add_argument("--trace", metavar="PATH",
+                          help="profile the run: write a Chrome trace (e.g. results/trace.json) and a summary")
+
+    parser = argparse.ArgumentParser(prog="monetary-var",
+                                     description="Monetary policy VAR model of inflation and unemployment")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    command = commands.add_parser("fetch", help="download the FRED series into the local cache")
+    command.add_argument("--offline", action="store_true", help="use only the local cache")
+    command.add_argument("--refresh", action="store_true", help="re-download the full history")
+    command.set_defaults(func=fetch)
+
+    command = commands.add_parser("fit", parents=[pipeline], help="select lags and fit the VAR")
+    command.set_defaults(func=fit)
+
+    command = commands.add_parser("forecast", parents=[pipeline], help="forecast 8 quarters ahead")
+    command.add_argument("--cached", action="store_true", help="print the last saved forecast")
+    command.set_defaults(func=forecast)
+
+    command = commands.add_parser("update", parents=[pipeline], help="append new quarters to the model and re-forecast")
+    command.add_argument("--steps", type=int, default=8, help="quarters to forecast")
+    command.add_argument("--refit", action="store_true", help="refit from the stored data after appending")
+    command.add_argument("--refit-every", type=int, default=20, help="appended quarters between full refits")
+    command.add_argument("--rebuild", action="store_true", help="rebuild the online model from split_and_model")
+    command.set_defaults(func=update)
+
+    command = commands.add_parser("scenario", parents=[pipeline], help="forecast conditional on fed funds rate paths")
+    command.add_argument("--change", type=float, nargs="*", default=[-1.0, -0.5, 0.0, 0.5, 1.0],
+                         help="rate changes (points) held over the forecast")
+    command.add_argument("--path", action="append", help="fed funds rate path, e.g. 5.25,5,4.75 (repeatable)")
+    command.add_argument("--steps", type=int, default=8, help="quarters to forecast")
+    command.add_argument("--policy-shock", action="store_true",
+                         help="move the rate with policy shocks only (default: all shocks)")
+    command.set_defaults(func=scenario)
+
+    command = commands.add_parser("search", parents=[pipeline], help="rank VAR configurations by out-of-sample accuracy")
+    command.add_argument("--max-lags", type=int, default=8, help="largest lag order searched")
+    command.add_argument("--trends", nargs="*", default=['n', 'c', 'ct'], help="trend specs searched")
+    command.add_argument("--min-train", type=int, default=80, help="quarters before the first forecast origin")
+    command.add_argument("--margin", type=float, default=0.25,
+                         help="stop candidates scoring this much worse than the best (relative)")
+    command.add_argument("--no-stop", action="store_true", help="evaluate every candidate on all origins")
+    command.add_argument("--jobs", type=int, default=1, help="worker processes")
+    command.add_argument("--fresh", action="store_true", help="ignore the scores saved by earlier searches")
+    command.add_argument("--top", type=int, default=10, help="leaderboard rows printed")
+    command.add_argument("--cached", action="store_true", help="print the saved leaderboard")
+    command.set_defaults(func=search)
+
+    command = commands.add_parser("granger", parents=[pipeline], help="run Granger causality tests")
+    command.set_defaults(func=granger)
+
+    command = commands.add_parser("report", parents=[pipeline], help="run everything and print the findings")
+    command.add_argument("--cached", action="store_true", help="print the saved findings only")
+    command.set_defaults(func=report)
+
+    command = commands.add_parser("show", help="print a report from the results store")
+    command.add_argument("report", help="data_quality, summary_stats, stationarity, lag_selection, "
+                                        "lag_comparison, model, bvar, sparse_var, forecast_metrics, forecast_horizons, irf, fevd, correlogram, svar, stability, granger or granger_matrix")
+    command.add_argument("name", nargs="?", help="model (e.g. var_5_lags), Granger pair (e.g. 'dfedrate -> inflat') or variable")
+    command.add_argument("--run", help="run ID (default: the latest run, see `runs`)")
+    command.add_argument("--label", help="latest run with this label, e.g. a batch dataset")
+    command.set_defaults(func=show)
+
+    command = commands.add_parser("runs", help="list the runs in the results store")
+    command.set_defaults(func=runs)
+
+    command = commands.add_parser("bench", help="benchmark the stages on simulated VAR data")
+    command.add_argument("--quick", action="store_true", help="small size grid")
+    command.add_argument("--cases", nargs="*", help="cases to run (default: all, see benchmark.CASES)")
+    command.add_argument("--repeat", type=int, default=3, help="timed calls per case and size")
+    command.add_argument("--baseline", default="results/benchmarks/baseline.json", help="baseline file")
+    command.add_argument("--save-baseline", action="store_true", help="store this run as the baseline")
+    command.add_argument("--tolerance", type=float, default=0.25, help="allowed relative slowdown")
+    command.set_defaults(func=bench)
+
+    command = commands.add_parser("batch", help="run the pipeline for every dataset in a manifest")
+    command.add_argument("manifest", help="JSON list of datasets (name, unemployment, inflation, policy_rate)")
+    command.add_argument("--output", default="results/batch", help="directory for per-dataset results")
+    command.add_argument("--workers", type=int, default=2, help="maximum concurrent pipelines")
+    command.add_argument("--no-plots", action="store_true", help="headless run: skip all plots")
+    command.set_defaults(func=batch)
+    return parser
+
+
+def main(argv=None):
+    """
+    Entry point of the `monetary-var` command (also `python -m monetary_var`).
+    """
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,55 @@
+import pandas as pd
+import numpy as np
+from monetary_var.var_cache import fit_var
+from monetary_var.var_lag_sweep import lag_sweep
+from monetary_var.bayesian_var import bayesian_var, cross_products, log_marginal_likelihood
+from monetary_var.results_store import record, model_rows
+
+def compare_var_lags(data, sweep=None, lags_list=[3, 4, 5, 6, 8], method='ols'):
+    """
+    Compares VAR models with different lags, builds a final VAR model with 3 lags, saves results to the
+    results store (`monetary-var show lag_comparison`, `monetary-var show model var_3_lags`).
+    The comparison reads log likelihoods and residual correlations from a lag sweep (var_lag_sweep.py):
+    sweep is the one explore_var_lags computed on the same data (passed as a pipeline artifact); it is
+    recomputed if missing or shorter than max(lags_list).
+    With method='bvar' the comparison also reports the marginal likelihood of a Bayesian VAR with a
+    Minnesota prior at each lag, and the final model is that Bayesian VAR (see bayesian_var.py).
+    Returns the final VAR model results.
+    """
+    # Task 14: Compare VAR models with different lags
+    # All lag orders come from one lag sweep on the common sample of the largest lag order
+    if sweep is None or sweep.index.max() < max(lags_list):
+        sweep = lag_sweep(data, maxlags=max(lags_list))
+    results = {}
+    for lags in lags_list:
+        residual_corr = sweep.loc[lags, 'resid_corr']
+        corr_values = residual_corr.where(np.triu(np.ones(residual_corr.shape), k=1).astype(bool)).stack().dropna()
+        results[lags] = {
+            'log_likelihood': sweep.loc[lags, 'llf'],
+            'residual_correlations': corr_values.to_dict()
+        }
+        if method == 'bvar':
+            # Best marginal likelihood over the prior tightness grid, on the same common sample
+            results[lags]['log_marginal_likelihood'] = log_marginal_likelihood(
+                cross_products(data, max(lags_list)), lags).max()
+
+    # Comparison, then the final VAR model with 3 lags; both are saved in one transaction
+    rows = [('lag_comparison', '', 'nobs', sweep['nobs'].iloc[0])]
+    for lags, metrics in results.items():
+        rows.append(('lag_comparison', str(lags), 'llf', metrics['log_likelihood']))
+        if 'log_marginal_likelihood' in metrics:
+            rows.append(('lag_comparison', str(lags), 'log_ml', metrics['log_marginal_likelihood']))
+        for (var1, var2), corr in metrics['residual_correlations'].items():
+            rows.append(('lag_comparison', str(lags), f"resid_corr:{var1}:{var2}", corr))
+
+    # Build final VAR model with 3 lags
+    final_results = bayesian_var(data, 3) if method == 'bvar' else fit_var(data, 3)
+    model = model_rows('bvar_3_lags' if method == 'bvar' else 'var_3_lags', final_results)
+    record('compare_var_lags', coefficients=model['coefficients'], metrics=rows + model['metrics'])
+
+    return final_results
+
+if __name__ == "__main__":
+    from monetary_var.main import main
+    main(['compare_var_lags'])
+    print("Lag comparison and final VAR model (3 lags) completed")
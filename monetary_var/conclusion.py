@@ -1,3 +1,5 @@
+import os
+
 def write_conclusion():
     """
     Writes the final conclusion based on the Granger Causality results.
@@ -18,37 +20,12 @@ The VAR model captured bidirectional relationships (e.g., differenced fedrate le
 
 The lack of Granger Causality from differenced fedrate lending rates to inflation challenges the recommendation to raise rates to combat inflation, as the model suggests limited predictive power in this direction. This finding aligns with the VAR results, where differenced federal lending rate unexpectedly increased inflation, prompting the need for a structural VAR (SVAR) to capture contemporaneous effects.
 """
+    # Ensure the results directory exists (this stage has no inputs, so it may run first)
+    os.makedirs("results", exist_ok=True)
     with open("results/conclusion.txt", "w") as f:
         f.write(conclusion)
 
 if __name__ == "__main__":
-    from import_data import import_data
-    from merge_data import merge_data
-    from eda import perform_eda
-    from stationarity_test import test_stationarity
-    from feature_engineering import feature_engineering
-    from stationarity_check import check_stationarity
-    from explore_var_lags import explore_var_lags
-    from compare_var_lags import compare_var_lags
-    from pacf_analysis import pacf_analysis
-    from split_and_model import split_and_model
-    from forecast_visualizations import forecast_visualizations
-    from invert_transformation import invert_transformation
-    from evaluate_forecast import evaluate_forecast
-    from granger_causality import granger_causality
-    unemp_q, inflat_q, fedfund_q = import_data()
-    df = merge_data(unemp_q, inflat_q, fedfund_q)
-    df = perform_eda(df)
-    df = test_stationarity(df)
-    df = feature_engineering(df)
-    stationary_df = check_stationarity(df)
-    vardf = explore_var_lags(stationary_df)
-    final_results = compare_var_lags(vardf, lags_list=[3, 4, 5, 6, 8])
-    vardf = pacf_analysis(vardf)
-    train, test, df_fc = split_and_model(vardf)
-    train, test, df_fc = forecast_visualizations(train, test, df_fc)
-    train, test, df_fc = invert_transformation(train, test, df_fc, df)
-    train, test, df_fc = evaluate_forecast(train, test, df_fc)
-    train = granger_causality(train)
-    write_conclusion()
-    print("Conclusion written")
\ No newline at end of file
+    from monetary_var.main import main
+    main(['write_conclusion'])
+    print("Conclusion written")
@@ -0,0 +1,128 @@
+import numpy as np
+import pandas as pd
+from monetary_var.impulse_response import companion_powers
+from monetary_var.invert_transformation import invert_paths
+
+# Conditional forecasts: the forecast of the other variables when one variable (the policy rate)
+# follows a given path. From the MA representation, the forecast errors over the next steps are a
+# linear map G of the orthogonalized shocks e (u = P e, P the Cholesky factor of Sigma_u):
+#     y[T+h] = f[T+h] + sum_{s<=h} Phi_{h-s} P e[T+s]
+# A path for variable c is the linear constraint R e = path - f_c, R the rows of G for c. The
+# shocks that meet it with the smallest norm, e = R^+ (path - f_c), are the Gaussian conditional
+# expectation. R, and so the map K = G R^+ from path deviations to forecast revisions, does not
+# depend on the path: K is built once and every scenario is one row of a matrix product.
+
+
+def scenario_map(results, steps, variable, conditioned=None, shocks=None):
+    """
+    The linear map from deviations of a conditioning path (from the unconditional forecast) to
+    the revisions of all forecasts.
+
+    Parameters:
+    - results: fitted VAR (statsmodels VARResults or BayesianVARResults)
+    - steps: int, number of quarters forecast
+    - variable: str, the conditioned variable
+    - conditioned: int, number of leading quarters the path fixes (default: all steps)
+    - shocks: list of str, orthogonalized shocks allowed to move (default: all, i.e. the
+      conditional expectation; e.g. [variable] for a policy shock only, in the Cholesky order
+      of the model)
+
+    Returns:
+    - NumPy array with shape (steps * k, conditioned): revisions of the stacked forecasts
+      (quarter-major) per unit deviation of the path
+    """
+    names = list(results.names)
+    k, c = len(names), names.index(variable)
+    conditioned = steps if conditioned is None else conditioned
+    if not 0 < conditioned <= steps:
+        raise ValueError(f"The path must cover 1 to {steps} quarters, got {conditioned}.")
+    orth = companion_powers(results, steps - 1) @ np.linalg.cholesky(np.asarray(results.sigma_u, dtype=float))
+    # G[(h, i), (s, j)]: response of variable i in quarter h to shock j in quarter s <= h
+    G = np.zeros((steps, k, steps, k))
+    for s in range(steps):
+        G[s:, :, s, :] = orth[:steps - s]
+    G = G.reshape(steps * k, steps * k)
+    free = np.zeros((steps, k), dtype=bool)
+    free[:, [names.index(shock) for shock in shocks] if shocks is not None else slice(None)] = True
+    free = free.ravel()
+    R = G[c:conditioned * k:k][:, free]
+    if np.linalg.matrix_rank(R) < conditioned:
+        raise ValueError(f"The shocks {shocks} cannot move {variable} along an arbitrary path.")
+    return G[:, free] @ np.linalg.pinv(R)
+
+
+def conditional_forecast(results, y, paths, variable='dfedrate', steps=8, shocks=None):
+    """
+    Forecasts conditional on paths of one variable, for many scenarios at once.
+
+    Parameters:
+    - results: fitted VAR (statsmodels VARResults or BayesianVARResults)
+    - y: array-like, the last k_ar observations (oldest first)
+    - paths: array-like with shape (n_scenarios, conditioned) or (conditioned,), the values of
+      variable in the first conditioned forecast quarters (conditioned <= steps)
+    - variable: str, the conditioned variable (default='dfedrate')
+    - steps: int, number of quarters forecast (default=8)
+    - shocks: list of str, orthogonalized shocks allowed to move (default: all, see scenario_map)
+
+    Returns:
+    - NumPy array with shape (n_scenarios, steps, k) ((steps, k) for a single path); variable
+      follows its path exactly
+    """
+    paths = np.asarray(paths, dtype=float)
+    single = paths.ndim == 1
+    paths = np.atleast_2d(paths)
+    names = list(results.names)
+    k = len(names)
+    unconditional = results.forecast(np.asarray(y, dtype=float)[-results.k_ar:], steps)
+    K = scenario_map(results, steps, variable, paths.shape[1], shocks)
+    deviations = paths - unconditional[:paths.shape[1], names.index(variable)]
+    forecasts = (unconditional.ravel() + deviations @ K.T).reshape(len(paths), steps, k)
+    return forecasts[0] if single else forecasts
+
+
+def policy_scenarios(results, train, df, fedrate=None, dfedrate=None, steps=8, shocks=None):
+    """
+    Forecasts in levels for policy-rate scenarios, from the end of the training sample of
+    split_and_model.
+
+    Parameters:
+    - results: the VAR fitted on train
+    - train: DataFrame, the training sample (stationary variables)
+    - df: DataFrame, the feature-engineered data in levels (see feature_engineering)
+    - fedrate: array-like (n_scenarios, conditioned), paths of the federal funds rate level
+    - dfedrate: array-like (n_scenarios, conditioned), paths of its quarterly change (instead of fedrate)
+    - steps: int, number of quarters forecast (default=8)
+    - shocks: list of str, orthogonalized shocks allowed to move (default: all, see scenario_map)
+
+    Returns:
+    - dict mapping each model variable and level column (fedrate, the unemployment rate) to an
+      array with shape (n_scenarios, steps), and 'dates' to the forecast quarters
+    """
+    if (fedrate is None) == (dfedrate is None):
+        raise ValueError("Give either fedrate or dfedrate paths.")
+    history = df.loc[:train.index[-1]]
+    if fedrate is not None:
+        # Level paths continue the last observed rate: their changes are the dfedrate paths
+        fedrate = np.atleast_2d(np.asarray(fedrate, dtype=float))
+        start = np.full((len(fedrate), 1), history['fedrate'].iloc[-1])
+        dfedrate = np.diff(np.hstack([start, fedrate]), axis=1)
+    forecasts = conditional_forecast(results, train.values, np.atleast_2d(dfedrate), 'dfedrate', steps, shocks)
+    columns = list(train.columns)
+    out = {name: forecasts[..., j] for j, name in enumerate(columns)}
+    out.update(invert_paths(forecasts, columns, history))
+    freq = train.index.freq or pd.infer_freq(train.index)
+    out['dates'] = pd.date_range(train.index[-1], periods=steps + 1, freq=freq)[1:]
+    return out
+
+
+if __name__ == "__main__":
+    from monetary_var.main import main
+    from monetary_var.var_cache import fit_var
+    artifacts = main(['split_and_model', 'feature_engineering'])
+    train, df = artifacts['train'], artifacts['df']
+    # The rate held flat, or moved by up to 2 points in 25 basis point steps
+    last = df.loc[:train.index[-1], 'fedrate'].iloc[-1]
+    changes = np.arange(-2, 2.01, 0.25)
+    levels = policy_scenarios(fit_var(train, 3), train, df, fedrate=last + changes[:, None] * np.ones(8))
+    print(pd.DataFrame({'change': changes, 'inflat': levels['inflat'][:, -1],
+                        df.columns[0]: levels[df.columns[0]][:, -1]}).round(4).to_string(index=False))
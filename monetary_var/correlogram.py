@@ -0,0 +1,136 @@
+import numpy as np
+from scipy import fft, stats
+from monetary_var.var_cache import frame_hash
+from monetary_var.tracing import traced
+
+# Autocorrelations, partial autocorrelations and cross-correlations of every column at once,
+# computed apart from plotting so stages can save the numbers and plots only draw them.
+#
+# The autocovariances of all columns come from one FFT of the demeaned, zero-padded panel
+# (|FFT|^2, transformed back); cross-covariances from the products of the column transforms.
+# The PACF of every series follows from its autocorrelations by a Levinson-Durbin recursion run
+# on all series together; with the biased autocovariances (denominator n) it is the Yule-Walker
+# PACF statsmodels computes with method='ywm'.
+
+# Recent correlograms by (data hash, nlags, alpha, cross)
+_CORRELOGRAMS = {}
+_CORRELOGRAMS_SIZE = 16
+
+# Cross-correlation products computed per block, bounding memory on wide panels
+CCF_BLOCK_BYTES = 2 ** 28
+
+
+def _spectrum(values):
+    """
+    FFT of the demeaned columns, zero-padded to a fast length of at least 2n (no circular overlap).
+    """
+    nfft = fft.next_fast_len(2 * len(values) - 1, real=True)
+    return fft.rfft(values - values.mean(axis=0), n=nfft, axis=0), nfft
+
+
+def autocovariances(values, nlags):
+    """
+    Autocovariances (denominator n) of every column for lags 0..nlags.
+
+    Parameters:
+    - values: NumPy array with shape (n, k)
+    - nlags: int, largest lag
+
+    Returns:
+    - NumPy array with shape (nlags + 1, k)
+    """
+    values = np.asarray(values, dtype=float)
+    spectrum, nfft = _spectrum(values)
+    return fft.irfft(spectrum * spectrum.conj(), n=nfft, axis=0)[:nlags + 1] / len(values)
+
+
+def cross_covariances(values, nlags):
+    """
+    Cross-covariances (denominator n) of every pair of columns for lags 0..nlags:
+    [h, i, j] is the covariance of column i at t + h with column j at t (negative lags are the
+    transposes, [h, j, i]).
+
+    Returns:
+    - NumPy array with shape (nlags + 1, k, k)
+    """
+    values = np.asarray(values, dtype=float)
+    n, k = values.shape
+    spectrum, nfft = _spectrum(values)
+    out = np.empty((nlags + 1, k, k))
+    rows = max(1, CCF_BLOCK_BYTES // (16 * len(spectrum) * k))
+    for start in range(0, k, rows):
+        block = spectrum[:, start:start + rows, None] * spectrum[:, None, :].conj()
+        out[:, start:start + rows] = fft.irfft(block, n=nfft, axis=0)[:nlags + 1] / n
+    return out
+
+
+def levinson_durbin(acf, nlags):
+    """
+    Partial autocorrelations of many series from their autocorrelations.
+
+    Parameters:
+    - acf: NumPy array with shape (nlags + 1, k), autocorrelations (lag 0 first)
+    - nlags: int, largest lag
+
+    Returns:
+    - NumPy array with shape (nlags + 1, k), lag 0 equal to 1
+    """
+    k = acf.shape[1]
+    pacf = np.ones((nlags + 1, k))
+    phi = np.zeros((nlags + 1, k))
+    variance = acf[0].copy()
+    for m in range(1, nlags + 1):
+        # phi[1..m-1] hold the AR(m - 1) coefficients of every series
+        kappa = (acf[m] - np.einsum('jk,jk->k', phi[1:m], acf[m - 1:0:-1])) / variance
+        phi[1:m] = phi[1:m] - kappa * phi[m - 1:0:-1]
+        phi[m] = kappa
+        variance = variance * (1 - kappa ** 2)
+        pacf[m] = kappa
+    return pacf
+
+
+@traced("correlogram")
+def correlogram(data, nlags=10, alpha=0.05, cross=False):
+    """
+    ACF and PACF of every column (and optionally all cross-correlations) with confidence bounds.
+
+    Parameters:
+    - data: pandas DataFrame without missing values
+    - nlags: int, largest lag (default=10)
+    - alpha: float, bounds are at the 1 - alpha level (default=0.05)
+    - cross: bool, also compute the cross-correlations of every pair (default=False)
+
+    Returns:
+    - dict with 'names', 'nobs', 'acf' and 'pacf' (nlags + 1, k), 'acf_bound' (nlags + 1, k),
+      Bartlett bounds for the ACF at each lag, as statsmodels' plot_acf, 'pacf_bound', the bound
+      z / sqrt(n) of the PACF, and with cross=True 'ccf' (nlags + 1, k, k), [h, i, j] the
+      correlation of column i at t + h with column j at t, and 'ccf_bound' (z / sqrt(n)).
+      Repeated calls with the same data and settings return the cached result.
+    """
+    key = (frame_hash(data), nlags, alpha, cross)
+    if key in _CORRELOGRAMS:
+        return _CORRELOGRAMS[key]
+    values = np.asarray(data.values, dtype=float)
+    if np.isnan(values).any():
+        raise ValueError("The data has missing values; drop them first.")
+    n = len(values)
+    if nlags >= n:
+        raise ValueError(f"nlags ({nlags}) must be smaller than the number of observations ({n}).")
+    z = stats.norm.ppf(1 - alpha / 2)
+
+    acov = autocovariances(values, nlags)
+    acf = acov / acov[0]
+    # Bartlett: var(r_h) = (1 + 2 sum_{j<h} r_j^2) / n
+    acf_var = np.zeros_like(acf)
+    acf_var[1:] = (1 + 2 * np.vstack([np.zeros((1, acf.shape[1])), np.cumsum(acf[1:-1] ** 2, axis=0)])) / n
+    result = {'names': list(data.columns), 'nobs': n, 'acf': acf, 'acf_bound': z * np.sqrt(acf_var),
+              'pacf': levinson_durbin(acf, nlags), 'pacf_bound': z / np.sqrt(n)}
+    if cross:
+        sd = np.sqrt(acov[0])
+        result['ccf'] = cross_covariances(values, nlags) / np.outer(sd, sd)
+        result['ccf_bound'] = z / np.sqrt(n)
+
+    if len(_CORRELOGRAMS) >= _CORRELOGRAMS_SIZE:
+        _CORRELOGRAMS.pop(next(iter(_CORRELOGRAMS)))
+    _CORRELOGRAMS[key] = result
+    return result
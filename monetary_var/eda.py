@@ -0,0 +1,38 @@
+import pandas as pd
+from monetary_var.plotting import emit_plot, line
+from monetary_var.results_store import record
+import os
+
+def perform_eda(df):
+    """
+    Visualizes the initial time series for the variables.
+    Saves plot to results/plots/ (rendered in the background, see plotting.py) and the summary
+    statistics to the results store (`monetary-var show summary_stats`).
+    Returns the DataFrame unchanged.
+    """
+    # Ensure the plots directory exists
+    os.makedirs("results/plots", exist_ok=True)
+
+    # Task 8: Generate summary statistics and time series plot
+    summary_stats = df.describe()
+    record('perform_eda', metrics=[('summary_stats', col, stat, value)
+                                   for col in summary_stats.columns
+                                   for stat, value in summary_stats[col].items()])
+
+    emit_plot({
+        'path': "results/plots/time_series_plot.png", 'figsize': (12, 5), 'dpi': 100,
+        'panels': [{
+            'lines': [line(df['unempgr'], label='Unemployment Growth Rate (%)', color='blue'),
+                      line(df['fedrate'], label='Federal Funds Rate (%)', color='green'),
+                      line(df['inflat'], label='Inflation Rate (%)', color='red')],
+            'title': 'Time Series of Unemployment Growth, Federal Funds, and Inflation Rates (1970–2019)',
+            'xlabel': 'Date', 'ylabel': 'Percentage', 'legend': {}, 'grid': True,
+        }],
+    })
+
+    return df
+
+if __name__ == "__main__":
+    from monetary_var.main import main
+    main(['perform_eda'])
+    print("EDA completed")
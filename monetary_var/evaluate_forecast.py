@@ -0,0 +1,247 @@
+import pandas as pd
+import numpy as np
+from scipy import stats
+from monetary_var.results_store import record
+
+METRICS = ('ME', 'MAE', 'MPE', 'MAPE', 'RMSE')
+
+# Origins scored per batch by the one-shot helpers, which bounds their temporary arrays
+CHUNK = 2 ** 15
+
+
+def _as_3d(values):
+    """
+    Views forecasts or actuals as an origin x horizon x variable array: a single (steps, k)
+    forecast path is one origin.
+    """
+    values = np.asarray(values, dtype=float)
+    return values[None] if values.ndim == 2 else values
+
+
+class ForecastMetrics:
+    """
+    Streaming forecast accuracy engine. Forecast batches (origin x horizon x variable arrays,
+    e.g. chunks of a backtest) are reduced to running sums per horizon and variable as they
+    arrive, so memory does not grow with the number of forecasts scored. Pairs with a missing
+    forecast or actual value are skipped.
+
+    Parameters:
+    - columns: list, names of the variables
+    - steps: int, forecast horizon (default=1)
+    """
+    def __init__(self, columns, steps=1):
+        self.columns = list(columns)
+        self.steps = steps
+        shape = (steps, len(self.columns))
+        self.count = np.zeros(shape)
+        # Running sums of e, |e|, e / a, |e / a| and e ** 2, with e = forecast - actual
+        self.sums = np.zeros((5,) + shape)
+
+    def update(self, forecast, actual):
+        """
+        Adds a batch of forecasts and the realised values (arrays with shape (n_origins, steps, k),
+        or (steps, k) for one forecast path).
+        """
+        forecast, actual = _as_3d(forecast), _as_3d(actual)
+        if forecast.shape != actual.shape or forecast.shape[1:] != self.count.shape:
+            raise ValueError(f"Expected forecasts and actuals with shape (n, {self.steps}, {len(self.columns)}), "
+                             f"got {forecast.shape} and {actual.shape}")
+        actual = np.where(actual == 0, 0.0001, actual)  # This is to avoid division by zero
+        errors = forecast - actual
+        ratios = errors / actual * 100  # Convert to percentage
+        valid = np.isfinite(errors)
+        if not valid.all():
+            errors, ratios = np.where(valid, errors, 0.0), np.where(valid, ratios, 0.0)
+        self.count += valid.sum(axis=0)
+        self.sums += [errors.sum(axis=0), np.abs(errors).sum(axis=0), ratios.sum(axis=0),
+                      np.abs(ratios).sum(axis=0), np.einsum('nhk,nhk->hk', errors, errors)]
+        return self
+
+    def _metrics(self, count, sums):
+        with np.errstate(invalid='ignore', divide='ignore'):
+            me, mae, mpe, mape, mse = sums / count
+        return dict(zip(METRICS, (me, mae, mpe, mape, np.sqrt(mse))))
+
+    def metrics(self):
+        """
+        Returns the metrics over all horizons: {variable: {ME, MAE, MPE, MAPE, RMSE}}.
+        """
+        values = self._metrics(self.count.sum(axis=0), self.sums.sum(axis=1))
+        return {col: {name: values[name][i] for name in METRICS} for i, col in enumerate(self.columns)}
+
+    def by_horizon(self):
+        """
+        Returns the metrics per horizon: DataFrame indexed by (variable, horizon), with the
+        columns ME, MAE, MPE, MAPE, RMSE and the number of forecasts scored.
+        """
+        values = self._metrics(self.count, self.sums)
+        index = pd.MultiIndex.from_product([self.columns, range(1, self.steps + 1)], names=['variable', 'horizon'])
+        table = pd.DataFrame({name: values[name].T.ravel() for name in METRICS}, index=index)
+        table['count'] = self.count.T.ravel().astype(int)
+        return table
+
+
+def calculate_forecast_metrics(forecast, actual, columns=None):
+    """
+    Calculate forecast accuracy metrics for each variable in the forecasted and actual data.
+
+    Parameters:
+    - forecast: pandas DataFrame or NumPy array, forecasted values with shape (n, k), or a
+      NumPy array with shape (n_origins, steps, k) from backtest.backtest
+    - actual: pandas DataFrame or NumPy array, actual values with the same shape as forecast
+    - columns: list, optional, names of the variables (required if inputs are NumPy arrays)
+
+    Returns:
+    - dict: Dictionary with metrics (ME, MAE, MPE, MAPE, RMSE) for each variable
+    """
+    if isinstance(forecast, pd.DataFrame):
+        columns = list(forecast.columns)
+        forecast = forecast.values
+    elif columns is None:
+        raise ValueError("Column names must be provided if forecast is a NumPy array")
+    if isinstance(actual, pd.DataFrame):
+        actual = actual[columns].to_numpy(dtype=float)
+    elif columns is None:
+        raise ValueError("Column names must be provided if actual is a NumPy array")
+
+    # Origin x horizon x variable arrays (e.g. from backtest.backtest) are scored over all forecasts
+    forecast, actual = _as_3d(forecast), _as_3d(actual)
+    engine = ForecastMetrics(columns, forecast.shape[1])
+    for i in range(0, len(forecast), CHUNK):
+        engine.update(forecast[i:i + CHUNK], actual[i:i + CHUNK])
+    return engine.metrics()
+
+
+class DieboldMariano:
+    """
+    Streaming Diebold-Mariano test of equal forecast accuracy of two models, per horizon and
+    variable. Batches must arrive in origin order; only the sums of the loss differential d and
+    its lagged cross-products (up to lag steps - 1), plus the first and last steps - 1 values of
+    d, are kept.
+
+    The h-step statistic uses the autocovariances of d up to lag h - 1 (h-step forecast errors
+    are MA(h - 1) under the null), with the small-sample correction of Harvey, Leybourne and
+    Newbold (1997) and Student t p-values by default.
+
+    Parameters:
+    - columns: list, names of the variables
+    - steps: int, forecast horizon (default=1)
+    - loss: str, 'squared' or 'absolute' error loss (default='squared')
+    """
+    def __init__(self, columns, steps=1, loss='squared'):
+        if loss not in ('squared', 'absolute'):
+            raise ValueError("Invalid loss. Use 'squared' or 'absolute'.")
+        self.columns = list(columns)
+        self.steps = steps
+        self.loss = loss
+        shape = (steps, len(self.columns))
+        self.n = 0
+        self.total = np.zeros(shape)
+        # cross[j] = sum over t of d[t] * d[t - j]
+        self.cross = np.zeros((steps,) + shape)
+        self.head = np.empty((0,) + shape)
+        self.tail = np.empty((0,) + shape)
+
+    def update(self, forecast_a, forecast_b, actual):
+        """
+        Adds a batch of forecasts of both models and the realised values (arrays with shape
+        (n_origins, steps, k)). A positive loss differential means model A is less accurate.
+        """
+        forecast_a, forecast_b, actual = _as_3d(forecast_a), _as_3d(forecast_b), _as_3d(actual)
+        errors_a, errors_b = forecast_a - actual, forecast_b - actual
+        if self.loss == 'squared':
+            d = errors_a ** 2 - errors_b ** 2
+        else:
+            d = np.abs(errors_a) - np.abs(errors_b)
+        lags = self.steps - 1
+        # Pairs reaching back into the previous batches use the retained values of d
+        joined = np.concatenate([self.tail, d])
+        for j in range(self.steps):
+            start = max(len(self.tail), j)
+            if start < len(joined):
+                self.cross[j] += np.einsum('thk,thk->hk', joined[start:], joined[start - j:len(joined) - j])
+        self.n += len(d)
+        self.total += d.sum(axis=0)
+        self.head = np.concatenate([self.head, d])[:lags]
+        self.tail = joined[max(len(joined) - lags, 0):] if lags else self.tail
+        return self
+
+    def result(self, harvey=True):
+        """
+        Returns the test per horizon: DataFrame indexed by (variable, horizon) with the mean loss
+        differential, the DM statistic and its two-sided p-value (nan when there are too few origins).
+        """
+        n = self.n
+        mean = self.total / n
+        # Autocovariance j from the sums: sum of (d_t - mean)(d_{t-j} - mean) over the n - j pairs
+        gammas = np.full((self.steps,) + mean.shape, np.nan)
+        for j in range(min(self.steps, n)):
+            first, last = self.head[:j].sum(axis=0), self.tail[len(self.tail) - j:].sum(axis=0)
+            gammas[j] = (self.cross[j] - mean * (2 * self.total - first - last) + (n - j) * mean ** 2) / n
+        # Long-run variance of the h-step differential: autocovariances up to lag h - 1
+        used = np.arange(self.steps)[:, None] <= np.arange(self.steps)[None, :]
+        variance = 2 * np.where(used[:, :, None], gammas, 0.0).sum(axis=0) - gammas[0]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            statistic = mean / np.sqrt(variance / n)
+            horizons = np.arange(1, self.steps + 1)[:, None]
+            if harvey:
+                statistic = statistic * np.sqrt((n + 1 - 2 * horizons + horizons * (horizons - 1) / n) / n)
+                pvalue = 2 * stats.t.sf(np.abs(statistic), df=n - 1)
+            else:
+                pvalue = 2 * stats.norm.sf(np.abs(statistic))
+        statistic = np.where(variance > 0, statistic, np.nan)
+        pvalue = np.where(variance > 0, pvalue, np.nan)
+        index = pd.MultiIndex.from_product([self.columns, range(1, self.steps + 1)], names=['variable', 'horizon'])
+        return pd.DataFrame({'mean_loss_diff': mean.T.ravel(), 'statistic': statistic.T.ravel(),
+                             'pvalue': pvalue.T.ravel(), 'count': n}, index=index)
+
+
+def diebold_mariano(forecast_a, forecast_b, actual, columns, loss='squared', harvey=True):
+    """
+    Diebold-Mariano tests of equal accuracy of two models' forecasts from the same origins.
+
+    Parameters:
+    - forecast_a, forecast_b: NumPy arrays with shape (n_origins, steps, k), e.g. from backtest.backtest
+    - actual: NumPy array with the realised values, same shape
+    - columns: list, names of the variables
+    - loss: str, 'squared' or 'absolute' error loss (default='squared')
+    - harvey: bool, Harvey-Leybourne-Newbold small-sample correction with t p-values (default=True)
+
+    Returns:
+    - DataFrame indexed by (variable, horizon) with mean_loss_diff (A minus B), statistic, pvalue, count
+    """
+    forecast_a, forecast_b, actual = _as_3d(forecast_a), _as_3d(forecast_b), _as_3d(actual)
+    engine = DieboldMariano(columns, forecast_a.shape[1], loss)
+    for i in range(0, len(forecast_a), CHUNK):
+        engine.update(forecast_a[i:i + CHUNK], forecast_b[i:i + CHUNK], actual[i:i + CHUNK])
+    return engine.result(harvey)
+
+
+def evaluate_forecast(train, test, df_fc):
+    """
+    Evaluates the forecast against the test set for unempgr, dfedrate, and inflat.
+    Saves the metrics to the results store (`monetary-var show forecast_metrics`, per horizon
+    `monetary-var show forecast_horizons`).
+    Returns the input DataFrames unchanged.
+    """
+    # Task 19: Extract the forecast and actual values from the test set for the specified columns
+    columns = ['unempgr', 'dfedrate', 'inflat']
+    test_subset = test[columns]
+
+    # Calculate the forecast metrics, overall and per horizon (quarters ahead)
+    engine = ForecastMetrics(columns, len(test_subset)).update(df_fc[columns].values, test_subset.values)
+    metrics = engine.metrics()
+
+    # Save the metrics for each variable
+    record('evaluate_forecast', metrics=[('forecast', var, name, value)
+                                         for var, vals in metrics.items() for name, value in vals.items()]
+           + [('forecast_horizon', var, f"{name}:{horizon}", value)
+              for (var, horizon), vals in engine.by_horizon()[list(METRICS)].iterrows()
+              for name, value in vals.items()])
+
+    return train, test, df_fc
+
+if __name__ == "__main__":
+    from monetary_var.main import main
+    main(['evaluate_forecast'])
+    print("Forecast evaluation completed")
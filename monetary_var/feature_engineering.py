@@ -0,0 +1,37 @@
+import pandas as pd
+from monetary_var.transforms import Difference, PctChange
+
+def feature_transforms(unemployment='UNRATE'):
+    """
+    The modelled variables as invertible transforms of the levels (see transforms.py).
+
+    Parameters:
+    - unemployment: str, name of the unemployment rate column, its FRED ID (default='UNRATE')
+
+    Returns:
+    - dict mapping each variable to (level column, transform); unempgr is computed in merge_data,
+      the others in feature_engineering
+    """
+    return {
+        'unempgr': (unemployment, PctChange()),
+        'dfedrate': ('fedrate', Difference()),
+    }
+
+def feature_engineering(df):
+    """
+    Computes the differenced federal funds rate ('dfedrate') to remove the trend in the series,
+    with the transforms of feature_transforms ('unempgr' is already computed by merge_data).
+    Returns the updated DataFrame.
+    """
+    # Task 10: Compute differenced federal funds rate
+    # (the unemployment rate is the first column, named by its FRED ID, see merge_data)
+    for name, (column, transform) in feature_transforms(df.columns[0]).items():
+        if name != 'unempgr':
+            df[name] = transform.transform(df[column])
+
+    return df
+
+if __name__ == "__main__":
+    from monetary_var.main import main
+    main(['feature_engineering'])
+    print("Feature engineering completed")
@@ -0,0 +1,32 @@
+import pandas as pd
+from monetary_var.plotting import emit_plot, line
+
+TITLES = {
+    'dfedrate': 'Differenced Federal Funds Rate',
+    'inflat': 'Inflation',
+    'unempgr': 'Unemployment Growth Rate',
+}
+
+def forecast_visualizations(train, test, df_fc):
+    """
+    Visualizes forecasts vs actuals for every forecast variable (dfedrate, inflat, and unempgr).
+    Saves plots to results/plots/ (rendered in the background, see plotting.py).
+    Returns the input DataFrames unchanged.
+    """
+    # Task 17: Visualize forecasts vs actuals for each variable
+    for column in df_fc.columns:
+        emit_plot({
+            'path': f"results/plots/forecast_vs_actuals_{column}.png", 'figsize': (12, 5), 'dpi': 100,
+            'panels': [{'lines': [line(train[column][-40:], label='training'),
+                                  line(test[column], label='actual'),
+                                  line(df_fc[column], label='forecast')],
+                        'title': f"Forecast vs Actuals for {TITLES.get(column, column)}",
+                        'legend': {'loc': 'upper left', 'fontsize': 10}}],
+        })
+
+    return train, test, df_fc
+
+if __name__ == "__main__":
+    from monetary_var.main import main
+    main(['forecast_visualizations'])
+    print("Forecast visualizations completed")
@@ -0,0 +1,120 @@
+import json
+import os
+from datetime import datetime, timedelta
+import pandas as pd
+
+# Default location of the local FRED cache; override with FRED_CACHE_DIR
+DEFAULT_CACHE_DIR = "data/fred_cache"
+
+
+def is_offline(offline=None):
+    """
+    Resolves the offline flag. An explicit True/False wins, otherwise the FRED_OFFLINE
+    environment variable is used ('1', 'true' or 'yes' switch offline mode on).
+    """
+    if offline is not None:
+        return bool(offline)
+    return os.environ.get("FRED_OFFLINE", "").strip().lower() in ("1", "true", "yes")
+
+
+def _cache_paths(series_id, cache_dir):
+    cache_dir = cache_dir or os.environ.get("FRED_CACHE_DIR", DEFAULT_CACHE_DIR)
+    return (os.path.join(cache_dir, f"{series_id}.csv"),
+            os.path.join(cache_dir, f"{series_id}.json"))
+
+
+def load_cached_series(series_id, cache_dir=None):
+    """
+    Loads a series and its metadata from the local cache.
+
+    Parameters:
+    - series_id: str, FRED series identifier (e.g. 'UNRATE')
+    - cache_dir: str, optional, cache directory (default: FRED_CACHE_DIR or data/fred_cache)
+
+    Returns:
+    - (DataFrame, dict) with the cached observations and metadata, or (None, None) if not cached
+    """
+    data_path, meta_path = _cache_paths(series_id, cache_dir)
+    if not (os.path.exists(data_path) and os.path.exists(meta_path)):
+        return None, None
+    with open(meta_path) as f:
+        meta = json.load(f)
+    frame = pd.read_csv(data_path, index_col=0, parse_dates=True)
+    frame.index.name = 'DATE'
+    return frame, meta
+
+
+def save_cached_series(series_id, frame, fetched_start, fetched_end, cache_dir=None):
+    """
+    Writes a series to the cache as a single-column CSV plus a JSON metadata file.
+    Both files are written to a temporary name first and then moved into place,
+    so an interrupted run never leaves a half-written cache entry behind.
+    """
+    data_path, meta_path = _cache_paths(series_id, cache_dir)
+    os.makedirs(os.path.dirname(data_path) or ".", exist_ok=True)
+    observed = frame[series_id].dropna()
+    meta = {
+        'series_id': series_id,
+        'first_observation': observed.index.min().strftime("%Y-%m-%d") if len(observed) else None,
+        'last_observation': observed.index.max().strftime("%Y-%m-%d") if len(observed) else None,
+        'fetched_start': fetched_start.strftime("%Y-%m-%d"),
+        'fetched_end': fetched_end.strftime("%Y-%m-%d"),
+        'updated_at': datetime.now().isoformat(timespec='seconds'),
+    }
+    frame.to_csv(data_path + ".tmp")
+    os.replace(data_path + ".tmp", data_path)
+    with open(meta_path + ".tmp", "w") as f:
+        json.dump(meta, f, indent=2)
+    os.replace(meta_path + ".tmp", meta_path)
+    return meta
+
+
+def cached_series(series_id, start, end, fetch, cache_dir=None, offline=None, refresh=False):
+    """
+    Returns observations of a FRED series between start and end, served from the local
+    cache whenever possible.
+
+    - If the cache already covers [start, end] the network is not touched.
+    - If the cache covers the start but ends too early, only observations newer than the
+      cached tail (last observation date) are fetched and appended.
+    - In offline mode the cache is never refreshed; whatever part of [start, end] is cached
+      is returned, and a missing series raises a RuntimeError.
+
+    Parameters:
+    - series_id: str, FRED series identifier
+    - start, end: datetime, requested date range
+    - fetch: callable(series_id, start, end) returning a DataFrame with a column named series_id
+    - cache_dir: str, optional, cache directory
+    - offline: bool, optional, never touch the network (default: FRED_OFFLINE env var)
+    - refresh: bool, ignore the cache and download the full range again (default=False)
+
+    Returns:
+    - DataFrame indexed by observation date with a single column named series_id
+    """
+    start, end = pd.Timestamp(start), pd.Timestamp(end)
+    frame, meta = (None, None) if refresh else load_cached_series(series_id, cache_dir)
+
+    if is_offline(offline):
+        if frame is None:
+            raise RuntimeError(f"{series_id} is not in the local FRED cache and offline mode is on")
+        if pd.Timestamp(meta['fetched_start']) > start or pd.Timestamp(meta['fetched_end']) < end:
+            print(f"Offline mode: {series_id} cache only covers "
+                  f"{meta['fetched_start']} to {meta['fetched_end']}")
+        return frame.loc[start:end]
+
+    if frame is not None and pd.Timestamp(meta['fetched_start']) <= start:
+        fetched_end = pd.Timestamp(meta['fetched_end'])
+        if fetched_end >= end:
+            return frame.loc[start:end]
+        # Incremental refresh: only ask for observations after the cached tail
+        tail = pd.Timestamp(meta['last_observation'] or meta['fetched_start'])
+        new = fetch(series_id, tail + timedelta(days=1), end)
+        frame = pd.concat([frame, new])
+        frame = frame[~frame.index.duplicated(keep='last')].sort_index()
+        save_cached_series(series_id, frame, pd.Timestamp(meta['fetched_start']), end, cache_dir)
+        return frame.loc[start:end]
+
+    # Cold start (or requested range begins before the cache): download the full range
+    frame = fetch(series_id, start, end)
+    save_cached_series(series_id, frame, start, end, cache_dir)
+    return frame.loc[start:end]
@@ -0,0 +1,131 @@
+import http.client
+import io
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode, urlsplit
+import pandas as pd
+from monetary_var.fred_cache import cached_series
+from monetary_var.tracing import span
+
+# FRED's CSV endpoint (the one pandas_datareader uses); override with FRED_BASE_URL,
+# e.g. to point at the local stand-in server in fred_server.py
+FRED_BASE_URL = "https://fred.stlouisfed.org"
+
+# Status codes worth retrying: rate limiting and transient server errors
+RETRY_STATUS = (429, 500, 502, 503, 504)
+
+# One persistent connection per worker thread, so the pool size bounds open connections;
+# fetch_quarterly closes the connections of its pool's threads when the pool shuts down
+_local = threading.local()
+
+
+def _connection(base_url, timeout):
+    parts = urlsplit(base_url)
+    key = (parts.scheme, parts.netloc)
+    conn = getattr(_local, 'connections', {}).get(key)
+    if conn is None:
+        conn_cls = http.client.HTTPSConnection if parts.scheme == 'https' else http.client.HTTPConnection
+        conn = conn_cls(parts.netloc, timeout=timeout)
+        _local.__dict__.setdefault('connections', {})[key] = conn
+    return conn
+
+
+def _drop_connection(base_url):
+    parts = urlsplit(base_url)
+    conn = getattr(_local, 'connections', {}).pop((parts.scheme, parts.netloc), None)
+    if conn is not None:
+        conn.close()
+
+
+def fetch_fred_csv(series_id, start, end, base_url=None, timeout=30, retries=3, backoff=0.5):
+    """
+    Downloads one series from the FRED CSV endpoint, retrying transient failures with
+    exponential backoff and jitter.
+
+    Parameters:
+    - series_id: str, FRED series identifier
+    - start, end: datetime, date range
+    - base_url: str, optional, server root (default: FRED_BASE_URL env var or FRED itself)
+    - timeout: float, socket timeout in seconds (default=30)
+    - retries: int, number of retries after the first attempt (default=3)
+    - backoff: float, base delay in seconds, doubled on every retry (default=0.5)
+
+    Returns:
+    - DataFrame indexed by DATE with a single column named series_id
+    """
+    base_url = (base_url or os.environ.get("FRED_BASE_URL", FRED_BASE_URL)).rstrip("/")
+    path = urlsplit(base_url).path + "/graph/fredgraph.csv?" + urlencode({
+        'id': series_id,
+        'cosd': pd.Timestamp(start).strftime("%Y-%m-%d"),
+        'coed': pd.Timestamp(end).strftime("%Y-%m-%d"),
+    })
+
+    for attempt in range(retries + 1):
+        try:
+            conn = _connection(base_url, timeout)
+            conn.request("GET", path)
+            response = conn.getresponse()
+            body = response.read()
+            if response.status == 200:
+                break
+            if response.status not in RETRY_STATUS:
+                raise RuntimeError(f"FRED returned HTTP {response.status} for {series_id}")
+            error = RuntimeError(f"FRED returned HTTP {response.status} for {series_id}")
+        except (OSError, http.client.HTTPException) as e:
+            _drop_connection(base_url)
+            error = e
+        if attempt == retries:
+            raise RuntimeError(f"Failed to fetch {series_id} after {retries + 1} attempts: {error}")
+        time.sleep(backoff * 2 ** attempt * (1 + random.random()))
+
+    frame = pd.read_csv(io.BytesIO(body), index_col=0, parse_dates=True, na_values='.')
+    frame.columns = [series_id]
+    frame.index.name = 'DATE'
+    return frame
+
+
+def fetch_quarterly(series_ids, start, end, max_workers=4, base_url=None,
+                    cache_dir=None, offline=None, refresh=False):
+    """
+    Fetches several FRED series concurrently and resamples each to quarterly frequency
+    (last value of each quarter). Every series goes through the local FRED cache, so
+    only series that are missing or stale hit the network.
+
+    Parameters:
+    - series_ids: list of str, FRED series identifiers
+    - start, end: datetime, date range
+    - max_workers: int, size of the thread pool, which also bounds open connections (default=4)
+    - base_url: str, optional, server root passed to fetch_fred_csv
+    - cache_dir, offline, refresh: passed to fred_cache.cached_series
+
+    Returns:
+    - dict mapping each series ID (in input order) to its quarterly DataFrame
+    """
+    def fetch(series_id, fetch_start, fetch_end):
+        with span("fred_download", series=series_id):
+            return fetch_fred_csv(series_id, fetch_start, fetch_end, base_url=base_url)
+
+    # The connection dicts of the pool's worker threads, by thread
+    connections = {}
+
+    def load(series_id):
+        try:
+            with span("fred_series", series=series_id):
+                frame = cached_series(series_id, start, end, fetch=fetch, cache_dir=cache_dir,
+                                      offline=offline, refresh=refresh)
+                return frame.resample('3ME').last()
+        finally:
+            connections[threading.get_ident()] = _local.__dict__.setdefault('connections', {})
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(series_ids)))) as pool:
+            frames = list(pool.map(load, series_ids))
+    finally:
+        for opened in connections.values():
+            for conn in opened.values():
+                conn.close()
+            opened.clear()
+    return dict(zip(series_ids, frames))
@@ -0,0 +1,142 @@
+import argparse
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+import numpy as np
+import pandas as pd
+
+
+# Series generated as driftless random walks (unit roots), like the levels of the rates they stand in
+# for, with their monthly step size and floor; every other ID is stationary
+UNIT_ROOT_SERIES = {'FEDFUNDS': (0.25, 0.0), 'UNRATE': (0.15, 2.0)}
+
+
+def synthetic_series(series_id, start="1960-01-01", end="2024-12-01"):
+    """
+    Generates a deterministic monthly series for a FRED ID, seeded from the ID, so every request
+    for the same ID returns the same data: a random walk reflected at its floor for the IDs in
+    UNIT_ROOT_SERIES (so the pipeline differences the policy rate, as with the real data), and a
+    mean-reverting walk around 5 otherwise.
+    """
+    dates = pd.date_range(start, end, freq='MS')
+    rng = np.random.default_rng(zlib.crc32(series_id.encode()))
+    values = np.empty(len(dates))
+    level = 5.0
+    for i in range(len(dates)):
+        if series_id in UNIT_ROOT_SERIES:
+            scale, floor = UNIT_ROOT_SERIES[series_id]
+            level = floor + abs(level - floor + rng.normal(scale=scale))
+        else:
+            level += 0.05 * (5.0 - level) + rng.normal(scale=0.3)
+        values[i] = level
+    return pd.Series(np.round(values, 3), index=dates, name=series_id)
+
+
+class FredHandler(BaseHTTPRequestHandler):
+    """
+    Serves /graph/fredgraph.csv?id=...&cosd=...&coed=... in FRED's CSV format.
+    Behaviour is controlled by attributes set on the server: latency (seconds slept per
+    request) and fail_every (every n-th request answers 503, to exercise retries).
+    """
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        server = self.server
+        parts = urlsplit(self.path)
+        query = parse_qs(parts.query)
+        with server.lock:
+            server.requests += 1
+            count = server.requests
+        if server.latency:
+            time.sleep(server.latency)
+        if not parts.path.endswith("/graph/fredgraph.csv") or 'id' not in query:
+            return self._send(404, b"Not found\n")
+        if server.fail_every and count % server.fail_every == 0:
+            return self._send(503, b"Service unavailable\n")
+
+        series_id = query['id'][0]
+        series = synthetic_series(series_id)
+        start = query.get('cosd', [None])[0]
+        end = query.get('coed', [None])[0]
+        series = series.loc[start:end]
+        lines = [f"observation_date,{series_id}"]
+        lines += [f"{date:%Y-%m-%d},{value}" for date, value in series.items()]
+        self._send(200, ("\n".join(lines) + "\n").encode(), "text/csv")
+
+    def _send(self, status, body, content_type="text/plain"):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server(port=0, latency=0.0, fail_every=0):
+    """
+    Starts the FRED stand-in server on a background thread.
+
+    Parameters:
+    - port: int, port to bind on localhost (default=0, any free port)
+    - latency: float, seconds to sleep per request to mimic a network round trip (default=0.0)
+    - fail_every: int, answer every n-th request with HTTP 503 (default=0, never)
+
+    Returns:
+    - (server, base_url): call server.shutdown() when done; pass base_url to fetch_fred_csv
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", port), FredHandler)
+    server.daemon_threads = True
+    server.latency = latency
+    server.fail_every = fail_every
+    server.requests = 0
+    server.lock = threading.Lock()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def benchmark(n_series=3, latency=0.2, max_workers=4):
+    """
+    Times sequential against concurrent fetching of n_series IDs from the stand-in server.
+    The FRED cache is bypassed (refresh=True, throwaway directory) so every run downloads.
+    """
+    import tempfile
+    from monetary_var.fred_fetch import fetch_quarterly
+
+    server, base_url = start_server(latency=latency)
+    series_ids = [f"SERIES{i}" for i in range(n_series)]
+    timings = {}
+    try:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            for label, workers in (("sequential", 1), ("concurrent", max_workers)):
+                t0 = time.perf_counter()
+                fetch_quarterly(series_ids, "1970-01-01", "2019-12-31", max_workers=workers,
+                                base_url=base_url, cache_dir=cache_dir, refresh=True)
+                timings[label] = time.perf_counter() - t0
+    finally:
+        server.shutdown()
+    return timings
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local stand-in for the FRED CSV endpoint")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--fail-every", type=int, default=0)
+    parser.add_argument("--benchmark", type=int, metavar="N_SERIES",
+                        help="time sequential vs concurrent fetching of N series and exit")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        for label, seconds in benchmark(args.benchmark, latency=args.latency or 0.2).items():
+            print(f"{label}: {seconds:.3f}s")
+    else:
+        server, base_url = start_server(args.port, args.latency, args.fail_every)
+        print(f"Serving FRED stand-in at {base_url} (set FRED_BASE_URL to use it)")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            server.shutdown()
@@ -0,0 +1,48 @@
+import pandas as pd
+from monetary_var.granger_matrix import pairwise_granger, var_granger_matrix
+from monetary_var.results_store import record
+
+def _test_rows(results, tests):
+    """
+    Converts batched Granger test arrays into results store rows, one per test, ordered pair and lag.
+    """
+    names = results['names']
+    rows = []
+    for i, cause in enumerate(names):
+        for j, effect in enumerate(names):
+            if i == j:
+                continue
+            for lag in results['lags']:
+                at = (lag - 1, i, j)
+                for test, stat in tests:
+                    rows.append((test, f"{cause} -> {effect}", int(lag), results[stat][at],
+                                 results[f"{stat}_pvalue"][at], {'df_resid': int(results['df_resid'][lag - 1])}))
+    return rows
+
+def granger_causality(df):
+    """
+    Performs Granger Causality tests for dfedrate -> unempgr, dfedrate -> inflat, and unempgr -> inflat on the full dataset.
+    All ordered pairs are tested at once with the pairwise engine in granger_matrix.py, and the conditional
+    (within-VAR) p-values for every pair are saved as well.
+    Saves results to the results store (`monetary-var show granger` / `granger_matrix`).
+    Returns the DataFrame unchanged
+    """
+    # Pairwise tests for every ordered pair of variables, lags 1 to 3
+    data = df[['unempgr', 'dfedrate', 'inflat']][1:]
+    pairwise = pairwise_granger(data, maxlag=3)
+
+    # The ssr F, ssr chi2 and LR tests of every pair, including dfedrate -> unempgr,
+    # dfedrate -> inflat and unempgr -> inflat
+    rows = _test_rows(pairwise, [('ssr_ftest', 'F'), ('ssr_chi2test', 'chi2'), ('lrtest', 'lr')])
+
+    # Granger matrix: conditional (given the other variables' lags in the VAR) p-values as well
+    conditional = var_granger_matrix(data, maxlag=3)
+    rows += _test_rows(conditional, [('var_ftest', 'F')])
+    record('granger_causality', tests=rows)
+
+    return df
+
+if __name__ == "__main__":
+    from monetary_var.main import main
+    main(['granger_causality'])
+    print("Granger Causality tests completed")
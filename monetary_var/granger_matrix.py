@@ -0,0 +1,178 @@
+import numpy as np
+from scipy import stats
+from monetary_var.var_lag_sweep import lag_design, TRENDS
+from monetary_var.tracing import traced
+
+
+def _own_and_cross_lags(values, lag):
+    """
+    Shared lagged design for all pairwise tests at one lag order: one block of `lag` columns
+    per variable (lag 1 first) followed by a constant, on the sample that drops the first
+    `lag` observations.
+    """
+    nobs, n = values.shape
+    blocks = [values[lag - l:nobs - l] for l in range(1, lag + 1)]
+    # Reorder from lag-major to variable-major so each variable's lags are contiguous
+    W = np.stack(blocks, axis=2).reshape(nobs - lag, n * lag)
+    W = np.hstack([W, np.ones((nobs - lag, 1))])
+    return W, values[lag:]
+
+
+def _batched_ssr(G, c, yy, idx, target):
+    """
+    Residual sums of squares of many small regressions sharing one cross-product matrix.
+    Regression r uses the columns idx[r] of the shared design and the target column target[r].
+    """
+    Gs = G[idx[:, :, None], idx[:, None, :]]
+    cs = c[idx, target[:, None]]
+    beta = np.linalg.solve(Gs, cs[:, :, None])[:, :, 0]
+    return yy[target] - np.einsum('rm,rm->r', cs, beta)
+
+
+@traced("pairwise_granger")
+def pairwise_granger(data, maxlag=3):
+    """
+    Bivariate Granger causality tests for every ordered pair of columns and every lag order
+    from 1 to maxlag (the tests of statsmodels' grangercausalitytests, for all pairs at once).
+
+    For each lag order the lagged design of all variables and its cross-product matrix are built
+    once; the restricted (own lags) and unrestricted (own and cause lags) regressions of every
+    pair are solved as one batch of small linear systems on that shared cross-product.
+
+    Parameters:
+    - data: pandas DataFrame with the (stationary) time series variables
+    - maxlag: int, largest lag order to test (default=3)
+
+    Returns:
+    - dict with arrays of shape (maxlag, N, N), where [lag - 1, i, j] tests whether column i
+      Granger-causes column j (diagonal is NaN):
+      'F', 'F_pvalue' (ssr-based F test), 'chi2', 'chi2_pvalue' (ssr-based chi2 test),
+      'lr', 'lr_pvalue' (likelihood ratio test),
+      plus 'df_resid' (maxlag,), 'lags' and 'names'
+    """
+    values = np.asarray(data.values, dtype=float)
+    nobs, n = values.shape
+    if nobs <= 3 * maxlag + 1:
+        raise ValueError(f"Insufficient observations. Maximum allowable lag is {int((nobs - 1) / 3) - 1}")
+
+    cause, effect = np.nonzero(~np.eye(n, dtype=bool))
+    shape = (maxlag, n, n)
+    out = {key: np.full(shape, np.nan) for key in
+           ('F', 'F_pvalue', 'chi2', 'chi2_pvalue', 'lr', 'lr_pvalue')}
+    out['df_resid'] = np.empty(maxlag, dtype=int)
+
+    for lag in range(1, maxlag + 1):
+        W, Y = _own_and_cross_lags(values, lag)
+        T = len(Y)
+        G, c, yy = W.T @ W, W.T @ Y, np.einsum('tj,tj->j', Y, Y)
+        const = n * lag
+        block = np.arange(lag)
+
+        # Restricted: own lags and constant; unrestricted: own lags, cause lags and constant
+        own = effect[:, None] * lag + block
+        idx_r = np.hstack([own, np.full((len(effect), 1), const)])
+        idx_u = np.hstack([own, cause[:, None] * lag + block, np.full((len(effect), 1), const)])
+        ssr_r = _batched_ssr(G, c, yy, idx_r, effect)
+        ssr_u = _batched_ssr(G, c, yy, idx_u, effect)
+
+        df_resid = T - (2 * lag + 1)
+        F = (ssr_r - ssr_u) / ssr_u / lag * df_resid
+        chi2 = T * (ssr_r - ssr_u) / ssr_u
+        lr = T * np.log(ssr_r / ssr_u)
+        at = (lag - 1, cause, effect)
+        out['F'][at], out['F_pvalue'][at] = F, stats.f.sf(F, lag, df_resid)
+        out['chi2'][at], out['chi2_pvalue'][at] = chi2, stats.chi2.sf(chi2, lag)
+        out['lr'][at], out['lr_pvalue'][at] = lr, stats.chi2.sf(lr, lag)
+        out['df_resid'][lag - 1] = df_resid
+
+    out['lags'] = np.arange(1, maxlag + 1)
+    out['names'] = list(data.columns)
+    return out
+
+
+def _var_ols(values, lags, trend):
+    Z, Y = lag_design(values, lags, trend)
+    Ginv = np.linalg.inv(Z.T @ Z)
+    B = Ginv @ (Z.T @ Y)
+    resid = Y - Z @ B
+    df_resid = len(Y) - Z.shape[1]
+    return B, Ginv, resid.T @ resid / df_resid, df_resid
+
+
+@traced("var_granger_matrix")
+def var_granger_matrix(data, maxlag=3, trend='c'):
+    """
+    Conditional Granger causality within the full VAR: for every ordered pair (i, j) and every
+    VAR order from 1 to maxlag, a Wald test that the lags of variable i can be excluded from the
+    equation of variable j, given the lags of all other variables
+    (VARResults.test_causality(j, i) for all pairs, from one fit per lag order).
+
+    Parameters:
+    - data: pandas DataFrame with the (stationary) time series variables
+    - maxlag: int, largest VAR order (default=3)
+    - trend: str, 'n', 'c' or 'ct' (default='c')
+
+    Returns:
+    - dict with arrays of shape (maxlag, N, N), [lag - 1, i, j] testing i -> j (diagonal NaN):
+      'F', 'F_pvalue', 'wald', 'wald_pvalue', plus 'df_resid' (maxlag,), 'lags' and 'names'
+    """
+    values = np.asarray(data.values, dtype=float)
+    n = values.shape[1]
+    ntrend = TRENDS[trend]
+    cause, effect = np.nonzero(~np.eye(n, dtype=bool))
+    shape = (maxlag, n, n)
+    out = {key: np.full(shape, np.nan) for key in ('F', 'F_pvalue', 'wald', 'wald_pvalue')}
+    out['df_resid'] = np.empty(maxlag, dtype=int)
+
+    for lag in range(1, maxlag + 1):
+        B, Ginv, sigma_u, df_resid = _var_ols(values, lag, trend)
+        # Rows of B holding the lags of each causing variable
+        rows = ntrend + cause[:, None] + n * np.arange(lag)
+        b = B[rows, effect[:, None]]
+        V = Ginv[rows[:, :, None], rows[:, None, :]] * sigma_u[effect, effect][:, None, None]
+        wald = np.einsum('rm,rm->r', b, np.linalg.solve(V, b[:, :, None])[:, :, 0])
+        at = (lag - 1, cause, effect)
+        out['wald'][at], out['wald_pvalue'][at] = wald, stats.chi2.sf(wald, lag)
+        out['F'][at] = wald / lag
+        out['F_pvalue'][at] = stats.f.sf(wald / lag, lag, n * df_resid)
+        out['df_resid'][lag - 1] = df_resid
+
+    out['lags'] = np.arange(1, maxlag + 1)
+    out['names'] = list(data.columns)
+    return out
+
+
+@traced("var_granger_block")
+def var_granger_block(data, causing, caused, lags=3, trend='c'):
+    """
+    Block Granger causality test within the VAR: do the lags of the `causing` variables jointly
+    help predict the `caused` variables, given the lags of all variables?
+
+    Parameters:
+    - data: pandas DataFrame with the (stationary) time series variables
+    - causing: list of str, causing variable names
+    - caused: list of str, caused variable names
+    - lags: int, VAR order (default=3)
+    - trend: str, 'n', 'c' or 'ct' (default='c')
+
+    Returns:
+    - dict with 'F', 'F_pvalue', 'wald', 'wald_pvalue' and 'df' (F degrees of freedom)
+    """
+    names = list(data.columns)
+    n, ntrend = len(names), TRENDS[trend]
+    ing = [names.index(c) for c in causing]
+    ed = [names.index(c) for c in caused]
+    B, Ginv, sigma_u, df_resid = _var_ols(np.asarray(data.values, dtype=float), lags, trend)
+
+    rows = np.array([ntrend + i + n * l for l in range(lags) for i in ing])
+    b = B[np.ix_(rows, ed)].ravel(order='F')
+    V = np.kron(sigma_u[np.ix_(ed, ed)], Ginv[np.ix_(rows, rows)])
+    wald = float(b @ np.linalg.solve(V, b))
+    num_restr = len(b)
+    return {
+        'F': wald / num_restr,
+        'F_pvalue': stats.f.sf(wald / num_restr, num_restr, n * df_resid),
+        'wald': wald,
+        'wald_pvalue': stats.chi2.sf(wald, num_restr),
+        'df': (num_restr, n * df_resid),
+    }
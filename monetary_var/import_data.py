@@ -0,0 +1,39 @@
+import pandas as pd
+from datetime import datetime
+from monetary_var.fred_fetch import fetch_quarterly
+
+# FRED series used by default: unemployment rate, inflation rate, policy rate
+SERIES_IDS = ('UNRATE', 'FLEXCPIM679SFRBATL', 'FEDFUNDS')
+
+
+def import_data(cache_dir=None, offline=None, refresh=False, max_workers=3,
+                series_ids=SERIES_IDS, start=datetime(1970, 1, 1), end=datetime(2019, 12, 31)):
+    """
+    Fetches data from the federal reserve economic Data (FRED) and resamples to quarterly frequency.
+    Returns three DataFrames: unempdata, inflatdata, fedfunddata.
+    series_ids names the unemployment, inflation and policy rate series, in that order, so the
+    same pipeline can run on other countries or measures (see batch.py); start and end bound the
+    sample.
+    ".resample('3M', axis=0)": Groups the data into 3-month (quarterly) intervals along the rows (axis=0).
+    ".last()": Takes the last value in each 3-month period as the quarterly value
+
+    The three series are downloaded concurrently (see fred_fetch.py) through the local FRED cache
+    (see fred_cache.py): repeat runs are served from disk, only observations newer than the cached
+    tail are downloaded, and offline=True (or FRED_OFFLINE=1) never touches the network.
+    refresh=True forces a full download.
+    """
+    # Task 1-4: Download data from FRED and resample each series to quarterly frequency
+    # Unemployment data (UNRATE), inflation data (FLEXCPIM679SFRBATL), federal funds rate data (FEDFUNDS)
+    unemp_id, inflat_id, fedfund_id = series_ids
+    quarterly = fetch_quarterly([unemp_id, inflat_id, fedfund_id], start, end,
+                                max_workers=max_workers, cache_dir=cache_dir,
+                                offline=offline, refresh=refresh)
+    unemp_q = quarterly[unemp_id]
+    inflat_q = quarterly[inflat_id]
+    fedfund_q = quarterly[fedfund_id]
+
+    return unemp_q, inflat_q, fedfund_q
+
+if __name__ == "__main__":
+    unemp_q, inflat_q, fedfund_q = import_data()
+    print("Data imported successfully")
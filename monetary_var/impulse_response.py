@@ -0,0 +1,239 @@
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from monetary_var.tracing import traced
+
+# Impulse responses and forecast error variance decompositions of a fitted VAR (statsmodels
+# VARResults or BayesianVARResults). Every kind of response is built from the MA coefficients
+# Phi_h, the top block rows of the companion matrix powers A^h, which are computed once per
+# model and horizon and cached. Confidence bands replicate the model (residual bootstrap, Monte
+# Carlo from the asymptotic distribution, or posterior draws for a Bayesian VAR) in blocks of
+# BLOCK replications, each with its own seeded RNG stream, so blocks can run on a process pool
+# and the bands do not depend on the number of workers.
+#
+# Arrays are indexed [horizon, response, shock], as statsmodels' irf().
+
+KINDS = ('simple', 'orth', 'cumulative', 'generalized', 'fevd')
+BLOCK = 250
+
+# MA coefficients by (coefficient hash, horizon)
+_POWERS = {}
+_POWERS_SIZE = 16
+
+
+def _ma(coefs, horizon):
+    """
+    MA coefficients Phi_0..Phi_horizon for lag matrices with shape (..., p, k, k), batched over
+    leading axes. J A^h (the first k rows of the companion power) is advanced one product at a time.
+    """
+    *batch, p, k, _ = coefs.shape
+    companion = np.zeros((*batch, k * p, k * p))
+    companion[..., :k, :] = np.concatenate(list(np.moveaxis(coefs, -3, 0)), axis=-1)
+    companion[..., k:, :-k] = np.eye(k * (p - 1))
+    rows = np.zeros((*batch, k, k * p))
+    rows[..., :, :k] = np.eye(k)
+    phi = np.empty((*batch, horizon + 1, k, k))
+    phi[..., 0, :, :] = np.eye(k)
+    for h in range(1, horizon + 1):
+        rows = rows @ companion
+        phi[..., h, :, :] = rows[..., :k]
+    return phi
+
+
+def companion_powers(results, horizon=40):
+    """
+    MA coefficients Phi_0..Phi_horizon of a fitted VAR (cached per model and horizon).
+
+    Parameters:
+    - results: fitted VAR (statsmodels VARResults or BayesianVARResults)
+    - horizon: int, last horizon (default=40)
+
+    Returns:
+    - NumPy array with shape (horizon + 1, k, k)
+    """
+    coefs = np.ascontiguousarray(results.coefs, dtype=float)
+    key = (hashlib.sha256(coefs.tobytes() + str(coefs.shape).encode()).hexdigest(), horizon)
+    if key not in _POWERS:
+        if len(_POWERS) >= _POWERS_SIZE:
+            _POWERS.pop(next(iter(_POWERS)))
+        _POWERS[key] = _ma(coefs, horizon)
+    return _POWERS[key]
+
+
+def _responses(phi, sigma, kinds):
+    """
+    Responses of every kind from the MA coefficients and residual covariance, batched over
+    leading axes (phi: (..., H + 1, k, k), sigma: (..., k, k)).
+    """
+    out = {}
+    if 'simple' in kinds:
+        out['simple'] = phi
+    if {'orth', 'cumulative', 'fevd'} & set(kinds):
+        orth = phi @ np.linalg.cholesky(sigma)[..., None, :, :]
+        if 'orth' in kinds:
+            out['orth'] = orth
+        if 'cumulative' in kinds:
+            out['cumulative'] = np.cumsum(orth, axis=-3)
+        if 'fevd' in kinds:
+            # Share of shock j in the h-step forecast error variance of variable i, h = 1..H
+            mse = np.cumsum(orth ** 2, axis=-3)[..., :-1, :, :]
+            out['fevd'] = mse / mse.sum(axis=-1, keepdims=True)
+    if 'generalized' in kinds:
+        # Pesaran-Shin: the response to a one standard deviation shock in j, Phi_h Sigma e_j / sqrt(sigma_jj)
+        scale = np.sqrt(np.diagonal(sigma, axis1=-2, axis2=-1))[..., None, None, :]
+        out['generalized'] = phi @ sigma[..., None, :, :] / scale
+    return out
+
+
+def impulse_responses(results, horizon=40, kind='orth'):
+    """
+    Impulse responses of a fitted VAR.
+
+    Parameters:
+    - results: fitted VAR (statsmodels VARResults or BayesianVARResults)
+    - horizon: int, last horizon in quarters (default=40)
+    - kind: str, 'simple' (MA coefficients, unit shocks), 'orth' (Cholesky-orthogonalized
+      one standard deviation shocks, in the variable order of the model), 'cumulative'
+      (accumulated orthogonalized responses), 'generalized' (Pesaran-Shin, order-invariant)
+      or 'fevd' (variance decomposition, see fevd) (default='orth')
+
+    Returns:
+    - NumPy array with shape (horizon + 1, k, k): [horizon, response, shock]
+      ((horizon, k, k) for 'fevd')
+    """
+    if kind not in KINDS:
+        raise ValueError(f"Invalid kind. Use one of {', '.join(KINDS)}.")
+    sigma = np.asarray(results.sigma_u, dtype=float)
+    return _responses(companion_powers(results, horizon), sigma, (kind,))[kind]
+
+
+def fevd(results, horizon=40):
+    """
+    Forecast error variance decomposition from the orthogonalized responses.
+
+    Returns:
+    - NumPy array with shape (horizon, k, k): [h - 1, variable, shock], the share of each shock
+      in the h-step ahead forecast error variance of each variable (rows sum to one)
+    """
+    return impulse_responses(results, horizon, 'fevd')
+
+
+def _model(results):
+    """
+    The parts of a fitted VAR the replications need, as plain arrays.
+    """
+    model = {'coefs': np.asarray(results.coefs, dtype=float),
+             'intercept': np.asarray(getattr(results, 'intercept', np.zeros(results.neqs)), dtype=float),
+             'sigma': np.asarray(results.sigma_u, dtype=float),
+             'trend': getattr(results, 'trend', 'c')}
+    if hasattr(results, 'posterior_draws'):
+        model['posterior'] = results
+    elif getattr(results, 'endog', None) is not None:
+        model['endog'] = np.asarray(results.endog, dtype=float)
+    return model
+
+
+def _ols(Y, Z):
+    """
+    Batched least squares: coefficients (R, m, k) and residual covariances (R, k, k).
+    """
+    B = np.linalg.solve(Z.transpose(0, 2, 1) @ Z, Z.transpose(0, 2, 1) @ Y)
+    resid = Y - Z @ B
+    sigma = resid.transpose(0, 2, 1) @ resid / (Y.shape[1] - Z.shape[2])
+    return B, sigma
+
+
+def _lag_matrices(B, ntrend, p, k):
+    # Coefficient rows [trend terms, L1 (k rows), ..., Lp] -> lag matrices (R, p, k, k)
+    return B[:, ntrend:].reshape(len(B), p, k, k).transpose(0, 1, 3, 2)
+
+
+def _replicate(model, horizon, kinds, method, reps, seed):
+    """
+    One block of replications with its own RNG stream: re-estimated coefficients and residual
+    covariances, then the responses of each kind for all replications at once.
+    """
+    rng = np.random.default_rng(seed)
+    coefs, intercept, sigma = model['coefs'], model['intercept'], model['sigma']
+    p, k = coefs.shape[:2]
+    ntrend = 1 if model['trend'] == 'c' else 0
+    if method == 'posterior':
+        B, sigmas, _ = model['posterior'].posterior_draws(reps, seed=rng)
+        draws = _lag_matrices(B, model['posterior'].k_trend, p, k)
+    else:
+        y = model['endog']
+        T = len(y) - p
+        B_hat = np.vstack([intercept[None] if ntrend else np.empty((0, k)), *coefs.transpose(0, 2, 1)])
+        lagged = np.concatenate([y[p - i:len(y) - i] for i in range(1, p + 1)], axis=1)
+        Z = np.hstack([np.ones((T, ntrend)), lagged])
+        if method == 'bootstrap':
+            # Residual bootstrap: rebuild each sample recursively from resampled, centred residuals
+            resid = y[p:] - Z @ B_hat
+            resid -= resid.mean(axis=0)
+            shocks = resid[rng.integers(0, T, size=(reps, T))]
+            sample = np.empty((reps, len(y), k))
+            sample[:, :p] = y[:p]
+            for t in range(p, len(y)):
+                sample[:, t] = intercept * ntrend + shocks[:, t - p] + sum(
+                    sample[:, t - i] @ coefs[i - 1].T for i in range(1, p + 1))
+            lagged = np.concatenate([sample[:, p - i:len(y) - i] for i in range(1, p + 1)], axis=2)
+            design = np.concatenate([np.ones((reps, T, ntrend)), lagged], axis=2)
+            B, sigmas = _ols(sample[:, p:], design)
+        else:
+            # Monte Carlo: vec(B) ~ N(B_hat, Sigma kron (Z'Z)^-1), Sigma held at its estimate
+            left = np.linalg.cholesky(np.linalg.inv(Z.T @ Z))
+            right = np.linalg.cholesky(sigma)
+            B = B_hat + left @ rng.standard_normal((reps, len(B_hat), k)) @ right.T
+            sigmas = np.broadcast_to(sigma, (reps, k, k))
+        draws = _lag_matrices(B, ntrend, p, k)
+    return _responses(_ma(draws, horizon), sigmas, kinds)
+
+
+@traced("response_bands")
+def response_bands(results, horizon=40, kinds=('orth',), method=None, reps=2000, alpha=0.10, seed=0, n_jobs=1):
+    """
+    Confidence (or credible) bands of impulse responses and variance decompositions.
+
+    Parameters:
+    - results: fitted VAR (statsmodels VARResults or BayesianVARResults)
+    - horizon: int, last horizon in quarters (default=40)
+    - kinds: list of str, response kinds from KINDS (default: orthogonalized responses)
+    - method: str, 'bootstrap' (residual bootstrap), 'mc' (Monte Carlo from the asymptotic
+      distribution of the coefficients) or 'posterior' (draws of a Bayesian VAR)
+      (default: 'posterior' for a Bayesian VAR, otherwise 'bootstrap')
+    - reps: int, number of replications (default=2000)
+    - alpha: float, bands cover 1 - alpha (default=0.10)
+    - seed: int, seed of the replication streams (default=0)
+    - n_jobs: int, number of worker processes the replication blocks are split across
+      (default=1, in process)
+
+    Returns:
+    - dict mapping each kind to (lower, upper) arrays shaped like impulse_responses (or fevd)
+    """
+    model = _model(results)
+    method = method or ('posterior' if 'posterior' in model else 'bootstrap')
+    if method == 'posterior' and 'posterior' not in model:
+        raise ValueError("Posterior bands need a Bayesian VAR (bayesian_var.py).")
+    if method in ('bootstrap', 'mc') and 'endog' not in model:
+        raise ValueError(f"{method} bands need the data the model was fitted on (results.endog).")
+    if model['trend'] not in ('n', 'c'):
+        raise ValueError("Invalid trend. Bands support 'n' or 'c'.")
+    unknown = [kind for kind in kinds if kind not in KINDS]
+    if unknown:
+        raise ValueError(f"Invalid kinds {unknown}. Use {', '.join(KINDS)}.")
+    # Every block has a fixed size and its own child seed, so results do not depend on n_jobs
+    sizes = [min(BLOCK, reps - start) for start in range(0, reps, BLOCK)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    args = (model, horizon, list(kinds), method)
+    if n_jobs <= 1 or len(sizes) == 1:
+        blocks = [_replicate(*args, size, child) for size, child in zip(sizes, seeds)]
+    else:
+        with ProcessPoolExecutor(max_workers=min(n_jobs, len(sizes))) as pool:
+            blocks = list(pool.map(_replicate, *[[a] * len(sizes) for a in args], sizes, seeds))
+
+    bands = {}
+    for kind in kinds:
+        draws = np.concatenate([block[kind] for block in blocks])
+        lower, upper = np.quantile(draws, [alpha / 2, 1 - alpha / 2], axis=0)
+        bands[kind] = (lower, upper)
+    return bands
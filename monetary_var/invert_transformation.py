@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+from monetary_var.feature_engineering import feature_transforms
+
+def invert_paths(paths, columns, history):
+    """
+    Converts forecast paths of the modelled variables back to levels, all paths at once.
+
+    Parameters:
+    - paths: NumPy array with shape (steps, k) for one forecast, or (n_paths, steps, k) for
+      simulated or bootstrapped paths (e.g. BayesianVARResults.simulate_forecast)
+    - columns: list, names of the k variables
+    - history: DataFrame, the levels up to the forecast origin (the df of feature_engineering)
+
+    Returns:
+    - dict mapping each level column (fedrate, and the unemployment rate) to an array with
+      shape (steps,) or (n_paths, steps)
+    """
+    paths = np.asarray(paths, dtype=float)
+    levels = {}
+    for name, (column, transform) in feature_transforms(history.columns[0]).items():
+        if name in columns and column in history:
+            levels[column] = transform.inverse(paths[..., columns.index(name)], history[column].values)
+    return levels
+
+def invert_transformation(train, test, df_fc, df):
+    """
+    Inverts the transformations to compute the forecasted fedrate and unemployment rate.
+    Returns the updated train, test, and df_fc DataFrames.
+    """
+    # Task 18: Invert the transformation (differencing) to get the real forecast
+    # Add the original federal funds rate ('fedrate') and unemployment rate to the training and test sets
+    levels = invert_paths(df_fc.values, list(df_fc.columns), df.loc[:train.index[-1]])
+    for column, values in levels.items():
+        train[column] = df[column].loc[train.index]
+        test[column] = df[column].loc[test.index]
+
+        # Convert the forecasted differences back to levels, from the last level of the training set
+        df_fc[column] = values
+
+    return train, test, df_fc
+
+if __name__ == "__main__":
+    from monetary_var.main import main
+    main(['invert_transformation'])
+    print("Transformation inversion completed")
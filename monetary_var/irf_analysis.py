@@ -0,0 +1,50 @@
+from monetary_var.impulse_response import impulse_responses, fevd, response_bands
+from monetary_var.plotting import emit_plot
+from monetary_var.results_store import record
+
+def irf_analysis(final_results, horizon=20, reps=2000, alpha=0.10):
+    """
+    Computes the orthogonalized impulse responses of the final VAR model (Cholesky order unempgr,
+    dfedrate, inflat) with bootstrap bands, and its forecast error variance decomposition
+    (see impulse_response.py).
+    Saves them to the results store (`monetary-var show irf`, `monetary-var show fevd`) and a plot
+    of the responses to results/plots/.
+    Returns the final VAR model results unchanged.
+    """
+    # Responses to one standard deviation shocks, e.g. how inflation reacts to a rate shock
+    names = list(final_results.names)
+    responses = impulse_responses(final_results, horizon, 'orth')
+    decomposition = fevd(final_results, horizon)
+    bands = response_bands(final_results, horizon, kinds=('orth',), reps=reps, alpha=alpha, seed=0)
+    lower, upper = bands['orth']
+
+    rows = []
+    for j, shock in enumerate(names):
+        for i, response in enumerate(names):
+            for h in range(horizon + 1):
+                rows += [('irf', f"{shock} -> {response}", f"response:{h}", responses[h, i, j]),
+                         ('irf', f"{shock} -> {response}", f"lower:{h}", lower[h, i, j]),
+                         ('irf', f"{shock} -> {response}", f"upper:{h}", upper[h, i, j])]
+    rows += [('fevd', response, f"{shock}:{h + 1}", decomposition[h, i, j])
+             for i, response in enumerate(names) for j, shock in enumerate(names) for h in range(horizon)]
+    rows.append(('irf', '', 'coverage', 1 - alpha))
+    record('irf_analysis', metrics=rows)
+
+    # One panel per (response, shock) pair, bands in grey
+    steps = list(range(horizon + 1))
+    emit_plot({
+        'path': "results/plots/impulse_responses.png", 'figsize': (4 * len(names), 3 * len(names)), 'dpi': 100,
+        'layout': (len(names), len(names)), 'tight_layout': True,
+        'panels': [{'lines': [{'x': steps, 'y': responses[:, i, j], 'label': 'response'},
+                              {'x': steps, 'y': lower[:, i, j], 'color': 'grey'},
+                              {'x': steps, 'y': upper[:, i, j], 'color': 'grey'}],
+                    'title': f"{shock} -> {response}", 'grid': True}
+                   for i, response in enumerate(names) for j, shock in enumerate(names)],
+    })
+
+    return final_results
+
+if __name__ == "__main__":
+    from monetary_var.main import main
+    main(['irf_analysis'])
+    print("Impulse response analysis completed")
@@ -0,0 +1,138 @@
+import argparse
+import os
+from contextlib import nullcontext
+from monetary_var import plotting, results_store, tracing
+from monetary_var.pipeline import Stage, run_pipeline
+
+# The pipeline as a stage graph: each stage names the artifacts it reads and writes.
+# Stages without outputs only save results (files under results/, the results store); independent ones
+# run concurrently.
+# Stage functions are named by path so their modules (and statsmodels) load only when they run.
+def build_stages(dataset=None):
+    """
+    Builds the stage graph for one dataset.
+
+    Parameters:
+    - dataset: dict, optional, keyword arguments for import_data (series_ids, start, end),
+      e.g. to run on another country's series (default: the US FRED series)
+
+    Returns:
+    - list of Stage
+    """
+    return [
+        # Task 1-4: Import data (always runs; served from the local FRED cache)
+        Stage('import_data', 'monetary_var.import_data:import_data',
+              outputs=['unemp_q', 'inflat_q', 'fedfund_q'], kwargs=dataset, volatile=True),
+
+        # Task 5-7: Merge data and compute unempgr (data checks saved to the results store)
+        Stage('merge_data', 'monetary_var.merge_data:merge_data',
+              inputs=['unemp_q', 'inflat_q', 'fedfund_q'], outputs=['df_merged'], records=True),
+
+        # Task 8: EDA (visualizations saved to disk, summary statistics to the results store)
+        Stage('perform_eda', 'monetary_var.eda:perform_eda', inputs=['df_merged'], records=True),
+
+        # Task 9: Test stationarity of unempgr, fedrate, inflat (results saved to the results store)
+        Stage('test_stationarity', 'monetary_var.stationarity_test:test_stationarity', inputs=['df_merged'],
+              records=True),
+
+        # Task 10: Feature engineering (compute dfedrate)
+        Stage('feature_engineering', 'monetary_var.feature_engineering:feature_engineering',
+              inputs=['df_merged'], outputs=['df']),
+
+        # Task 11-12: Stationarity check for dfedrate, visualization
+        Stage('check_stationarity', 'monetary_var.stationarity_check:check_stationarity',
+              inputs=['df'], outputs=['stationary_df'], records=True),
+
+        # Task 13-14: Explore optimal lags, build VAR with 5 lags (outputs saved to the results store)
+        Stage('explore_var_lags', 'monetary_var.explore_var_lags:explore_var_lags',
+              inputs=['stationary_df'], outputs=['vardf', 'lag_sweep'], records=True),
+
+        # Task 14: Compare VAR models with different lags, build final VAR with 3 lags (outputs saved to the results store)
+        Stage('compare_var_lags', 'monetary_var.compare_var_lags:compare_var_lags',
+              inputs=['vardf', 'lag_sweep'], outputs=['final_results'], kwargs={'lags_list': [3, 4, 5, 6, 8]},
+              records=True),
+
+        # Impulse responses with bootstrap bands and variance decomposition of the final model
+        # (saved to the results store, plot to disk)
+        Stage('irf_analysis', 'monetary_var.irf_analysis:irf_analysis', inputs=['final_results'], records=True),
+
+        # Structural VAR: recursive responses over all variable orderings and a sign-restricted policy shock
+        # (saved to the results store, plot to disk)
+        Stage('svar_analysis', 'monetary_var.svar_analysis:svar_analysis', inputs=['final_results'], records=True),
+
+        # Task 15: Generate PACF plots, conclude on 3 lags (plots and comments saved to disk)
+        Stage('pacf_analysis', 'monetary_var.pacf_analysis:pacf_analysis', inputs=['vardf'], records=True,
+              files=['results/analysis/pacf_lag_comments.txt']),
+
+        # Task 16: Split data, run VAR model with 3 lags, forecast
+        Stage('split_and_model', 'monetary_var.split_and_model:split_and_model',
+              inputs=['vardf'], outputs=['train', 'test', 'df_fc']),
+
+        # Task 17: Visualize forecasts vs actuals (plots saved to disk)
+        Stage('forecast_visualizations', 'monetary_var.forecast_visualizations:forecast_visualizations',
+              inputs=['train', 'test', 'df_fc']),
+
+        # Task 18: Invert differencing to compute forecasted fedrate
+        Stage('invert_transformation', 'monetary_var.invert_transformation:invert_transformation',
+              inputs=['train', 'test', 'df_fc', 'df'],
+              outputs=['train_levels', 'test_levels', 'df_fc_levels']),
+
+        # Task 19: Evaluate the forecast (metrics saved to the results store)
+        Stage('evaluate_forecast', 'monetary_var.evaluate_forecast:evaluate_forecast',
+              inputs=['train_levels', 'test_levels', 'df_fc_levels'], records=True),
+
+        # Task 20: Perform Granger Causality tests (results saved to the results store)
+        Stage('granger_causality', 'monetary_var.granger_causality:granger_causality', inputs=['train'],
+              records=True),
+
+        # Stability over the sample: rolling-window Granger tests and coefficients, structural break tests
+        # (saved to the results store, plot to disk)
+        Stage('rolling_stability', 'monetary_var.rolling_stability:rolling_stability', inputs=['vardf'],
+              records=True),
+
+        # Task 21: Write conclusion (saved to disk)
+        Stage('write_conclusion', 'monetary_var.conclusion:write_conclusion', files=['results/conclusion.txt']),
+    ]
+
+
+STAGES = build_stages()
+
+def main(targets=None, force=(), max_workers=4, serial=False, no_plots=False, dataset=None, run_label=None,
+         trace=None):
+    """
+    Orchestrates the entire pipeline, saving only final outputs to results/.
+    Stages whose inputs and code are unchanged since the last run are skipped (see pipeline.py),
+    and independent branches (plots, Granger tests, evaluation) run concurrently.
+    Plots are rendered in the background; no_plots=True skips them (and matplotlib) entirely.
+    dataset optionally selects other FRED series for import_data (see build_stages).
+    Each call is a new run of the results store (results_store.py), labelled run_label.
+    trace (default: the VAR_TRACE environment variable) profiles the run: timing spans of every
+    stage and sub-step, in all worker processes, are written to that path as a Chrome trace,
+    with a summary table next to it (see tracing.py).
+    Returns the artifacts of the stages that were brought up to date.
+    """
+    if no_plots:
+        plotting.disable_plots()
+    results_store.start_run(run_label)
+    stages = STAGES if dataset is None else build_stages(dataset)
+    trace = trace or os.environ.get("VAR_TRACE")
+    with tracing.trace_run(trace) if trace else nullcontext():
+        artifacts = run_pipeline(stages, targets=targets, force=force, max_workers=max_workers,
+                                 executor='serial' if serial else 'process')
+        if trace:
+            # Plot workers keep the tracing state they started with: do not reuse them untraced
+            plotting.shutdown_plots()
+
+    print("Pipeline completed. All outputs saved in results/")
+    return artifacts
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the monetary policy VAR pipeline")
+    parser.add_argument("targets", nargs="*", help="stages to bring up to date (default: all)")
+    parser.add_argument("--force", nargs="*", default=[], help="stages to rerun even if cached")
+    parser.add_argument("--workers", type=int, default=4, help="maximum concurrent stages")
+    parser.add_argument("--serial", action="store_true", help="run stages one at a time in process")
+    parser.add_argument("--no-plots", action="store_true", help="headless run: skip all plots")
+    parser.add_argument("--trace", metavar="PATH", help="write a Chrome trace of the run and a summary")
+    args = parser.parse_args()
+    main(args.targets or None, args.force, args.workers, args.serial, args.no_plots, trace=args.trace)
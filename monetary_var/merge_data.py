@@ -0,0 +1,39 @@
+import pandas as pd
+from monetary_var.results_store import record
+from monetary_var.feature_engineering import feature_transforms
+
+def merge_data(unemp_q, inflat_q, fedfund_q):
+    """
+    Merges the datasets, computes 'unempgr', checks for missing values and duplicates.
+    The checks are saved to the results store (`monetary-var show data_quality`).
+    Returns the merged DataFrame.
+    """
+    # Standardize index to month-end timestamps before merging
+    unemp_q.index = unemp_q.index.to_period('M').to_timestamp('M')
+
+    # Merge datasets. We do so step by step
+    # (each frame holds one series, named by its FRED ID: UNRATE, FEDFUNDS, FLEXCPIM679SFRBATL by default)
+    df = unemp_q.copy()
+    df['fedrate'] = fedfund_q.iloc[:, 0]
+    df['inflat'] = inflat_q.iloc[:, 0]
+
+    # Compute unempgr (unemployment growth rate) immediately after merging, with its transform
+    # from feature_transforms (feature_engineering adds the other modelled variables)
+    column, transform = feature_transforms(unemp_q.columns[0])['unempgr']
+    df['unempgr'] = transform.transform(df[column])
+
+    # Task 5: Check for missing values
+    missing_values = df.isna().sum()
+
+    # Task 6: Check for duplicate entries
+    duplicates = df.index.duplicated().sum()
+
+    record('merge_data', metrics=[('missing_values', col, 'count', count) for col, count in missing_values.items()]
+           + [('duplicates', '', 'count', duplicates)])
+
+    return df
+
+if __name__ == "__main__":
+    from monetary_var.main import main
+    main(['merge_data'])
+    print("Data merged successfully")
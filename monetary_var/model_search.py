@@ -0,0 +1,246 @@
+import copy
+import hashlib
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from monetary_var.transforms import Difference, PctChange
+from monetary_var.var_cache import frame_hash
+from monetary_var.var_lag_sweep import lag_design, TRENDS
+from monetary_var.tracing import traced
+
+# Model configuration search by pseudo-out-of-sample accuracy: every candidate (variable set,
+# transforms, lag order, trend) forecasts `steps` quarters ahead from each origin of an expanding
+# window, and is scored on the unemployment rate and inflation in levels, relative to a no-change
+# forecast, so candidates with different transforms are comparable.
+#
+# All candidates share one sample (the rows every transform set has, after the first maxlag rows
+# used as lags), so the designs of all lag orders and trends of a dataset are column subsets of one
+# design, and the training cross-products of every origin are running sums of its rows: one cached
+# cumulative sum per dataset serves every candidate on it, and each candidate fits all its origins
+# as one batch of small systems.
+#
+# Origins are evaluated in rounds (folds of consecutive origins). After min_rounds, candidates
+# whose score so far is worse than the best by more than margin are stopped early. The leaderboard
+# is saved to LEADERBOARD; candidates already scored on the same data and settings are not
+# evaluated again.
+
+LEADERBOARD = "results/models/model_search.csv"
+
+# Roles of the level columns of the feature-engineered data (the unemployment rate is the first column)
+TARGETS = ('unemployment', 'inflation')
+VARIABLE_SETS = {
+    'full': ('unemployment', 'policy', 'inflation'),
+    'no_policy': ('unemployment', 'inflation'),
+}
+# Transform of each role (None: modelled in levels); 'pipeline' is feature_transforms
+TRANSFORM_SETS = {
+    'pipeline': {'unemployment': PctChange(), 'policy': Difference(), 'inflation': None},
+    'differences': {'unemployment': Difference(), 'policy': Difference(), 'inflation': None},
+    'all_differenced': {'unemployment': PctChange(), 'policy': Difference(), 'inflation': Difference()},
+}
+
+# Running cross-products by (data hash, maxlag)
+_CROSS = {}
+_CROSS_SIZE = 16
+
+
+def candidate_grid(lags=range(1, 9), trends=('n', 'c', 'ct'), variable_sets=None, transform_sets=None):
+    """
+    Every combination of variable set, transform set, trend and lag order.
+
+    Parameters:
+    - lags: list of int, lag orders (default: 1 to 8)
+    - trends: list of str, from 'n', 'c', 'ct' (default: all three)
+    - variable_sets, transform_sets: list of str, keys of VARIABLE_SETS and TRANSFORM_SETS (default: all)
+
+    Returns:
+    - list of dict with 'variables', 'transforms', 'trend' and 'lags'
+    """
+    return [{'variables': variables, 'transforms': transforms, 'trend': trend, 'lags': int(lag)}
+            for variables, transforms, trend, lag in itertools.product(
+                variable_sets or list(VARIABLE_SETS), transform_sets or list(TRANSFORM_SETS), trends, lags)]
+
+
+def _candidate_id(candidate):
+    return f"{candidate['variables']}/{candidate['transforms']}/{candidate['trend']}/{candidate['lags']}"
+
+
+def _level_columns(df):
+    return {'unemployment': df.columns[0], 'policy': 'fedrate', 'inflation': 'inflat'}
+
+
+def _datasets(df, candidates):
+    """
+    The modelled variables of every (variable set, transform set) of the candidates and the target
+    levels, on the sample all of them share.
+    """
+    columns = _level_columns(df)
+    levels = df[list(columns.values())].set_axis(list(columns), axis=1)
+    data = {}
+    for variables, transforms in dict.fromkeys((c['variables'], c['transforms']) for c in candidates):
+        spec = TRANSFORM_SETS[transforms]
+        data[(variables, transforms)] = pd.DataFrame(
+            {role: levels[role] if spec[role] is None else copy.deepcopy(spec[role]).transform(levels[role])
+             for role in VARIABLE_SETS[variables]})
+    common = levels.dropna().index
+    for frame in data.values():
+        common = common.intersection(frame.dropna().index)
+    return {key: frame.loc[common] for key, frame in data.items()}, levels.loc[common]
+
+
+def _running_cross_products(values, maxlag):
+    """
+    Running sums of the row outer products of the augmented design [Z Y] with a constant, a linear
+    trend and maxlag lags (cached per data): entry r holds the cross-products of the first r targets.
+    """
+    key = (hashlib.sha256(values.tobytes() + str(values.shape).encode()).hexdigest(), maxlag)
+    if key not in _CROSS:
+        Z, Y = lag_design(values, maxlag, 'ct')
+        A = np.hstack([Z, Y])
+        running = np.zeros((len(A) + 1, A.shape[1], A.shape[1]))
+        np.cumsum(A[:, :, None] * A[:, None, :], axis=0, out=running[1:])
+        if len(_CROSS) >= _CROSS_SIZE:
+            _CROSS.pop(next(iter(_CROSS)))
+        _CROSS[key] = running
+    return _CROSS[key]
+
+
+def _score_dataset(values, levels, transforms, roles, candidates, origins, steps, maxlag):
+    """
+    Squared level forecast errors of the target roles, summed over origins and horizons, for
+    candidates (lags, trend) on one dataset. origins are the row indices of the first forecast
+    quarter; every candidate trains on the rows before it.
+
+    Returns:
+    - NumPy array with shape (n_candidates, len(TARGETS))
+    """
+    k = values.shape[1]
+    running = _running_cross_products(values, maxlag)
+    n = len(origins)
+    targets = [roles.index(role) for role in TARGETS]
+    actual = np.stack([levels[o:o + steps] for o in origins])
+    sse = np.empty((len(candidates), len(TARGETS)))
+    for c, (lags, trend) in enumerate(candidates):
+        # Columns of the shared design: constant and trend as the spec asks, the first lags blocks, Y
+        cols = np.r_[np.arange(TRENDS[trend]), 2 + np.arange(k * lags), 2 + k * maxlag + np.arange(k)]
+        m = len(cols) - k
+        G = running[np.asarray(origins) - maxlag][:, cols[:, None], cols]
+        B = np.linalg.solve(G[:, :m, :m], G[:, :m, m:])
+
+        # Forecasts from all origins at once; the trend regressor of row t is t + 1, as lag_design
+        path = np.concatenate([np.stack([values[o - lags:o] for o in origins]), np.empty((n, steps, k))], axis=1)
+        for h in range(steps):
+            deterministic = np.column_stack([np.ones(n), np.asarray(origins) + h + 1])[:, :TRENDS[trend]]
+            x = np.concatenate([deterministic, path[:, lags + h - 1::-1][:, :lags].reshape(n, -1)], axis=1)
+            path[:, lags + h] = np.einsum('nm,nmk->nk', x, B)
+        forecast = path[:, lags:]
+
+        for t, j in enumerate(targets):
+            transform = transforms[roles[j]]
+            if transform is None:
+                predicted = forecast[:, :, j]
+            else:
+                predicted = np.stack([transform.inverse(forecast[i, :, j], levels[:o, t])
+                                      for i, o in enumerate(origins)])
+            sse[c, t] = ((predicted - actual[:, :, t]) ** 2).sum()
+    return sse
+
+
+@traced("model_search")
+def model_search(df, candidates=None, steps=8, min_train=80, rounds=4, min_rounds=2, margin=0.25,
+                 n_jobs=1, path=LEADERBOARD, reuse=True):
+    """
+    Ranks model configurations by pseudo-out-of-sample forecast accuracy.
+
+    Parameters:
+    - df: DataFrame, the feature-engineered data in levels (see feature_engineering)
+    - candidates: list of dict, from candidate_grid (default: candidate_grid())
+    - steps: int, forecast horizon in quarters (default=8)
+    - min_train: int, quarters before the first forecast origin (default=80)
+    - rounds: int, folds of origins evaluated before each early-stopping check (default=4)
+    - min_rounds: int, folds every candidate is evaluated on before it can be stopped (default=2)
+    - margin: float, a candidate is stopped when its score exceeds the best by more than this
+      share (default=0.25); None evaluates every candidate on all origins
+    - n_jobs: int, number of worker processes the datasets are split across (default=1, in process)
+    - path: str, leaderboard CSV, read for earlier scores and rewritten (default=LEADERBOARD); None
+      keeps it in memory
+    - reuse: bool, keep the scores of candidates already on the leaderboard for the same data and
+      settings (default=True)
+
+    Returns:
+    - DataFrame, the leaderboard: one row per candidate, best first, with 'score' (mean over the
+      unemployment rate and inflation of the RMSE relative to a no-change forecast), the RMSE of
+      each, the number of origins evaluated and whether the candidate was stopped early
+    """
+    candidates = candidates or candidate_grid()
+    maxlag = max(candidate['lags'] for candidate in candidates)
+    data, levels = _datasets(df, candidates)
+    origins = np.arange(max(min_train, maxlag + 1), len(levels) - steps + 1)
+    if len(origins) < rounds:
+        raise ValueError("Not enough observations for the forecast origins.")
+    settings = f"steps={steps} min_train={min_train} maxlag={maxlag} origins={len(origins)}"
+    data_hash = frame_hash(levels)
+
+    previous = pd.DataFrame()
+    if reuse and path and os.path.exists(path):
+        previous = pd.read_csv(path)
+        previous = previous[(previous['data'] == data_hash) & (previous['settings'] == settings)]
+    done = set(previous['candidate']) if len(previous) else set()
+    pending = [candidate for candidate in candidates if _candidate_id(candidate) not in done]
+    best_previous = previous.loc[~previous['stopped'], 'score'].min() if len(previous) else np.inf
+
+    # No-change forecast errors per fold, the scale of every score
+    level_values = levels.values
+    folds = np.array_split(origins, rounds)
+    target_index = [list(levels.columns).index(role) for role in TARGETS]
+    baseline = [sum(((level_values[o:o + steps, target_index] - level_values[o - 1, target_index]) ** 2).sum(axis=0)
+                    for o in fold) for fold in folds]
+
+    sse = {_candidate_id(candidate): np.zeros(len(TARGETS)) for candidate in pending}
+    evaluated = {key: 0 for key in sse}
+    folds_done = {key: 0 for key in sse}
+    stopped = set()
+    pool = ProcessPoolExecutor(max_workers=n_jobs) if n_jobs > 1 else None
+    try:
+        for r, fold in enumerate(folds):
+            active = [candidate for candidate in pending if _candidate_id(candidate) not in stopped]
+            groups = {}
+            for candidate in active:
+                groups.setdefault((candidate['variables'], candidate['transforms']), []).append(candidate)
+            tasks = [(data[key].values, level_values[:, target_index], TRANSFORM_SETS[key[1]],
+                      list(VARIABLE_SETS[key[0]]), [(c['lags'], c['trend']) for c in group], fold, steps, maxlag)
+                     for key, group in groups.items()]
+            results = pool.map(_score_dataset, *zip(*tasks)) if pool and len(tasks) > 1 else \
+                [_score_dataset(*task) for task in tasks]
+            for group, errors in zip(groups.values(), results):
+                for candidate, error in zip(group, errors):
+                    sse[_candidate_id(candidate)] += error
+                    evaluated[_candidate_id(candidate)] += len(fold)
+                    folds_done[_candidate_id(candidate)] += 1
+
+            # Early stopping on the score over the folds seen so far
+            scale = np.sum(baseline[:r + 1], axis=0)
+            scores = {key: np.mean(np.sqrt(sse[key] / scale)) for key in sse if key not in stopped}
+            best = min(min(scores.values(), default=np.inf), best_previous)
+            if margin is not None and r + 1 >= min_rounds and r + 1 < rounds:
+                stopped |= {key for key, score in scores.items() if score > best * (1 + margin)}
+    finally:
+        if pool:
+            pool.shutdown()
+
+    rows = []
+    for candidate in pending:
+        key = _candidate_id(candidate)
+        scale = np.sum(baseline[:folds_done[key]], axis=0)
+        rows.append({'candidate': key, **candidate, 'score': np.mean(np.sqrt(sse[key] / scale)),
+                     **{f"rmse_{role}": np.sqrt(sse[key][t] / (evaluated[key] * steps)) for t, role in enumerate(TARGETS)},
+                     'origins': evaluated[key], 'stopped': key in stopped, 'data': data_hash, 'settings': settings})
+    leaderboard = pd.concat([previous, pd.DataFrame(rows)], ignore_index=True)
+    leaderboard = leaderboard.sort_values(['stopped', 'score'], kind='stable').reset_index(drop=True)
+    leaderboard.insert(0, 'rank', np.arange(1, len(leaderboard) + 1))
+    if path:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        leaderboard.drop(columns='rank').to_csv(path, index=False)
+    return leaderboard
@@ -0,0 +1,169 @@
+import os
+import pickle
+import numpy as np
+import pandas as pd
+from monetary_var.var_cache import fit_var
+from monetary_var.var_lag_sweep import lag_design, TRENDS
+from monetary_var.invert_transformation import invert_paths
+
+# Incremental path for production updates: when a new quarter arrives, the final VAR is
+# updated from its sufficient statistics instead of rerunning the pipeline.
+#
+# The state starts from the 3-lag model of split_and_model (fitted on the training sample) and
+# holds the model sample, the levels needed to invert the differencing, and the cross-products
+# Z'Z, Z'Y and Y'Y of the lag design. Appending a quarter adds one row to each cross-product;
+# the coefficients and residual covariance are re-solved from them. Every refit_every appended
+# quarters the cross-products are recomputed from the stored data, which bounds the rounding
+# drift of the running sums.
+
+STATE_PATH = "results/models/online_state.pkl"
+
+
+def _solve(state):
+    """
+    Coefficients and residual covariance (degrees-of-freedom adjusted, as statsmodels) from the
+    cross-products of the state.
+    """
+    ZZ, ZY, YY = state['ZZ'], state['ZY'], state['YY']
+    params = np.linalg.solve(ZZ, ZY)
+    ssr = YY - ZY.T @ params
+    state['params'] = params
+    state['sigma_u'] = (ssr + ssr.T) / 2 / (state['nobs'] - ZZ.shape[0])
+
+
+def refit(state):
+    """
+    Recomputes the cross-products, coefficients and residual covariance from the stored data
+    and resets the count of incremental updates.
+    """
+    Z, Y = lag_design(state['data'].values, state['lags'], state['trend'])
+    state.update(ZZ=Z.T @ Z, ZY=Z.T @ Y, YY=Y.T @ Y, nobs=len(Y), updates=0)
+    _solve(state)
+    return state
+
+
+def init_state(train, df, lags=3, trend='c', refit_every=20):
+    """
+    Builds the online state from the VAR that split_and_model fits on the training sample.
+
+    Parameters:
+    - train: DataFrame, the training sample of split_and_model (stationary variables)
+    - df: DataFrame, the feature-engineered data in levels (fedrate, inflat, ...; see feature_engineering)
+    - lags: int, lag order of the model (default=3)
+    - trend: str, 'n' or 'c' (default='c')
+    - refit_every: int, appended quarters between full refits (default=20)
+
+    Returns:
+    - dict, the state used by append_quarters and forecast
+    """
+    if trend not in ('n', 'c'):
+        raise ValueError("Invalid trend. Use 'n' or 'c'.")
+    # The same fit as split_and_model, served from the VAR fit cache (see var_cache.py)
+    results = fit_var(train, lags, trend)
+    Z, Y = lag_design(train.values, lags, trend)
+    return {'names': list(train.columns), 'lags': lags, 'trend': trend, 'refit_every': refit_every,
+            'data': train.copy(), 'levels': df.loc[:train.index[-1]].copy(),
+            'ZZ': Z.T @ Z, 'ZY': Z.T @ Y, 'YY': Y.T @ Y, 'nobs': len(Y), 'updates': 0,
+            'params': np.asarray(results.params), 'sigma_u': np.asarray(results.sigma_u)}
+
+
+def _regressors(values, lags, trend):
+    """
+    Regressors of the observation following values: the constant, then y[t-1], ..., y[t-lags].
+    """
+    return np.concatenate([np.ones(TRENDS[trend]), values[:-lags - 1:-1].ravel()])
+
+
+def append_quarters(state, df):
+    """
+    Appends the quarters of df newer than the state and updates the model in place.
+
+    Rows are taken up to the first quarter with a missing value (a series not yet released),
+    so a ragged edge is picked up by the next update.
+
+    Parameters:
+    - state: dict, from init_state or load_state
+    - df: DataFrame, the feature-engineered data in levels, as passed to init_state
+
+    Returns:
+    - int, number of quarters appended
+    """
+    lags, trend = state['lags'], state['trend']
+    new = df.loc[df.index > state['data'].index[-1]]
+    new = new[new[state['names']].notna().all(axis=1).cummin()]
+    values = state['data'].values
+    for date, row in new.iterrows():
+        y = row[state['names']].to_numpy(dtype=float)
+        x = _regressors(values, lags, trend)
+        state['ZZ'] += np.outer(x, x)
+        state['ZY'] += np.outer(x, y)
+        state['YY'] += np.outer(y, y)
+        state['nobs'] += 1
+        state['updates'] += 1
+        values = np.vstack([values, y])
+    if len(new):
+        state['data'] = pd.concat([state['data'], new[state['names']]])
+        state['levels'] = pd.concat([state['levels'], new])
+        if state['updates'] >= state['refit_every']:
+            refit(state)
+        else:
+            _solve(state)
+    return len(new)
+
+
+def forecast(state, steps=8):
+    """
+    Forecasts from the end of the stored data with the current coefficients.
+
+    Parameters:
+    - state: dict, from init_state or load_state
+    - steps: int, number of quarters ahead (default=8)
+
+    Returns:
+    - DataFrame indexed by the forecast quarters, with the model variables and the levels they
+      are transforms of (fedrate, the unemployment rate; as invert_transformation)
+    """
+    lags, trend = state['lags'], state['trend']
+    values = state['data'].values
+    for _ in range(steps):
+        values = np.vstack([values, _regressors(values, lags, trend) @ state['params']])
+    index = state['data'].index
+    freq = index.freq or pd.infer_freq(index)
+    dates = pd.date_range(index[-1], periods=steps + 1, freq=freq)[1:]
+    df_fc = pd.DataFrame(values[-steps:], index=dates, columns=state['names'])
+    for column, levels in invert_paths(df_fc.values, state['names'], state['levels']).items():
+        df_fc[column] = levels
+    return df_fc
+
+
+def save_state(state, path=STATE_PATH):
+    """
+    Pickles the state (atomically, so an interrupted update keeps the previous one).
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path + ".tmp", "wb") as f:
+        pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(path + ".tmp", path)
+
+
+def load_state(path=STATE_PATH):
+    """
+    Loads a saved state, or returns None if there is none.
+    """
+    if not os.path.exists(path):
+        return None
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+if __name__ == "__main__":
+    from monetary_var.main import main
+    state = load_state()
+    if state is None:
+        artifacts = main(['split_and_model', 'feature_engineering'])
+        state = init_state(artifacts['train'], artifacts['df'])
+    else:
+        artifacts = main(['feature_engineering'])
+    print(f"Appended {append_quarters(state, artifacts['df'])} quarter(s)")
+    save_state(state)
+    print(forecast(state).round(4).to_string())
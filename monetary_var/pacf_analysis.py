@@ -1,11 +1,13 @@
-import pandas as pd
-import matplotlib.pyplot as plt
-import statsmodels.graphics.tsaplots as sgt
+from monetary_var.correlogram import correlogram
+from monetary_var.plotting import emit_plot
+from monetary_var.results_store import record
 import os
 
-def pacf_analysis(data):
+def pacf_analysis(data, nlags=10):
     """
     Generates PACF plots for unempgr, dfedrate, and inflat, concludes on using 3 lags.
+    The ACF and PACF of all three are computed once (see correlogram.py) and saved to the
+    results store (`monetary-var show correlogram`); the plots draw the saved values.
     Saves plots and comments to results/.
     Returns the DataFrame for further processing.
     """
@@ -14,12 +16,22 @@ def pacf_analysis(data):
     os.makedirs("results/analysis", exist_ok=True)
 
     # Task 15: Generate PACF plots for unempgr, dfedrate, and inflat
-    for column in ['unempgr', 'dfedrate', 'inflat']:
-        plt.figure(figsize=(10, 4), dpi=100)
-        sgt.plot_pacf(data[column].dropna(), lags=10, method='ywm')
-        plt.title(f'PACF of {column}')
-        plt.savefig(f"results/plots/pacf_{column}.png")
-        plt.close()
+    columns = ['unempgr', 'dfedrate', 'inflat']
+    result = correlogram(data[columns].dropna(), nlags)
+    lags = list(range(nlags + 1))
+    rows = [('correlogram', '', 'nobs', result['nobs']), ('correlogram', '', 'pacf_bound', result['pacf_bound'])]
+    for j, column in enumerate(columns):
+        rows += [('acf', column, str(lag), result['acf'][lag, j]) for lag in lags[1:]]
+        rows += [('acf_bound', column, str(lag), result['acf_bound'][lag, j]) for lag in lags[1:]]
+        rows += [('pacf', column, str(lag), result['pacf'][lag, j]) for lag in lags[1:]]
+    record('pacf_analysis', metrics=rows)
+
+    for j, column in enumerate(columns):
+        emit_plot({
+            'path': f"results/plots/pacf_{column}.png", 'figsize': (10, 4), 'dpi': 100,
+            'panels': [{'stems': {'x': lags, 'y': result['pacf'][:, j], 'bound': result['pacf_bound']},
+                        'title': f'PACF of {column}'}],
+        })
 
     # Conclude on using 3 lags and comment on the results
     comments = """
@@ -40,21 +52,6 @@ PACF Analysis and Lag Selection Conclusion:
     return data
 
 if __name__ == "__main__":
-    from import_data import import_data
-    from merge_data import merge_data
-    from eda import perform_eda
-    from stationarity_test import test_stationarity
-    from feature_engineering import feature_engineering
-    from stationarity_check import check_stationarity
-    from explore_var_lags import explore_var_lags
-    from compare_var_lags import compare_var_lags
-    unemp_q, inflat_q, fedfund_q = import_data()
-    df = merge_data(unemp_q, inflat_q, fedfund_q)
-    df = perform_eda(df)
-    df = test_stationarity(df)
-    df = feature_engineering(df)
-    stationary_df = check_stationarity(df)
-    vardf = explore_var_lags(stationary_df)
-    final_results = compare_var_lags(vardf, lags_list=[3, 4, 5, 6, 8])
-    vardf = pacf_analysis(vardf)
-    print("PACF analysis and lag selection conclusion completed")
\ No newline at end of file
+    from monetary_var.main import main
+    main(['pacf_analysis'])
+    print("PACF analysis and lag selection conclusion completed")
@@ -0,0 +1,270 @@
+import ast
+import hashlib
+import importlib
+import importlib.util
+import inspect
+import os
+import pickle
+import time
+from monetary_var import plotting, results_store
+from monetary_var.tracing import span
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+# Part of every cache key; bumped when the layout of the cache entries changes
+CACHE_FORMAT = "2"
+
+
+class Stage:
+    """
+    One node of the pipeline graph.
+
+    Parameters:
+    - name: str, unique stage name
+    - func: callable or str, the stage function (module-level, so it can run in a worker process),
+      or its "module:function" path, imported only when the stage actually runs
+    - inputs: list of str, artifact names passed positionally to func
+    - outputs: list of str, artifact names given to func's return value (a tuple if more than one)
+    - kwargs: dict, optional, extra keyword arguments (part of the cache key)
+    - after: list of str, optional, stages that must finish first without passing data
+      (e.g. stages writing the same file)
+    - volatile: bool, always run the stage, e.g. when it reads external data (default=False)
+    - files: list of str, optional, files the stage writes besides its outputs; the stage reruns
+      when one of them is missing (the plots it emits are checked as well)
+    - records: bool, the stage saves results to the results store under its name; it reruns when
+      the store holds none, e.g. after the database was deleted (default=False)
+    """
+    def __init__(self, name, func, inputs=(), outputs=(), kwargs=None, after=(), volatile=False, files=(),
+                 records=False):
+        self.name = name
+        self.func = func
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.kwargs = kwargs or {}
+        self.after = list(after)
+        self.volatile = volatile
+        self.files = list(files)
+        self.records = records
+
+
+def _resolve(func):
+    """
+    Imports a stage function given as "module:function"; callables are returned unchanged.
+    """
+    if callable(func):
+        return func
+    module, _, name = func.partition(":")
+    return getattr(importlib.import_module(module), name)
+
+
+def _is_main_guard(node):
+    test = getattr(node, "test", None)
+    return (isinstance(node, ast.If) and isinstance(test, ast.Compare)
+            and isinstance(test.left, ast.Name) and test.left.id == "__name__")
+
+
+def _package_imports(path):
+    """
+    Paths of the monetary_var modules a source file imports, anywhere in the file (including the
+    imports inside functions that stages use to load heavy modules lazily, but not the
+    `if __name__ == "__main__":` block). Resolved from the package directory, without importing.
+    """
+    with open(path, "rb") as f:
+        tree = ast.parse(f.read(), filename=path)
+    names = set()
+    todo = [tree]
+    while todo:
+        node = todo.pop()
+        if _is_main_guard(node):
+            continue
+        if isinstance(node, ast.Import):
+            names.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+            names.add(node.module)
+            # from monetary_var import plotting: plotting may be a module
+            names.update(f"{node.module}.{alias.name}" for alias in node.names)
+        todo.extend(ast.iter_child_nodes(node))
+    package = os.path.dirname(os.path.abspath(__file__))
+    paths = set()
+    for name in names:
+        parts = name.split(".")
+        if parts[0] != "monetary_var":
+            continue
+        base = os.path.join(package, *parts[1:])
+        for candidate in (base + ".py", os.path.join(base, "__init__.py")):
+            if os.path.isfile(candidate):
+                paths.add(candidate)
+    return paths
+
+
+def _code_hash(func):
+    """
+    Hashes the source file of the stage function and of every monetary_var module it imports,
+    directly or through other modules, so editing a stage or any helper it relies on invalidates
+    its cache. String paths are located without importing the module, so cached stages never load it.
+    """
+    try:
+        if isinstance(func, str):
+            path = importlib.util.find_spec(func.partition(":")[0]).origin
+        else:
+            path = inspect.getsourcefile(func)
+        seen, todo = set(), [path]
+        while todo:
+            current = todo.pop()
+            if current not in seen:
+                seen.add(current)
+                todo.extend(_package_imports(current) - seen)
+        digest = hashlib.sha256()
+        for source in sorted(seen):
+            with open(source, "rb") as f:
+                digest.update(f.read())
+        return digest.hexdigest()
+    except (TypeError, OSError, AttributeError, ImportError, SyntaxError):
+        return func if isinstance(func, str) else getattr(func, "__qualname__", repr(func))
+
+
+def _run_stage(name, func, payloads, kwargs):
+    # Plot specs emitted by the stage are returned to the caller, which renders them off the critical path
+    with span(f"stage:{name}"):
+        args = [pickle.loads(p) for p in payloads]
+        return plotting.collect_plots(_resolve(func), *args, **kwargs)
+
+
+def _dependencies(stages):
+    producers = {}
+    for stage in stages.values():
+        for output in stage.outputs:
+            if output in producers:
+                raise ValueError(f"Artifact {output} is produced by both {producers[output]} and {stage.name}")
+            producers[output] = stage.name
+    deps = {}
+    for stage in stages.values():
+        missing = [i for i in stage.inputs if i not in producers]
+        if missing:
+            raise ValueError(f"Stage {stage.name} needs artifacts nobody produces: {missing}")
+        deps[stage.name] = {producers[i] for i in stage.inputs} | set(stage.after)
+    return deps
+
+
+def _select(deps, targets):
+    """
+    Returns the target stages and all their ancestors.
+    """
+    selected, todo = set(), list(targets)
+    while todo:
+        name = todo.pop()
+        if name not in deps:
+            raise ValueError(f"Unknown stage {name}")
+        if name not in selected:
+            selected.add(name)
+            todo.extend(deps[name])
+    return selected
+
+
+def run_pipeline(stages, targets=None, cache_dir=".pipeline_cache", force=(), max_workers=4,
+                 executor='process', verbose=True):
+    """
+    Runs a stage graph, executing independent branches concurrently and skipping stages whose
+    inputs have not changed.
+
+    Every stage output is pickled and content-hashed. A stage's cache key combines its name,
+    the hash of its source file, its kwargs and the hashes of its input artifacts; if
+    cache_dir holds outputs for that key the stage is skipped and the outputs are loaded from
+    disk. Because keys use output contents, a rerun upstream stage that produces identical
+    outputs does not invalidate its descendants. A cached stage also reruns when a file it wrote
+    (its declared files and the plots it emitted) no longer exists, or when the results store lost
+    the results of a stage with records=True. Plots emitted by stages are rendered on the plotting
+    pool while later stages run; the call returns once they are written.
+
+    Parameters:
+    - stages: list of Stage
+    - targets: list of str, optional, stage names to bring up to date (default: all stages);
+      only the targets and their ancestors are considered
+    - cache_dir: str, directory for cached stage outputs (default='.pipeline_cache')
+    - force: list of str, stage names to rerun even if cached
+    - max_workers: int, maximum number of stages running at once (default=4)
+    - executor: str, 'process' (default; stages may use pyplot), 'thread' or 'serial'
+    - verbose: bool, print one line per stage (default=True)
+
+    Returns:
+    - dict mapping artifact names to their values
+    """
+    stages = {s.name: s for s in stages}
+    deps = _dependencies(stages)
+    selected = _select(deps, targets or list(stages))
+    force = set(force)
+
+    payloads, hashes, done = {}, {}, set()
+    running = {}
+    pool = None
+    if executor == 'process':
+        pool = ProcessPoolExecutor(max_workers=max_workers)
+    elif executor == 'thread':
+        pool = ThreadPoolExecutor(max_workers=max_workers)
+
+    def finish(stage, outcome, key, started, status):
+        result, plots = outcome
+        for spec in plots:
+            plotting.submit_plot(spec)
+        values = result if len(stage.outputs) > 1 else (result,)
+        if len(stage.outputs) > 1 and len(values) != len(stage.outputs):
+            raise ValueError(f"Stage {stage.name} returned {len(values)} values, expected {len(stage.outputs)}")
+        with span(f"store:{stage.name}"):
+            for name, value in zip(stage.outputs, values if stage.outputs else ()):
+                payloads[name] = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+                hashes[name] = hashlib.sha256(payloads[name]).hexdigest()
+            if status == "ran" and not stage.volatile:
+                path = os.path.join(cache_dir, stage.name, f"{key}.pkl")
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                files = stage.files + [spec['path'] for spec in plots]
+                with open(path + ".tmp", "wb") as f:
+                    pickle.dump({'outputs': {name: payloads[name] for name in stage.outputs}, 'files': files}, f)
+                os.replace(path + ".tmp", path)
+        done.add(stage.name)
+        if verbose:
+            print(f"[{status:>7}] {stage.name} ({time.perf_counter() - started:.3f}s)")
+
+    try:
+        while len(done) < len(selected):
+            ready = [name for name in selected
+                     if name not in done and name not in running and deps[name] <= done]
+            if not ready and not running:
+                raise ValueError(f"Dependency cycle among stages: {sorted(selected - done)}")
+            for name in ready:
+                stage = stages[name]
+                started = time.perf_counter()
+                key = hashlib.sha256("|".join(
+                    [CACHE_FORMAT, name, _code_hash(stage.func), repr(sorted(stage.kwargs.items()))]
+                    + [hashes[i] for i in stage.inputs]).encode()).hexdigest()
+                path = os.path.join(cache_dir, name, f"{key}.pkl")
+                cached = None
+                if not stage.volatile and name not in force and os.path.exists(path):
+                    with span(f"cache:{name}"), open(path, "rb") as f:
+                        cached = pickle.load(f)
+                    if not all(os.path.exists(file) for file in cached['files']) or \
+                            (stage.records and not results_store.has_results(name)):
+                        cached = None
+                if cached is not None:
+                    for output in stage.outputs:
+                        payloads[output] = cached['outputs'][output]
+                        hashes[output] = hashlib.sha256(payloads[output]).hexdigest()
+                    done.add(name)
+                    if verbose:
+                        print(f"[skipped] {name}")
+                    continue
+                args = [payloads[i] for i in stage.inputs]
+                if pool is None:
+                    finish(stage, _run_stage(name, stage.func, args, stage.kwargs), key, started, "ran")
+                else:
+                    running[name] = (pool.submit(_run_stage, name, stage.func, args, stage.kwargs), key, started)
+            if running:
+                finished, _ = wait([f for f, _, _ in running.values()], return_when=FIRST_COMPLETED)
+                for name in [n for n, (f, _, _) in running.items() if f in finished]:
+                    future, key, started = running.pop(name)
+                    finish(stages[name], future.result(), key, started, "ran")
+        with span("wait_for_plots"):
+            plotting.wait_for_plots()
+    finally:
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    return {name: pickle.loads(payload) for name, payload in payloads.items()}
@@ -0,0 +1,149 @@
+import atexit
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from monetary_var.tracing import traced
+
+# Figures are rendered from plot specs on a background process pool with matplotlib's
+# object-oriented Agg API (no pyplot global state). matplotlib is only imported by the
+# render workers, so headless runs (VAR_NO_PLOTS=1 / --no-plots) never import it.
+#
+# A plot spec is a dict:
+#   {'path': 'results/plots/name.png', 'figsize': (12, 5), 'dpi': 100,
+#    'layout': (rows, cols), 'tight_layout': False,
+#    'panels': [{'title': ..., 'xlabel': ..., 'ylabel': ..., 'grid': True, 'legend': {...} or None,
+#                'lines': [{'x': index, 'y': values, 'label': ..., 'color': ...}, ...]}]}
+# A panel with 'stems': {'x': lags, 'y': values, 'bound': b} draws a correlogram (stems and a
+# shaded +/- bound band, b a number or one per lag) from precomputed values (see correlogram.py).
+
+_pool = None
+_pending = []
+_collector = None
+
+
+def plots_enabled():
+    """
+    Returns False in headless mode (VAR_NO_PLOTS set to '1', 'true' or 'yes').
+    """
+    return os.environ.get("VAR_NO_PLOTS", "").strip().lower() not in ("1", "true", "yes")
+
+
+def disable_plots():
+    """
+    Switches to headless mode for this process and any worker processes it starts.
+    """
+    os.environ["VAR_NO_PLOTS"] = "1"
+
+
+def line(series, **style):
+    """
+    Line spec for a pandas Series: its index as x, its values as y, plus style keywords (label, color).
+    """
+    return {'x': series.index, 'y': series.values, **style}
+
+
+@traced("render_plot")
+def render_plot(spec):
+    """
+    Renders one plot spec to its path with a standalone Agg figure.
+    """
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    fig = Figure(figsize=spec.get('figsize', (12, 5)), dpi=spec.get('dpi', 100))
+    FigureCanvasAgg(fig)
+    rows, cols = spec.get('layout', (1, 1))
+    for i, panel in enumerate(spec['panels']):
+        ax = fig.add_subplot(rows, cols, i + 1)
+        if 'stems' in panel:
+            stems = panel['stems']
+            x, y = np.asarray(stems['x']), np.asarray(stems['y'])
+            ax.vlines(x, 0, y, color='C0')
+            ax.plot(x, y, 'o', color='C0')
+            ax.axhline(0, color='black', linewidth=0.8)
+            if stems.get('bound') is not None:
+                bound = np.broadcast_to(stems['bound'], x.shape)
+                ax.fill_between(x, -bound, bound, alpha=0.25, linewidth=0)
+        for series in panel.get('lines', []):
+            ax.plot(series['x'], series['y'], label=series.get('label'), color=series.get('color'))
+        if panel.get('title'):
+            ax.set_title(panel['title'])
+        if panel.get('xlabel'):
+            ax.set_xlabel(panel['xlabel'])
+        if panel.get('ylabel'):
+            ax.set_ylabel(panel['ylabel'])
+        if panel.get('grid'):
+            ax.grid(True, linestyle='--', alpha=0.7)
+        if panel.get('legend') is not None:
+            ax.legend(**panel['legend'])
+    if spec.get('tight_layout'):
+        fig.tight_layout()
+    os.makedirs(os.path.dirname(spec['path']) or ".", exist_ok=True)
+    fig.savefig(spec['path'])
+    return spec['path']
+
+
+def submit_plot(spec):
+    """
+    Queues a plot spec for rendering on the background pool (no-op in headless mode).
+    """
+    global _pool
+    if not plots_enabled():
+        return None
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=int(os.environ.get("VAR_PLOT_WORKERS", "2")))
+    # Workers keep the directory they started in, so resolve the path against ours now
+    future = _pool.submit(render_plot, dict(spec, path=os.path.abspath(spec['path'])))
+    _pending.append(future)
+    return future
+
+
+def emit_plot(spec):
+    """
+    Called by stages instead of drawing. Inside collect_plots() the spec is handed back to the
+    caller (e.g. the pipeline, which renders it in its own pool); otherwise it is submitted.
+    """
+    if not plots_enabled():
+        return
+    if _collector is not None:
+        _collector.append(spec)
+    else:
+        submit_plot(spec)
+
+
+def collect_plots(func, *args, **kwargs):
+    """
+    Runs func and returns (result, plot specs it emitted) without rendering them.
+    """
+    global _collector
+    previous, _collector = _collector, []
+    try:
+        result = func(*args, **kwargs)
+        return result, _collector
+    finally:
+        _collector = previous
+
+
+def wait_for_plots():
+    """
+    Blocks until every queued plot is written, re-raising the first rendering error.
+    Returns the list of written paths.
+    """
+    paths = [future.result() for future in _pending]
+    _pending.clear()
+    return paths
+
+
+def shutdown_plots():
+    """
+    Waits for queued plots and stops the rendering pool. Runs at exit; worker processes, which
+    skip atexit handlers, must call it themselves.
+    """
+    global _pool
+    if _pool is not None:
+        wait_for_plots()
+        _pool.shutdown()
+        _pool = None
+
+
+atexit.register(shutdown_plots)
@@ -0,0 +1,470 @@
+import json
+from monetary_var.results_store import fetch
+
+# Human-readable reports rendered on demand from the results store (results_store.py), in the
+# layouts of the text files the stages used to write. Like the store, this module only needs the
+# standard library, so `monetary-var show` answers without importing pandas or statsmodels.
+
+STAT_LABELS = {
+    'nobs': 'No. of observations', 'llf': 'Log likelihood', 'aic': 'AIC', 'bic': 'BIC',
+    'hqic': 'HQIC', 'fpe': 'FPE', 'detomega': 'Det(Omega_mle)',
+    'lam': 'Prior tightness (lambda)', 'log_ml': 'Log marginal likelihood',
+}
+
+
+def _grouped(rows, key='subject'):
+    """
+    Groups metric rows into {subject: {metric: value}}, keeping the recorded order.
+    """
+    groups = {}
+    for row in rows:
+        groups.setdefault(row[key], {})[row['metric']] = row['value']
+    return groups
+
+
+def _format(value, spec):
+    return "NaN" if value is None else format(value, spec)
+
+
+def _matrix(names, values, spec=".4f"):
+    """
+    Formats {(row, column): value} as an aligned table with the given row and column names.
+    """
+    first = max(len(name) for name in names)
+    widths = [max(len(name), len(format(0.0, spec))) for name in names]
+    lines = [" " * first + "".join(f"  {name:>{w}}" for name, w in zip(names, widths))]
+    for row in names:
+        lines.append(f"{row:<{first}}" + "".join(
+            f"  {_format(values.get((row, col)), spec):>{w}}" for col, w in zip(names, widths)))
+    return "\n".join(lines)
+
+
+def _data_quality(select, name=None):
+    rows = select('metrics', 'merge_data')
+    if not rows:
+        return ""
+    lines = ["Missing Values:"]
+    lines += [f"{row['subject']}: {int(row['value'])}" for row in rows if row['scope'] == 'missing_values']
+    lines += ["", "Number of Duplicate Entries: "
+              + "".join(str(int(row['value'])) for row in rows if row['scope'] == 'duplicates')]
+    return "\n".join(lines)
+
+
+def _summary_stats(select, name=None):
+    stats = _grouped(select('metrics', 'perform_eda', scope='summary_stats'))
+    if not stats:
+        return ""
+    columns = list(stats)
+    names = list(stats[columns[0]])
+    widths = [max(len(column), 11) for column in columns]
+    lines = ["       " + "".join(f"  {column:>{w}}" for column, w in zip(columns, widths))]
+    for stat in names:
+        lines.append(f"{stat:<7}" + "".join(
+            f"  {_format(stats[column].get(stat), '.6f'):>{w}}" for column, w in zip(columns, widths)))
+    return "\n".join(lines)
+
+
+def _stationarity(select, name=None):
+    sections = []
+    for stage, title in (('test_stationarity', "Initial Stationarity Check (ADF Test Results):"),
+                         ('check_stationarity', "Stationarity Check (ADF Test Results):")):
+        rows = select('tests', stage, test='adf')
+        if not rows:
+            continue
+        lines = [title, ""]
+        for row in rows:
+            detail = json.loads(row['detail'])
+            variable = row['subject']
+            heading = f"{variable} (differenced {detail['differenced']})" if 'differenced' in detail else variable
+            lines += [f"ADF Test for {heading}:",
+                      f"ADF Statistic: {row['statistic']:.4f}",
+                      f"p-value: {row['pvalue']:.4f}",
+                      f"Critical Values: {detail['critical_values']}"]
+            if row['pvalue'] < 0.05:
+                lines.append(f"{variable} is stationary (p < 0.05)")
+            else:
+                lines.append(f"{variable} is not stationary (p >= 0.05)")
+            if 'diff_order' in detail:
+                lines.append(f"Suggested differencing order for {variable}: {detail['diff_order']}")
+            lines.append("")
+        sections.append("\n".join(lines))
+    return "\n".join(sections)
+
+
+def _lag_selection(select, name=None):
+    sweep = {int(lag): values for lag, values in
+             _grouped(select('metrics', 'explore_var_lags', scope='lag_selection')).items()}
+    if not sweep:
+        return ""
+    ics = ['aic', 'bic', 'fpe', 'hqic']
+    best = {ic: min(sweep, key=lambda lag: sweep[lag][ic]) for ic in ics}
+    optimal = select('metrics', 'explore_var_lags', scope='optimal_lag')
+    lines = [f"Optimal lag length based on AIC: {int(optimal[0]['value'])}", ""] if optimal else []
+    lines += ["Model Comparison for Lag Selection (AIC):",
+              f"VAR Order Selection (* highlights the minimums), nobs = {int(sweep[min(sweep)]['nobs'])}",
+              f"{'lag':>5}" + "".join(f"{ic.upper():>14}" for ic in ics)]
+    for lag, values in sweep.items():
+        lines.append(f"{lag:>5}" + "".join(
+            f"{values[ic]:>13.4g}{'*' if lag == best[ic] else ' '}" for ic in ics))
+    return "\n".join(lines)
+
+
+def _lag_comparison(select, name=None):
+    rows = select('metrics', 'compare_var_lags', scope='lag_comparison')
+    if not rows:
+        return ""
+    comparison = _grouped(rows)
+    nobs = comparison.pop('', {}).get('nobs')
+    lines = ["VAR Model Comparison Across Different maxlags Values",
+             f"(common sample of {_format(nobs, '.0f')} observations)", "=" * 50, ""]
+    for lags, metrics in comparison.items():
+        lines += [f"maxlags = {lags}", f"Log Likelihood: {metrics['llf']}"]
+        if 'log_ml' in metrics:
+            lines.append(f"Log Marginal Likelihood (BVAR): {metrics['log_ml']:.4f}")
+        lines.append("Correlation of Residuals (Upper Triangle):")
+        for metric, value in metrics.items():
+            if metric.startswith('resid_corr:'):
+                _, var1, var2 = metric.split(':')
+                lines.append(f"  {var1} - {var2}: {value:.6f}")
+        lines.append("")
+    return "\n".join(lines)
+
+
+def _model(select, name=None):
+    for stage in ('compare_var_lags', 'explore_var_lags', 'split_and_model'):
+        # Default: the final model of compare_var_lags (var_3_lags, or bvar_3_lags with method='bvar')
+        coefficients = select('coefficients', stage, **({'model': name} if name else {}))
+        if coefficients:
+            break
+    else:
+        return ""
+    name = coefficients[0]['model']
+    stats = _grouped(select('metrics', stage, scope=name)).get('', {})
+    # Bayesian VARs have posterior standard deviations only, sparse VARs point estimates only
+    penalized = coefficients[0]['stderr'] is None
+    bayesian = coefficients[0]['pvalue'] is None and not penalized
+    rule = "=" * 78
+    lines = [f"Summary of Regression Results: {name}", rule]
+    lines += [f"{STAT_LABELS[stat]:<28}{value:>16.6g}" for stat, value in stats.items() if stat in STAT_LABELS]
+
+    equations = {}
+    for row in coefficients:
+        equations.setdefault(row['equation'], []).append(row)
+    header = (f"{'':<20}{'coefficient':>14}" if penalized else
+              f"{'':<20}{'post. mean':>14}{'post. std':>14}" if bayesian else
+              f"{'':<20}{'coefficient':>14}{'std. error':>14}{'t-stat':>14}{'prob':>14}")
+    for equation, rows in equations.items():
+        lines += ["-" * 78, f"Results for equation {equation}", rule, header, "-" * 78]
+        for row in rows:
+            cells = [row['coef']] if penalized else \
+                [row['coef'], row['stderr']] + ([] if bayesian else [row['tstat'], row['pvalue']])
+            lines.append(f"{row['term']:<20}" + "".join(f"{_format(v, '.6f'):>14}" for v in cells))
+    lines.append(rule)
+
+    # The interpretation: lagged coefficients of each equation with their significance
+    lags = max(int(row['term'].split('.')[0][1:]) for row in coefficients if row['term'].startswith('L'))
+    lines += ["", f"VAR Model Interpretation ({lags} lags):", ""]
+    for equation, rows in equations.items():
+        lines.append(f"Equation for {equation}:")
+        for row in rows:
+            if not row['term'].startswith('L'):
+                continue
+            if penalized:
+                lines.append(f"  {row['term']}: Coefficient = {row['coef']:.4f}")
+            elif bayesian:
+                lines.append(f"  {row['term']}: Posterior mean = {row['coef']:.4f}, posterior std = {row['stderr']:.4f}")
+            else:
+                lines.append(f"  {row['term']}: Coefficient = {row['coef']:.4f}, p-value = {row['pvalue']:.4f}")
+        lines.append("")
+    return "\n".join(lines)
+
+
+def _bvar(select, name=None):
+    rows = select('metrics', 'split_and_model')
+    grid = {float(row['metric'].split(':')[1]): row['value'] for row in rows if row['scope'] == 'bvar'}
+    if not grid:
+        raise LookupError("No Bayesian VAR recorded (run split_and_model with method='bvar')")
+    model = next(row['scope'] for row in rows if row['scope'].startswith('bvar_') and row['scope'] != 'bvar_bands')
+    stats = _grouped(select('metrics', 'split_and_model', scope=model)).get('', {})
+    lines = [f"Bayesian VAR with a Minnesota prior ({model}; coefficients: monetary-var show model {model})",
+             f"Prior tightness (lambda): {_format(stats.get('lam'), '.6f')}",
+             f"Log marginal likelihood: {_format(stats.get('log_ml'), '.4f')}",
+             "", "Log marginal likelihood by overall tightness (lambda):", f"{'lambda':>12}{'log_ml':>14}"]
+    lines += [f"{lam:>12.6f}{log_ml:>14.4f}" for lam, log_ml in grid.items()]
+    bands = {}
+    for row in rows:
+        if row['scope'] == 'bvar_bands' and (not name or row['subject'] == name):
+            date, bound = row['metric'].split(':')
+            bands.setdefault(row['subject'], {}).setdefault(date, {})[bound] = row['value']
+    lines += ["", "90% predictive bands:"]
+    for var, dates in bands.items():
+        lines += ["", f"{var}:", f"{'':<12}{'lower':>10}{'forecast':>10}{'upper':>10}"]
+        lines += [f"{date:<12}" + "".join(f"{_format(values.get(b), '.4f'):>10}" for b in ('lower', 'forecast', 'upper'))
+                  for date, values in dates.items()]
+    return "\n".join(lines)
+
+
+def _sparse_var(select, name=None):
+    rows = select('metrics', 'split_and_model')
+    summary = {row['metric']: row['value'] for row in rows if row['scope'] == 'sparse'}
+    if not summary:
+        raise LookupError("No sparse VAR recorded (run split_and_model with method='lasso' or 'group')")
+    model = next(row['model'] for row in select('coefficients', 'split_and_model')
+                 if row['model'].startswith('sparse_'))
+    lines = [f"Sparse VAR ({model}; coefficients: monetary-var show model {model})",
+             f"Chosen penalty: {_format(summary.get('alpha'), '.6f')}",
+             f"Nonzero lag coefficients: {_format(summary.get('nonzero'), '.0f')} of {_format(summary.get('coefficients'), '.0f')}",
+             "", "Cross-validated one-step MSE (standardized):", f"{'alpha':>12}{'cv_mse':>12}"]
+    lines += [f"{float(metric.split(':')[1]):>12.6f}{value:>12.6f}"
+              for metric, value in summary.items() if metric.startswith('cv_mse:')]
+    return "\n".join(lines)
+
+
+def _forecast_metrics(select, name=None):
+    metrics = _grouped(select('metrics', 'evaluate_forecast', scope='forecast'))
+    lines = []
+    for var, vals in metrics.items():
+        lines += ["", f"Metrics for {var}:",
+                  f"ME: {vals['ME']:.4f}", f"MAE: {vals['MAE']:.4f}",
+                  f"MPE: {vals['MPE']:.4f}%", f"MAPE: {vals['MAPE']:.4f}%",
+                  f"RMSE: {vals['RMSE']:.4f}"]
+    return "\n".join(lines)
+
+
+def _forecast_horizons(select, name=None):
+    rows = select('metrics', 'evaluate_forecast', scope='forecast_horizon')
+    tables = {}
+    for row in rows:
+        if name and row['subject'] != name:
+            continue
+        metric, horizon = row['metric'].split(':')
+        tables.setdefault(row['subject'], {}).setdefault(int(horizon), {})[metric] = row['value']
+    lines = []
+    for var, horizons in tables.items():
+        metrics = list(horizons[min(horizons)])
+        lines += ["", f"Metrics for {var} by horizon (quarters ahead):",
+                  f"{'h':>3}" + "".join(f"{metric:>10}" for metric in metrics)]
+        for horizon, values in horizons.items():
+            lines.append(f"{horizon:>3}" + "".join(f"{_format(values.get(metric), '.4f'):>10}" for metric in metrics))
+    return "\n".join(lines)
+
+
+# Horizons shown in the impulse response and variance decomposition reports
+SHOWN_HORIZONS = (0, 1, 2, 3, 4, 8, 12, 16, 20, 24, 28, 32, 36, 40)
+
+
+def _irf(select, name=None):
+    rows = select('metrics', 'irf_analysis', scope='irf')
+    pairs, coverage = {}, None
+    for row in rows:
+        if row['metric'] == 'coverage':
+            coverage = row['value']
+            continue
+        if name and row['subject'] != name:
+            continue
+        kind, horizon = row['metric'].split(':')
+        pairs.setdefault(row['subject'], {}).setdefault(int(horizon), {})[kind] = row['value']
+    band = f"{coverage:.0%} bootstrap band" if coverage is not None else "band"
+    lines = []
+    for pair, horizons in pairs.items():
+        lines += ["", f"Orthogonalized impulse response {pair} (one std. dev. shock):",
+                  f"{'h':>3}{'response':>12}{'lower':>12}{'upper':>12}   ({band})"]
+        for horizon, values in horizons.items():
+            if horizon in SHOWN_HORIZONS:
+                lines.append(f"{horizon:>3}" + "".join(f"{_format(values.get(kind), '.4f'):>12}"
+                                                       for kind in ('response', 'lower', 'upper')))
+    return "\n".join(lines)
+
+
+def _fevd(select, name=None):
+    tables = {}
+    for row in select('metrics', 'irf_analysis', scope='fevd'):
+        if name and row['subject'] != name:
+            continue
+        shock, horizon = row['metric'].split(':')
+        tables.setdefault(row['subject'], {}).setdefault(int(horizon), {})[shock] = row['value']
+    lines = []
+    for var, horizons in tables.items():
+        shocks = list(horizons[min(horizons)])
+        width = max([len(shock) for shock in shocks] + [8]) + 2
+        lines += ["", f"Forecast error variance decomposition of {var} (share of each shock):",
+                  f"{'h':>3}" + "".join(f"{shock:>{width}}" for shock in shocks)]
+        for horizon, shares in horizons.items():
+            if horizon in SHOWN_HORIZONS:
+                lines.append(f"{horizon:>3}" + "".join(f"{_format(shares.get(shock), '.4f'):>{width}}" for shock in shocks))
+    return "\n".join(lines)
+
+
+def _correlogram(select, name=None):
+    rows = select('metrics', 'pacf_analysis')
+    summary = {row['metric']: row['value'] for row in rows if row['scope'] == 'correlogram'}
+    tables = {}
+    for row in rows:
+        if row['scope'] in ('acf', 'acf_bound', 'pacf') and (not name or row['subject'] == name):
+            tables.setdefault(row['subject'], {}).setdefault(int(row['metric']), {})[row['scope']] = row['value']
+    if not tables:
+        raise LookupError(f"No correlogram for {name}" if name else "No correlogram recorded")
+    lines = [f"Autocorrelations ({_format(summary.get('nobs'), '.0f')} observations; * outside the 95% bounds,"
+             f" PACF bound +/-{_format(summary.get('pacf_bound'), '.4f')}):"]
+    for var, lags in tables.items():
+        lines += ["", var, f"{'lag':>3}{'ACF':>10}{'bound':>10}{'PACF':>10}"]
+        for lag, values in lags.items():
+            acf, bound, pacf = values.get('acf'), values.get('acf_bound'), values.get('pacf')
+            flags = ("*" if None not in (acf, bound) and abs(acf) > bound else " ",
+                     "*" if None not in (pacf, summary.get('pacf_bound')) and abs(pacf) > summary['pacf_bound'] else " ")
+            lines.append(f"{lag:>3}{_format(acf, '.4f'):>10}{flags[0]}{_format(bound, '.4f'):>9}"
+                         f"{_format(pacf, '.4f'):>10}{flags[1]}")
+    return "\n".join(lines)
+
+
+def _svar(select, name=None):
+    pairs, summary = {}, {}
+    for row in select('metrics', 'svar_analysis', scope='svar'):
+        if not row['subject']:
+            summary[row['metric']] = row['value']
+        elif not name or row['subject'] == name:
+            kind, horizon = row['metric'].split(':')
+            pairs.setdefault(row['subject'], {}).setdefault(int(horizon), {})[kind] = row['value']
+    kinds = ('recursive', 'order_min', 'order_max', 'sign_median', 'sign_lower', 'sign_upper')
+    lines = []
+    if summary:
+        lines.append(f"Sign restrictions: {_format(summary.get('accepted'), '.0f')} rotations accepted "
+                     f"({_format(summary.get('acceptance'), '.1%')} of the draws)")
+    for pair, horizons in pairs.items():
+        lines += ["", f"Structural impulse response {pair}:",
+                  f"{'':>3}{'Cholesky':>12}{'all orderings':>26}{'sign restrictions (median, 68%)':>38}",
+                  f"{'h':>3}{'response':>12}{'min':>13}{'max':>13}{'median':>12}{'lower':>13}{'upper':>13}"]
+        for horizon, values in horizons.items():
+            if horizon in SHOWN_HORIZONS:
+                lines.append(f"{horizon:>3}{_format(values.get('recursive'), '.4f'):>12}"
+                             + "".join(f"{_format(values.get(kind), '.4f'):>13}" for kind in kinds[1:3])
+                             + f"{_format(values.get('sign_median'), '.4f'):>12}"
+                             + "".join(f"{_format(values.get(kind), '.4f'):>13}" for kind in kinds[4:]))
+    return "\n".join(lines)
+
+
+def _stability(select, name=None):
+    name = name or 'dfedrate -> unempgr'
+    rows = select('metrics', 'rolling_stability')
+    window = next((row['value'] for row in rows if row['metric'] == 'window'), None)
+    breaks, pvalues, coefs = {}, {}, {}
+    for row in rows:
+        if row['scope'] == 'break':
+            breaks.setdefault(row['subject'], {})[row['metric']] = row['value']
+        elif row['scope'] in ('rolling_granger', 'rolling_coef') and row['subject'] == name:
+            end, column = row['metric'].split(':')
+            table = pvalues if row['scope'] == 'rolling_granger' else coefs
+            table.setdefault(end, {})[column] = row['value']
+    if not pvalues:
+        raise LookupError(f"No rolling results for {name}")
+
+    lines = ["Structural break tests (sup-F, break in all coefficients of the equation, 15% trimming):",
+             f"{'equation':<12}{'sup F':>10}{'p-value':>10}  break after"]
+    for var, values in breaks.items():
+        dates = {metric[2:]: value for metric, value in values.items() if metric.startswith('F:')}
+        date = max(dates, key=dates.get) if dates else ''
+        lines.append(f"{var:<12}{_format(values.get('sup_F'), '.4f'):>10}{_format(values.get('pvalue'), '.4f'):>10}  {date}")
+
+    lags = list(next(iter(pvalues.values())))
+    terms = list(next(iter(coefs.values()))) if coefs else []
+    ends = list(pvalues)
+    lines += ["", f"Rolling Granger causality {name} ({_format(window, '.0f')}-quarter windows), "
+                  "p-values by VAR order and coefficients:",
+              f"{'window end':<12}" + "".join(f"{'p=' + lag:>10}" for lag in lags) + "".join(f"{term:>10}" for term in terms)]
+    # Every fourth window (one a year), and the last one
+    for end in ends[::4] + ([ends[-1]] if (len(ends) - 1) % 4 else []):
+        lines.append(f"{end:<12}" + "".join(f"{_format(pvalues[end].get(lag), '.4f'):>10}" for lag in lags)
+                     + "".join(f"{_format(coefs.get(end, {}).get(term), '.4f'):>10}" for term in terms))
+    lines.append(f"{'p < 0.05':<12}" + "".join(
+        f"{sum(pvalues[end][lag] < 0.05 for end in ends) / len(ends):>10.0%}" for lag in lags))
+    return "\n".join(lines)
+
+
+def _granger(select, name=None):
+    rows = select('tests', 'granger_causality')
+    tests = {(row['test'], row['subject'], row['lag']): row for row in rows}
+    lines = []
+    for row in rows:
+        if row['test'] != 'ssr_ftest' or (name and row['subject'] != name):
+            continue
+        pair, lag = row['subject'], row['lag']
+        df_resid = json.loads(row['detail'])['df_resid']
+        chi2, lr = tests[('ssr_chi2test', pair, lag)], tests[('lrtest', pair, lag)]
+        ftest = (row['statistic'], row['pvalue'], df_resid, lag)
+        lines += ["", f"Granger Causality ({pair}), Lag {lag}",
+                  f"ssr_ftest: {ftest}",
+                  f"ssr_chi2test: {(chi2['statistic'], chi2['pvalue'], lag)}",
+                  f"lrtest: {(lr['statistic'], lr['pvalue'], lag)}",
+                  f"params_ftest: {ftest}"]
+    return "\n".join(lines)
+
+
+def _granger_matrix(select, name=None):
+    rows = select('tests', 'granger_causality')
+    sections = []
+    for test, label in (('ssr_ftest', "Pairwise"), ('var_ftest', "Conditional on the VAR")):
+        by_lag, names = {}, []
+        for row in rows:
+            if row['test'] != test:
+                continue
+            cause, effect = row['subject'].split(' -> ')
+            names += [n for n in (cause, effect) if n not in names]
+            by_lag.setdefault(row['lag'], {})[(cause, effect)] = row['pvalue']
+        for lag, pvalues in by_lag.items():
+            sections.append(f"{label} Granger causality F-test p-values, Lag {lag} (row causes column)\n"
+                            + _matrix(names, pvalues) + "\n")
+    return "\n".join(sections)
+
+
+# Report name -> renderer; renderers take a row selector and an optional name
+# (the model for 'model', a "cause -> effect" pair for 'granger', 'irf', 'svar' and 'stability', a variable for
+# 'forecast_horizons', 'fevd' and 'correlogram')
+REPORTS = {
+    'data_quality': _data_quality,
+    'summary_stats': _summary_stats,
+    'stationarity': _stationarity,
+    'lag_selection': _lag_selection,
+    'lag_comparison': _lag_comparison,
+    'model': _model,
+    'bvar': _bvar,
+    'sparse_var': _sparse_var,
+    'forecast_metrics': _forecast_metrics,
+    'forecast_horizons': _forecast_horizons,
+    'irf': _irf,
+    'fevd': _fevd,
+    'correlogram': _correlogram,
+    'svar': _svar,
+    'stability': _stability,
+    'granger': _granger,
+    'granger_matrix': _granger_matrix,
+}
+
+
+def render(report, name=None, run_id=None, label=None, path=None):
+    """
+    Renders a report from the results store.
+
+    Parameters:
+    - report: str, one of REPORTS
+    - name: str, optional, the model for 'model' (default: the final 3-lag model, or 'var_5_lags'),
+      a pair such as 'dfedrate -> inflat' for 'granger', 'irf', 'svar' and 'stability' (cause -> effect), or a
+      variable for 'forecast_horizons' and 'fevd'
+    - run_id: str, optional, run to report on (default: the most recent run); stages that were
+      skipped in that run are reported from the run that last computed them
+    - label: str, optional, report on the most recent run with this label (e.g. a batch dataset)
+    - path: str, optional, database path (default: VAR_RESULTS_DB or results/results.db)
+
+    Returns:
+    - str, the report text
+    """
+    if report not in REPORTS:
+        raise ValueError(f"Unknown report {report}; choose from {', '.join(REPORTS)}")
+
+    def select(table, stage, **where):
+        return fetch(table, stage, run_id, label, path, **where)
+
+    text = REPORTS[report](select, name)
+    if not text.strip():
+        raise LookupError(f"No results recorded for {report}" + (f" {name}" if name else "")
+                          + "; run the pipeline first")
+    return text.rstrip("\n") + "\n"
@@ -0,0 +1,224 @@
+import json
+import math
+import os
+import sqlite3
+from contextlib import closing
+from datetime import datetime
+from monetary_var.tracing import span
+
+# Structured store for the results of every pipeline run: test statistics, coefficients and
+# metrics live in one SQLite database keyed by run ID, instead of one text file per result.
+# The human-readable reports are rendered from it on demand (see reports.py).
+# Only the standard library is used, so the CLI can read the store without loading pandas.
+
+# Default location of the database; override with VAR_RESULTS_DB
+DEFAULT_DB = "results/results.db"
+
+# Columns of each results table after (run_id, stage)
+TABLES = {
+    'tests': ('test', 'subject', 'lag', 'statistic', 'pvalue', 'detail'),
+    'coefficients': ('model', 'equation', 'term', 'coef', 'stderr', 'tstat', 'pvalue'),
+    'metrics': ('scope', 'subject', 'metric', 'value'),
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (run_id TEXT PRIMARY KEY, created TEXT, label TEXT);
+CREATE TABLE IF NOT EXISTS tests (run_id TEXT, stage TEXT, test TEXT, subject TEXT, lag INTEGER,
+                                  statistic REAL, pvalue REAL, detail TEXT);
+CREATE TABLE IF NOT EXISTS coefficients (run_id TEXT, stage TEXT, model TEXT, equation TEXT, term TEXT,
+                                         coef REAL, stderr REAL, tstat REAL, pvalue REAL);
+CREATE TABLE IF NOT EXISTS metrics (run_id TEXT, stage TEXT, scope TEXT, subject TEXT, metric TEXT,
+                                    value REAL);
+CREATE INDEX IF NOT EXISTS tests_stage ON tests (stage, run_id);
+CREATE INDEX IF NOT EXISTS coefficients_stage ON coefficients (stage, run_id);
+CREATE INDEX IF NOT EXISTS metrics_stage ON metrics (stage, run_id);
+"""
+
+# Goodness-of-fit statistics saved with each fitted model, when the results object has them
+MODEL_STATS = ('nobs', 'llf', 'aic', 'bic', 'hqic', 'fpe', 'detomega', 'lam', 'log_ml')
+
+
+def db_path(path=None):
+    return path or os.environ.get("VAR_RESULTS_DB", DEFAULT_DB)
+
+
+def connect(path=None):
+    """
+    Opens the results database, creating it and its tables if needed. Concurrent writers
+    (parallel stages, batch jobs sharing one database) wait for each other's transactions.
+    """
+    path = db_path(path)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    conn = sqlite3.connect(path, timeout=60)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def start_run(label=None, path=None):
+    """
+    Registers a new run and makes it the current one (also for stage worker processes started
+    afterwards, through the VAR_RUN_ID environment variable).
+
+    Parameters:
+    - label: str, optional, e.g. the dataset name of a batch job
+    - path: str, optional, database path (default: VAR_RESULTS_DB or results/results.db)
+
+    Returns:
+    - str, the run ID (a timestamp, so IDs sort chronologically)
+    """
+    now = datetime.now()
+    run_id = now.strftime("%Y%m%d-%H%M%S-%f")
+    with closing(connect(path)) as conn, conn:
+        conn.execute("INSERT INTO runs VALUES (?, ?, ?)", (run_id, now.isoformat(timespec='seconds'), label))
+    os.environ["VAR_RUN_ID"] = run_id
+    return run_id
+
+
+def current_run(path=None):
+    """
+    Returns the ID of the current run, starting one if a stage is called outside the pipeline.
+    """
+    return os.environ.get("VAR_RUN_ID") or start_run(path=path)
+
+
+def _plain(value):
+    # NumPy scalars become Python numbers and NaN is stored as NULL; dicts are stored as JSON
+    if isinstance(value, dict):
+        return {k: _plain(v) for k, v in value.items()}
+    if hasattr(value, "item"):
+        value = value.item()
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+def _column(value):
+    value = _plain(value)
+    return json.dumps(value) if isinstance(value, dict) else value
+
+
+def record(stage, run_id=None, path=None, **tables):
+    """
+    Saves the results of one stage in a single transaction. Rows the stage recorded earlier in the
+    same run are replaced, so rerunning a stage never duplicates them.
+
+    Parameters:
+    - stage: str, name of the recording stage
+    - run_id: str, optional (default: the current run)
+    - path: str, optional, database path
+    - **tables: lists of row tuples per table, with the columns of TABLES
+      (e.g. metrics=[('forecast', 'inflat', 'RMSE', 0.71)]); dict values are stored as JSON
+
+    Returns:
+    - str, the run ID
+    """
+    run_id = run_id or current_run(path)
+    with span("record", stage=stage), closing(connect(path)) as conn, conn:
+        for table, rows in tables.items():
+            columns = TABLES[table]
+            conn.execute(f"DELETE FROM {table} WHERE run_id = ? AND stage = ?", (run_id, stage))
+            conn.executemany(f"INSERT INTO {table} VALUES ({', '.join('?' * (len(columns) + 2))})",
+                             [(run_id, stage) + tuple(_column(v) for v in row) for row in rows])
+    return run_id
+
+
+def model_rows(model, results):
+    """
+    Converts a fitted VAR (statsmodels VARResults, BayesianVARResults or any results object with
+    params and stderr frames) into coefficient and metric rows for record().
+
+    Parameters:
+    - model: str, name to store the model under, e.g. 'var_3_lags'
+    - results: fitted model results
+
+    Returns:
+    - dict with 'coefficients' and 'metrics' row lists
+    """
+    frames = [getattr(results, name, None) for name in ('params', 'stderr', 'tvalues', 'pvalues')]
+    params = frames[0]
+    coefficients = []
+    for equation in params.columns:
+        for term in params.index:
+            values = [None if frame is None else frame.loc[term, equation] for frame in frames]
+            coefficients.append((model, equation, term, *values))
+    metrics = []
+    for name in MODEL_STATS:
+        try:
+            value = getattr(results, name)
+        except Exception:
+            continue
+        if isinstance(value, (int, float)) or hasattr(value, "item"):
+            metrics.append((model, '', name, value))
+    return {'coefficients': coefficients, 'metrics': metrics}
+
+
+def resolve_run(table, stage, run_id=None, label=None, path=None):
+    """
+    Finds the run holding a stage's results. Stages skipped because their cached outputs were
+    up to date record nothing, so this is the latest run, at or before run_id (default: the most
+    recent run) and with the same label, in which the stage actually ran.
+
+    Returns:
+    - str, run ID, or None if the stage has never recorded results
+    """
+    with closing(connect(path)) as conn:
+        if run_id is None:
+            query = "SELECT run_id, label FROM runs" + (" WHERE label = ?" if label else "")
+            row = conn.execute(query + " ORDER BY run_id DESC LIMIT 1", (label,) if label else ()).fetchone()
+        else:
+            row = conn.execute("SELECT run_id, label FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+        if row is None:
+            return None
+        found = conn.execute(
+            f"SELECT t.run_id FROM {table} t JOIN runs r ON r.run_id = t.run_id "
+            "WHERE t.stage = ? AND t.run_id <= ? AND r.label IS ? ORDER BY t.run_id DESC LIMIT 1",
+            (stage, row['run_id'], row['label'])).fetchone()
+        return found['run_id'] if found else None
+
+
+def has_results(stage, path=None):
+    """
+    Whether the store holds results of a stage that reports on the current run would find: rows
+    from a run with the current run's label (see resolve_run). False if the database does not exist.
+    """
+    if not os.path.exists(db_path(path)):
+        return False
+    with closing(connect(path)) as conn:
+        row = conn.execute("SELECT label FROM runs WHERE run_id = ?", (os.environ.get("VAR_RUN_ID"),)).fetchone()
+        label = row['label'] if row else None
+        return any(conn.execute(f"SELECT 1 FROM {table} t JOIN runs r ON r.run_id = t.run_id "
+                                "WHERE t.stage = ? AND r.label IS ? LIMIT 1", (stage, label)).fetchone()
+                   for table in TABLES)
+
+
+def fetch(table, stage, run_id=None, label=None, path=None, **where):
+    """
+    Loads the rows a stage recorded in a run (see resolve_run), in the order they were written.
+
+    Parameters:
+    - table: str, 'tests', 'coefficients' or 'metrics'
+    - stage: str, name of the recording stage
+    - run_id, label: str, optional, select the run (default: the most recent one)
+    - path: str, optional, database path
+    - **where: optional column filters, e.g. scope='forecast'
+
+    Returns:
+    - list of sqlite3.Row (empty if the stage has not recorded any results)
+    """
+    run_id = resolve_run(table, stage, run_id, label, path)
+    if run_id is None:
+        return []
+    conditions = "".join(f" AND {column} = ?" for column in where)
+    with closing(connect(path)) as conn:
+        return conn.execute(f"SELECT * FROM {table} WHERE run_id = ? AND stage = ?{conditions} ORDER BY rowid",
+                            (run_id, stage, *where.values())).fetchall()
+
+
+def list_runs(path=None):
+    """
+    Returns all runs as (run_id, created, label) rows, oldest first.
+    """
+    with closing(connect(path)) as conn:
+        return conn.execute("SELECT * FROM runs ORDER BY run_id").fetchall()
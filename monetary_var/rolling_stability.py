@@ -0,0 +1,60 @@
+from monetary_var.rolling_var import rolling_var, rolling_granger, sup_f_breaks
+from monetary_var.plotting import emit_plot
+from monetary_var.results_store import record
+
+def rolling_stability(vardf, window=80, maxlag=4, lags=3, pair=('dfedrate', 'unempgr')):
+    """
+    Checks whether the VAR relationships are stable over the sample (see rolling_var.py):
+    Granger causality p-values and lag coefficients on rolling 20-year windows, and sup-F
+    structural break tests of each equation on the full sample.
+    Saves them to the results store (`monetary-var show stability`) and a plot of the rolling
+    p-values and coefficients of pair (cause, effect) to results/plots/.
+    Returns the DataFrame unchanged.
+    """
+    names = list(vardf.columns)
+    granger = rolling_granger(vardf, window, maxlag)
+    fits = rolling_var(vardf, window, lags)
+    breaks = sup_f_breaks(vardf, lags)
+    ends = [f"{end:%Y-%m-%d}" for end in granger['ends']]
+
+    rows = [('rolling', '', 'window', window)]
+    for i, cause in enumerate(names):
+        for j, effect in enumerate(names):
+            if i == j:
+                continue
+            subject = f"{cause} -> {effect}"
+            for w, end in enumerate(ends):
+                rows += [('rolling_granger', subject, f"{end}:{lag}", granger['F_pvalue'][w, lag - 1, i, j])
+                         for lag in granger['lags']]
+                # Coefficients of the cause's lags in the effect's equation of the lags-order model
+                rows += [('rolling_coef', subject, f"{end}:L{lag}", fits['coefs'][w, 1 + i + len(names) * (lag - 1), j])
+                         for lag in range(1, lags + 1)]
+    for j, name in enumerate(names):
+        rows += [('break', name, 'sup_F', breaks['sup_F'][j]), ('break', name, 'pvalue', breaks['pvalue'][j])]
+        rows += [('break', name, f"F:{date:%Y-%m-%d}", breaks['F'][d, j]) for d, date in enumerate(breaks['dates'])]
+    record('rolling_stability', metrics=rows)
+
+    # Rolling p-values (one line per lag order) and coefficient paths of the pair
+    i, j = names.index(pair[0]), names.index(pair[1])
+    emit_plot({
+        'path': "results/plots/rolling_stability.png", 'figsize': (12, 8), 'dpi': 100,
+        'layout': (2, 1), 'tight_layout': True,
+        'panels': [
+            {'lines': [{'x': granger['ends'], 'y': granger['F_pvalue'][:, lag - 1, i, j], 'label': f"VAR({lag})"}
+                       for lag in granger['lags']]
+                      + [{'x': granger['ends'], 'y': [0.05] * len(ends), 'label': '5%', 'color': 'grey'}],
+             'title': f"Granger causality {pair[0]} -> {pair[1]}: p-value on {window}-quarter windows (by window end)",
+             'grid': True, 'legend': {'fontsize': 8}},
+            {'lines': [{'x': fits['ends'], 'y': fits['coefs'][:, 1 + i + len(names) * (lag - 1), j],
+                        'label': f"L{lag}.{pair[0]}"} for lag in range(1, lags + 1)],
+             'title': f"Coefficients in the {pair[1]} equation ({lags} lags)", 'grid': True,
+             'legend': {'fontsize': 8}},
+        ],
+    })
+
+    return vardf
+
+if __name__ == "__main__":
+    from monetary_var.main import main
+    main(['rolling_stability'])
+    print("Rolling stability analysis completed")
@@ -0,0 +1,310 @@
+import numpy as np
+import pandas as pd
+from scipy.linalg.blas import dger
+from monetary_var.var_lag_sweep import lag_design, TRENDS
+from monetary_var.tracing import traced
+
+PENALTIES = ('lasso', 'group')
+
+
+class SparseVARResults:
+    """
+    A penalized VAR fit with the parts of statsmodels' VARResults the pipeline uses:
+    params (DataFrame, rows 'const', 'L1.x', ... as in statsmodels, one column per equation),
+    coefs (k_ar, k, k), intercept, k_ar, names, nobs, resid, sigma_u and forecast().
+
+    Also holds the regularization path: alphas, the chosen alpha, the cross-validated
+    mean squared error of every alpha visited (cv_mse, standardized units) and the number of
+    nonzero lag coefficients along the path down to the chosen alpha (path_nonzero).
+    """
+    def __init__(self, B, names, k_ar, trend, penalty, alpha, alphas, cv_mse, path_nonzero,
+                 resid, n_totobs, index=None):
+        k = len(names)
+        ntrend = TRENDS[trend]
+        rows = ['const', 'trend'][:ntrend] + [f"L{lag}.{name}" for lag in range(1, k_ar + 1) for name in names]
+        self.names = list(names)
+        self.k_ar = k_ar
+        self.neqs = k
+        self.trend = trend
+        self.k_trend = ntrend
+        self.penalty = penalty
+        self.alpha = alpha
+        self.alphas = alphas
+        self.cv_mse = cv_mse
+        self.path_nonzero = path_nonzero
+        self.params = pd.DataFrame(B, index=rows, columns=self.names)
+        self.coefs = B[ntrend:].reshape(k_ar, k, k).transpose(0, 2, 1)
+        self.intercept = B[0] if trend in ('c', 'ct') else np.zeros(k)
+        self.nobs = len(resid)
+        self.n_totobs = n_totobs
+        self.resid = pd.DataFrame(resid, index=index, columns=self.names)
+        self.sigma_u = pd.DataFrame(resid.T @ resid / self.nobs, index=self.names, columns=self.names)
+        self.nonzero = int(np.count_nonzero(self.coefs))
+
+    def forecast(self, y, steps):
+        """
+        Iterated forecasts, like VARResults.forecast.
+
+        Parameters:
+        - y: array-like, the last k_ar observations (oldest first)
+        - steps: int, number of periods to forecast
+
+        Returns:
+        - NumPy array with shape (steps, k)
+        """
+        y = np.asarray(y, dtype=float)
+        if y.shape[0] < self.k_ar:
+            raise ValueError(f"forecast needs the last {self.k_ar} observations")
+        B = self.params.values
+        history = np.vstack([y[-self.k_ar:], np.empty((steps, self.neqs))])
+        for h in range(steps):
+            deterministic = [1.0, float(self.n_totobs + h + 1)][:self.k_trend]
+            lagged = history[h:self.k_ar + h][::-1].ravel()
+            history[self.k_ar + h] = np.concatenate([deterministic, lagged]) @ B
+        return history[self.k_ar:]
+
+
+def _standardize(Z, Y, ntrend):
+    """
+    Partials the unpenalized deterministic terms out of the lag columns and the targets, then
+    scales both to unit mean square. Returns the pieces needed to map coefficients back.
+    """
+    D, X = Z[:, :ntrend], Z[:, ntrend:]
+    if ntrend:
+        # Frisch-Waugh: the lasso on residualized data gives the lag coefficients directly
+        proj = np.linalg.lstsq(D, np.hstack([X, Y]), rcond=None)[0]
+        X = X - D @ proj[:, :X.shape[1]]
+        Y = Y - D @ proj[:, X.shape[1]:]
+    x_scale = np.sqrt((X ** 2).mean(axis=0))
+    y_scale = np.sqrt((Y ** 2).mean(axis=0))
+    x_scale[x_scale == 0] = 1.0
+    y_scale[y_scale == 0] = 1.0
+    return X / x_scale, Y / y_scale, x_scale, y_scale
+
+
+def _unstandardize(beta, Z, Y, ntrend, x_scale, y_scale):
+    """
+    Maps standardized lag coefficients back to the original scale and refits the
+    deterministic terms by least squares.
+    """
+    lag_coefs = beta * y_scale / x_scale[:, None]
+    if not ntrend:
+        return lag_coefs
+    D, X = Z[:, :ntrend], Z[:, ntrend:]
+    deterministic = np.linalg.lstsq(D, Y - X @ lag_coefs, rcond=None)[0]
+    return np.vstack([deterministic, lag_coefs])
+
+
+def _lasso_cd(G, c, beta, alpha, tol, max_iter):
+    """
+    Coordinate descent for the multi-response lasso
+    min 1/2 tr(B'GB) - tr(c'B) + alpha * |B|_1 (G = X'X/n with unit diagonal, c = X'Y/n),
+    updating one regressor at a time across all equations with covariance updates of the
+    negative gradient c - G B. After each full pass the active rows are solved as their own
+    (smaller) problem; the loop ends when a full pass changes nothing. beta is updated in place.
+    """
+    for _ in range(max_iter):
+        grad = np.asfortranarray(c - G @ beta)
+        if _cd_pass(G, grad, beta, alpha, range(len(beta))) < tol:
+            break
+        # Converge on the active set alone
+        working = np.flatnonzero(np.any(beta != 0, axis=1))
+        G_w, grad_w, beta_w = G[np.ix_(working, working)], np.asfortranarray(grad[working]), beta[working]
+        for _ in range(max_iter):
+            if _cd_pass(G_w, grad_w, beta_w, alpha, range(len(working))) < tol:
+                break
+        beta[working] = beta_w
+    return beta
+
+
+def _cd_pass(G, grad, beta, alpha, rows):
+    # grad must be Fortran-ordered: dger updates it in place
+    max_change = 0.0
+    for i in rows:
+        b = beta[i]
+        z = grad[i] + b
+        # Soft threshold: z - clip(z, -alpha, alpha)
+        delta = z - np.clip(z, -alpha, alpha) - b
+        change = np.abs(delta).max()
+        if change > 0.0:
+            # Rank-one gradient update (BLAS ger); G is symmetric, so row i stands in for column i
+            dger(-1.0, G[i], delta, a=grad, overwrite_a=True)
+            b += delta
+            max_change = max(max_change, change)
+    return max_change
+
+
+def _group_cd(G, c, beta, alpha, blocks, lipschitz, tol, max_iter):
+    """
+    Block coordinate descent for the lag group lasso: every lag block of k rows (the k x k
+    coefficient matrix A_l) is one group with penalty alpha * k * ||A_l||_F. Each block takes
+    a proximal gradient step with step size 1 / (largest eigenvalue of its Gram block).
+    beta is updated in place.
+    """
+    grad = c - G @ beta
+    k = beta.shape[1]
+    for _ in range(max_iter):
+        max_change = 0.0
+        for rows, L in zip(blocks, lipschitz):
+            z = beta[rows] + grad[rows] / L
+            norm = np.linalg.norm(z)
+            new = z * max(0.0, 1.0 - alpha * k / (L * norm)) if norm > 0 else z
+            delta = new - beta[rows]
+            if delta.any():
+                grad -= G[:, rows] @ delta
+                beta[rows] = new
+                max_change = max(max_change, np.abs(delta).max())
+        if max_change < tol:
+            break
+    return beta
+
+
+def _alpha_max(c, penalty, k):
+    if penalty == 'lasso':
+        return np.abs(c).max()
+    return max(np.linalg.norm(block) for block in np.split(c, c.shape[0] // k)) / k
+
+
+class _PenaltyPath:
+    """
+    Walks down a penalty path on one sample, warm-starting every fit from the previous
+    solution. The Gram matrix and cross-products are formed once. For the lasso, the
+    sequential strong rule restricts each fit to the regressors likely to enter, and the fit
+    is repeated over all regressors if a discarded one violates the optimality conditions.
+    """
+    def __init__(self, Z, Y, ntrend, k, penalty, tol, max_iter):
+        self.Z, self.Y, self.ntrend = Z, Y, ntrend
+        self.penalty, self.tol, self.max_iter = penalty, tol, max_iter
+        X, Ys, self.x_scale, self.y_scale = _standardize(Z, Y, ntrend)
+        self.G = X.T @ X / len(X)
+        self.c = X.T @ Ys / len(X)
+        self.beta = np.zeros_like(self.c)
+        self.alive = np.flatnonzero(np.diag(self.G) > 0)
+        self.previous = None
+        self.blocks = [np.arange(start, start + k) for start in range(0, self.G.shape[0], k)]
+        if penalty == 'group':
+            self.lipschitz = [max(np.linalg.eigvalsh(self.G[np.ix_(rows, rows)])[-1], 1e-12)
+                              for rows in self.blocks]
+
+    def fit(self, alpha):
+        """
+        Returns the coefficient matrix (ntrend + k * lags, k) at alpha on the original scale.
+        """
+        G, c, beta = self.G, self.c, self.beta
+        if self.penalty == 'group':
+            _group_cd(G, c, beta, alpha, self.blocks, self.lipschitz, self.tol, self.max_iter)
+        else:
+            previous = alpha if self.previous is None else self.previous
+            grad = c - G @ beta
+            strong = self.alive[np.abs(grad[self.alive]).max(axis=1) >= 2 * alpha - previous]
+            strong = np.union1d(strong, np.flatnonzero(np.any(beta != 0, axis=1)))
+            beta[strong] = _lasso_cd(G[np.ix_(strong, strong)], c[strong], beta[strong], alpha,
+                                     self.tol, self.max_iter)
+            # Optimality check: a zero coefficient with |gradient| > alpha should have entered
+            grad = c - G @ beta
+            alive = self.alive
+            if np.any((beta[alive] == 0) & (np.abs(grad[alive]) > alpha)):
+                beta[alive] = _lasso_cd(G[np.ix_(alive, alive)], c[alive], beta[alive], alpha,
+                                        self.tol, self.max_iter)
+        self.previous = alpha
+        return _unstandardize(beta, self.Z, self.Y, self.ntrend, self.x_scale, self.y_scale)
+
+
+def alpha_grid(data, lags, penalty='lasso', n_alphas=30, alpha_min_ratio=1e-2, trend='c'):
+    """
+    Log-spaced penalty grid from the smallest alpha that zeroes every lag coefficient down to
+    alpha_min_ratio times that value.
+
+    Parameters:
+    - data: pandas DataFrame or array with the (stationary) time series variables
+    - lags: int, lag order
+    - penalty: str, 'lasso' or 'group' (default='lasso')
+    - n_alphas: int, number of penalties (default=30)
+    - alpha_min_ratio: float, smallest penalty relative to the largest (default=1e-2)
+    - trend: str, 'n', 'c' or 'ct' (default='c')
+
+    Returns:
+    - NumPy array of penalties, largest first
+    """
+    Z, Y = lag_design(np.asarray(data, dtype=float), lags, trend, full_rank=False)
+    X, Ys, _, _ = _standardize(Z, Y, TRENDS[trend])
+    alpha_max = _alpha_max(X.T @ Ys / len(X), penalty, Y.shape[1])
+    return np.geomspace(alpha_max, alpha_max * alpha_min_ratio, n_alphas)
+
+
+@traced("sparse_var")
+def sparse_var(data, lags, penalty='lasso', alpha=None, alphas=None, n_alphas=30, alpha_min_ratio=1e-2,
+               cv_folds=5, patience=3, trend='c', tol=1e-4, max_iter=1000):
+    """
+    Fits a sparse VAR: least squares with an L1 penalty on every lag coefficient ('lasso') or
+    a group penalty on each lag's coefficient matrix ('group', which drops whole lags).
+    Deterministic terms are not penalized; variables are standardized, so one penalty serves
+    every equation.
+
+    The penalty is chosen by rolling-origin cross-validation: the second half of the sample
+    is cut into cv_folds consecutive blocks, and each fold trains on everything before its
+    block and scores one-step forecasts on it (so every fold trains on at least half the data). Each fold walks down the penalty path with warm starts, and
+    the walk stops early once the cross-validated error has stopped improving, so the dense
+    (slow, overfitted) end of the path is never fitted.
+
+    Parameters:
+    - data: pandas DataFrame with the (stationary) time series variables
+    - lags: int, lag order
+    - penalty: str, 'lasso' or 'group' (default='lasso')
+    - alpha: float, optional, fixed penalty (skips cross-validation)
+    - alphas: array-like, optional, penalty grid (default: alpha_grid(...))
+    - n_alphas: int, size of the default grid (default=30)
+    - alpha_min_ratio: float, smallest penalty of the default grid relative to the largest (default=1e-2)
+    - cv_folds: int, number of cross-validation folds (default=5)
+    - patience: int, penalties without improvement before cross-validation stops (default=3)
+    - trend: str, 'n', 'c' or 'ct' (default='c')
+    - tol: float, convergence tolerance on standardized coefficients (default=1e-4)
+    - max_iter: int, maximum number of passes per fit (default=1000)
+
+    Returns:
+    - SparseVARResults
+    """
+    if penalty not in PENALTIES:
+        raise ValueError(f"Invalid penalty. Use one of {PENALTIES}.")
+    values = np.asarray(data, dtype=float)
+    names = list(data.columns) if isinstance(data, pd.DataFrame) else [f"y{i + 1}" for i in range(values.shape[1])]
+    k = values.shape[1]
+    ntrend = TRENDS[trend]
+    Z, Y = lag_design(values, lags, trend, full_rank=False)
+
+    if alpha is not None:
+        alphas = np.array([alpha], dtype=float)
+    elif alphas is None:
+        alphas = alpha_grid(values, lags, penalty, n_alphas, alpha_min_ratio, trend)
+    alphas = np.sort(np.asarray(alphas, dtype=float))[::-1]
+
+    cv_mse = None
+    if len(alphas) > 1:
+        # Rolling-origin cross-validation: all folds walk down the path together, and the walk
+        # stops once the mean validation error has not improved for `patience` penalties
+        bounds = np.linspace(len(Y) // 2, len(Y), cv_folds + 1).astype(int)
+        folds = []
+        for f in range(cv_folds):
+            train, valid = slice(0, bounds[f]), slice(bounds[f], bounds[f + 1])
+            scale = Y[train].std(axis=0)
+            scale[scale == 0] = 1.0
+            folds.append((_PenaltyPath(Z[train], Y[train], ntrend, k, penalty, tol, max_iter), valid, scale))
+        errors = []
+        for alpha in alphas:
+            errors.append(np.mean([np.mean(((Y[valid] - Z[valid] @ path.fit(alpha)) / scale) ** 2)
+                                   for path, valid, scale in folds]))
+            if len(errors) - 1 - int(np.argmin(errors)) >= patience:
+                break
+        cv_mse = pd.Series(errors, index=pd.Index(alphas[:len(errors)], name='alpha'), name='cv_mse')
+        best = int(np.argmin(errors))
+    else:
+        best = 0
+
+    # Refit on the full sample along the path down to the chosen penalty
+    path = _PenaltyPath(Z, Y, ntrend, k, penalty, tol, max_iter)
+    fits = [path.fit(a) for a in alphas[:best + 1]]
+    B = fits[-1]
+    path_nonzero = [int(np.count_nonzero(b[ntrend:])) for b in fits]
+    index = data.index[lags:] if isinstance(data, pd.DataFrame) else None
+    return SparseVARResults(B, names, lags, trend, penalty, alphas[best], alphas, cv_mse, path_nonzero,
+                            Y - Z @ B, len(values), index)
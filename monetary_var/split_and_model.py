@@ -0,0 +1,66 @@
+import pandas as pd
+from monetary_var.var_cache import fit_var
+from monetary_var.sparse_var import sparse_var
+from monetary_var.bayesian_var import bayesian_var
+from monetary_var.results_store import record, model_rows
+import random
+
+def split_and_model(vardf, method='ols'):
+    """
+    Splits the data into training and test sets, runs a VAR model with 3 lags, and generates forecasts.
+    method='ols' fits the usual VAR; 'lasso' or 'group' fit a sparse VAR (see sparse_var.py) with the
+    penalty chosen by cross-validation, for systems with more variables than OLS can handle;
+    'bvar' fits a Bayesian VAR with a Minnesota prior (see bayesian_var.py) and also saves
+    90% predictive bands. The coefficients and fit of these models are saved to the results store
+    (`monetary-var show bvar`, `monetary-var show sparse_var`, `monetary-var show model <name>`).
+    Returns the training DataFrame, test DataFrame, and forecast DataFrame.
+    """
+    # Task 16: Split the data
+    # ':-8' selects all rows except the last 8 quarters (approximately 2 years) for training
+    train = vardf[:-8]
+
+    # '-8:' selects the last 8 quarters as the test set to evaluate the model's forecasting performance
+    test = vardf[-8:]
+
+    # Initialize and fit the VAR model
+    random.seed(1)
+
+    # Define the maximum number of lags to include in the VAR model
+    lags = 3
+
+    # Fit the VAR model on the training data with the specified number of lags
+    # (reuses an earlier fit of the same training data, see var_cache.py)
+    if method == 'ols':
+        results = fit_var(train, lags)
+    elif method == 'bvar':
+        results = bayesian_var(train, lags)
+        point, lower, upper = results.forecast_interval(train.values[-lags:], 8, alpha=0.10, seed=1)
+        model = model_rows(f'bvar_{lags}_lags', results)
+        rows = [('bvar', '', f"lambda:{float(lam)!r}", log_ml) for lam, log_ml in results.log_ml_grid.items()]
+        for j, name in enumerate(results.names):
+            for date, band in zip(test.index, zip(lower[:, j], point[:, j], upper[:, j])):
+                rows += [('bvar_bands', name, f"{date:%Y-%m-%d}:{bound}", value)
+                         for bound, value in zip(('lower', 'forecast', 'upper'), band)]
+        record('split_and_model', coefficients=model['coefficients'], metrics=model['metrics'] + rows)
+    else:
+        results = sparse_var(train, lags, penalty=method)
+        model = model_rows(f'sparse_{method}_{lags}_lags', results)
+        rows = [('sparse', '', 'alpha', results.alpha), ('sparse', '', 'nonzero', results.nonzero),
+                ('sparse', '', 'coefficients', results.coefs.size)]
+        rows += [('sparse', '', f"cv_mse:{float(alpha)!r}", mse) for alpha, mse in results.cv_mse.items()]
+        record('split_and_model', coefficients=model['coefficients'], metrics=model['metrics'] + rows)
+
+    # Generate forecasts
+    # Use the last 3 quarters to predict the current quarter
+    fcinput = train.values[-1 * lags:]
+    fc = results.forecast(y=fcinput, steps=8)
+
+    # Convert the forecast array into a pandas DataFrame
+    df_fc = pd.DataFrame(fc, index=test.index, columns=test.columns)
+
+    return train, test, df_fc
+
+if __name__ == "__main__":
+    from monetary_var.main import main
+    main(['split_and_model'])
+    print("Data splitting and VAR modeling completed")
@@ -0,0 +1,63 @@
+import pandas as pd
+from monetary_var.unit_root import run_unit_root_tests, select_diff_order
+from monetary_var.plotting import emit_plot, line
+from monetary_var.results_store import record
+import os
+
+def check_stationarity(df):
+    """
+    Tests stationarity for each variable, visualizes fedrate vs dfedrate, and returns a DataFrame with stationary variables.
+    ADF results come from the unit root testing service (unit_root.py); series already tested
+    by test_stationarity are served from its cache.
+    Saves stationarity results to the results store (`monetary-var show stationarity`) and plots to results/.
+    """
+    # Ensure the plots directory exists
+    os.makedirs("results/plots", exist_ok=True)
+
+    # Task 9: Test stationarity for each variable (fedrate, unempgr, inflat)
+    variables = {'unempgr': df['unempgr'], 'fedrate': df['fedrate'], 'inflat': df['inflat']}
+    stationary_vars = {}
+    adf_results = run_unit_root_tests({**variables, 'dfedrate': df['dfedrate']}, tests=('adf',))
+    rows = []
+    for name, series in variables.items():
+        result = adf_results[name]['adf']
+        detail = {'critical_values': result['critical_values']}
+        rows.append(('adf', name, result['usedlag'], result['stat'], result['pvalue'], detail))
+        if result['pvalue'] < 0.05:
+            stationary_vars[name] = series
+        else:
+            detail['diff_order'] = select_diff_order(series)
+            if name == 'fedrate':
+                # Task 11: Test dfedrate for stationarity
+                dfedrate = df['dfedrate']
+                result_dfed = adf_results['dfedrate']['adf']
+                rows.append(('adf', 'dfedrate', result_dfed['usedlag'], result_dfed['stat'], result_dfed['pvalue'],
+                             {'critical_values': result_dfed['critical_values'], 'differenced': 'fedrate'}))
+                if result_dfed['pvalue'] < 0.05:
+                    stationary_vars['dfedrate'] = dfedrate
+    record('check_stationarity', tests=rows)
+
+    # Task 12: Visualize fedrate and dfedrate to confirm trend removal
+    emit_plot({
+        'path': "results/plots/fedrate_comparison.png", 'figsize': (12, 5), 'dpi': 100,
+        'layout': (1, 2), 'tight_layout': True,
+        'panels': [
+            {'lines': [line(df['fedrate'], label='Federal Funds Rate (%)', color='green')],
+             'title': 'Federal Funds Rate (Before Differencing)',
+             'xlabel': 'Date', 'ylabel': 'Percentage', 'grid': True},
+            {'lines': [line(df['dfedrate'], label='Differenced Federal Funds Rate (%)', color='purple')],
+             'title': 'Differenced Federal Funds Rate',
+             'xlabel': 'Date', 'ylabel': 'Percentage Change', 'grid': True},
+        ],
+    })
+
+    # Create a new DataFrame with stationary variables
+    stationary_df = pd.DataFrame(stationary_vars, index=df.index)
+    stationary_df = stationary_df.dropna()
+
+    return stationary_df
+
+if __name__ == "__main__":
+    from monetary_var.main import main
+    main(['check_stationarity'])
+    print("Stationarity check completed")
@@ -0,0 +1,31 @@
+import pandas as pd
+from monetary_var.unit_root import run_unit_root_tests
+from monetary_var.results_store import record
+
+def test_stationarity(df):
+    """
+    Tests stationarity for unempgr, fedrate, and inflat using ADF tests.
+    Results come from the unit root testing service (unit_root.py), which caches them per series.
+    Saves results to the results store (`monetary-var show stationarity`).
+    Returns the DataFrame unchanged.
+    """
+    # Task 9: Test stationarity using specified ADF commands
+    variables = {
+        'unempgr': df['unempgr'][1:],
+        'fedrate': df['fedrate'][1:],
+        'inflat': df['inflat'][1:]
+    }
+    adf_results = run_unit_root_tests(variables, tests=('adf',))
+    rows = []
+    for name in variables:
+        result = adf_results[name]['adf']
+        rows.append(('adf', name, result['usedlag'], result['stat'], result['pvalue'],
+                     {'critical_values': result['critical_values']}))
+    record('test_stationarity', tests=rows)
+
+    return df
+
+if __name__ == "__main__":
+    from monetary_var.main import main
+    main(['test_stationarity'])
+    print("Initial stationarity test completed")
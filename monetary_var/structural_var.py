@@ -0,0 +1,233 @@
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from scipy.optimize import minimize
+from monetary_var.impulse_response import companion_powers
+from monetary_var.tracing import traced
+
+# Structural VAR identification on a reduced-form fit (statsmodels VARResults or
+# BayesianVARResults, e.g. the final model of compare_var_lags). The reduced-form residuals are
+# u_t = B0 e_t with orthonormal structural shocks e_t; each scheme finds an impact matrix B0 with
+# B0 B0' = Sigma_u, and the structural responses are Phi_h B0 (see impulse_response.py).
+#
+# - recursive: Cholesky factor for one variable ordering; ordering_bounds repeats it for all k!
+#   orderings, in batches of permutations (optionally on a process pool), and keeps the range.
+# - ab_identify: short-run restrictions A u_t = B e_t, fitted by maximum likelihood.
+# - sign_restrictions: candidate rotations B0 = chol(Sigma_u) Q, Q Haar-distributed orthogonal
+#   matrices drawn as batched QR decompositions, kept when the responses have the required signs.
+#
+# Impact matrices and responses are indexed [response, shock], shocks named after the variables.
+
+BLOCK = 20000
+
+
+def recursive(results, order=None):
+    """
+    Impact matrix of the recursive (Cholesky) identification.
+
+    Parameters:
+    - results: fitted VAR
+    - order: list of variable names or indices, the causal ordering (default: the model's order)
+
+    Returns:
+    - NumPy array (k, k): [variable, shock], rows and columns in the model's variable order
+    """
+    sigma = np.asarray(results.sigma_u, dtype=float)
+    perms = np.asarray([_positions(results, order)]) if order is not None else np.arange(len(sigma))[None]
+    return _ordered_impacts(sigma, perms)[0]
+
+
+def _positions(results, order):
+    names = list(results.names)
+    return [names.index(item) if isinstance(item, str) else int(item) for item in order]
+
+
+def _ordered_impacts(sigma, perms):
+    """
+    Cholesky impact matrices of a batch of orderings (perms: (n, k)), mapped back to the
+    model's variable and shock order.
+    """
+    n = np.arange(len(perms))[:, None, None]
+    lower = np.linalg.cholesky(sigma[perms[:, :, None], perms[:, None, :]])
+    inverse = np.argsort(perms, axis=1)
+    return lower[n, inverse[:, :, None], inverse[:, None, :]]
+
+
+def structural_responses(results, impact, horizon=40):
+    """
+    Structural impulse responses Phi_h B0 for one impact matrix or a batch (..., k, k).
+
+    Returns:
+    - NumPy array (..., horizon + 1, k, k): [horizon, response, shock]
+    """
+    return companion_powers(results, horizon) @ np.asarray(impact)[..., None, :, :]
+
+
+def _ordering_block(phi, sigma, perms):
+    responses = phi @ _ordered_impacts(sigma, perms)[:, None]
+    return responses.min(axis=0), responses.max(axis=0)
+
+
+@traced("ordering_bounds")
+def ordering_bounds(results, horizon=40, n_jobs=1):
+    """
+    Range of the recursive responses across all k! variable orderings, a robustness check of
+    the Cholesky identification.
+
+    Parameters:
+    - results: fitted VAR
+    - horizon: int, last horizon in quarters (default=40)
+    - n_jobs: int, number of worker processes the permutation batches are split across
+      (default=1, in process)
+
+    Returns:
+    - (lower, upper): NumPy arrays (horizon + 1, k, k), the smallest and largest response
+      over the orderings
+    """
+    phi = companion_powers(results, horizon)
+    sigma = np.asarray(results.sigma_u, dtype=float)
+    perms = np.array(list(itertools.permutations(range(len(sigma)))))
+    batches = [perms[start:start + BLOCK] for start in range(0, len(perms), BLOCK)]
+    if n_jobs <= 1 or len(batches) == 1:
+        blocks = [_ordering_block(phi, sigma, batch) for batch in batches]
+    else:
+        with ProcessPoolExecutor(max_workers=min(n_jobs, len(batches))) as pool:
+            blocks = list(pool.map(_ordering_block, [phi] * len(batches), [sigma] * len(batches), batches))
+    return np.min([block[0] for block in blocks], axis=0), np.max([block[1] for block in blocks], axis=0)
+
+
+def _pattern(matrix):
+    # Free entries as NaN; statsmodels' SVAR marks them 'E'
+    matrix = np.asarray(matrix, dtype=object)
+    return np.where(matrix == 'E', np.nan, matrix).astype(float)
+
+
+def ab_identify(results, A=None, B=None):
+    """
+    Short-run A/B identification, A u_t = B e_t, by maximum likelihood given Sigma_u:
+    log L = -T/2 (log |A^-1 B B' A^-T| + tr((A^-1 B B' A^-T)^-1 Sigma_u)) + const.
+
+    Parameters:
+    - results: fitted VAR
+    - A, B: (k, k) arrays of fixed values with free entries as np.nan (or 'E', as statsmodels'
+      SVAR) (default: A = I and B lower triangular, which reproduces the Cholesky factor; B diagonal
+      when A has free entries)
+
+    Returns:
+    - dict with 'A', 'B', 'impact' (A^-1 B, columns signed so its diagonal is positive),
+      'llf' and 'converged'
+    """
+    sigma = np.asarray(results.sigma_u, dtype=float)
+    k = len(sigma)
+    A = np.eye(k) if A is None else _pattern(A)
+    if B is None:
+        B = np.diag(np.full(k, np.nan)) if np.isnan(A).any() else np.where(np.tri(k) > 0, np.nan, 0.0)
+    else:
+        B = _pattern(B)
+    free_a, free_b = np.isnan(A), np.isnan(B)
+    n_free = free_a.sum() + free_b.sum()
+    if n_free > k * (k + 1) // 2:
+        raise ValueError(f"Not identified: {n_free} free parameters, at most {k * (k + 1) // 2} for {k} variables.")
+
+    def unpack(theta):
+        a, b = A.copy(), B.copy()
+        a[free_a] = theta[:free_a.sum()]
+        b[free_b] = theta[free_a.sum():]
+        return a, b
+
+    def negative_llf(theta):
+        a, b = unpack(theta)
+        omega = np.linalg.solve(a, b)
+        omega = omega @ omega.T
+        sign, logdet = np.linalg.slogdet(omega)
+        if sign <= 0:
+            return np.inf
+        return logdet + np.trace(np.linalg.solve(omega, sigma))
+
+    # Start from A = I and B = the diagonal of the Cholesky factor
+    start_a = np.eye(k)[free_a]
+    start_b = np.diag(np.sqrt(np.diag(sigma)))[free_b]
+    fit = minimize(negative_llf, np.concatenate([start_a, start_b]), method='BFGS')
+    a, b = unpack(fit.x)
+    impact = np.linalg.solve(a, b)
+    signs = np.where(np.diag(impact) < 0, -1.0, 1.0)
+    nobs = results.nobs
+    return {'A': a, 'B': b * signs, 'impact': impact * signs, 'converged': bool(fit.success),
+            'llf': -nobs / 2 * (fit.fun + k * np.log(2 * np.pi))}
+
+
+def _sign_matrix(results, signs, k):
+    """
+    Signs as a (k, k) array [response, shock] of +1, -1 and 0 (unrestricted), from a dict
+    {(response, shock): sign} of variable names or an array.
+    """
+    if isinstance(signs, dict):
+        names = list(results.names)
+        matrix = np.zeros((k, k))
+        for (response, shock), sign in signs.items():
+            matrix[names.index(response), names.index(shock)] = np.sign(sign)
+        return matrix
+    return np.sign(np.nan_to_num(np.asarray(signs, dtype=float)))
+
+
+def _rotation_block(phi, chol, signs, draws, seed):
+    """
+    One block of candidate rotations with its own RNG stream. Q = QR(Z) with Z standard normal
+    (the diagonal of R made positive) is Haar-distributed; a shock whose responses all have the
+    wrong sign is kept with its sign flipped.
+    """
+    rng = np.random.default_rng(seed)
+    k = len(chol)
+    q, r = np.linalg.qr(rng.standard_normal((draws, k, k)))
+    q = q * np.sign(np.diagonal(r, axis1=1, axis2=2))[:, None, :]
+    impact = chol @ q
+    responses = phi[None] @ impact[:, None]
+    restricted = signs != 0
+    # Per draw, horizon and shock: do all restricted responses match the signs, or their opposite?
+    matches = np.where(restricted, responses * signs > 0, True).all(axis=(1, 2))
+    flipped = np.where(restricted, responses * signs < 0, True).all(axis=(1, 2))
+    accepted = (matches | flipped).all(axis=1)
+    impact = impact * np.where(matches, 1.0, -1.0)[:, None, :]
+    return impact[accepted]
+
+
+@traced("sign_restrictions")
+def sign_restrictions(results, signs, horizons=(0,), draws=200000, seed=0, n_jobs=1):
+    """
+    Sign-restriction identification: keeps the rotations of the Cholesky factor whose structural
+    responses have the required signs at every restricted horizon.
+
+    Parameters:
+    - results: fitted VAR
+    - signs: dict {(response, shock): +1 or -1} of variable names, or a (k, k) array
+      [response, shock] with 0 for unrestricted responses; shocks without restrictions are
+      not identified
+    - horizons: list of int, horizons where the signs must hold (default: on impact only)
+    - draws: int, number of candidate rotations (default=200000)
+    - seed: int, seed of the rotation streams (default=0)
+    - n_jobs: int, number of worker processes the blocks of draws are split across
+      (default=1, in process)
+
+    Returns:
+    - dict with 'impact' (accepted impact matrices, shape (n_accepted, k, k)), 'draws' and
+      'acceptance' (share of draws kept)
+    """
+    sigma = np.asarray(results.sigma_u, dtype=float)
+    k = len(sigma)
+    matrix = _sign_matrix(results, signs, k)
+    if not matrix.any():
+        raise ValueError("No sign restrictions given.")
+    horizons = sorted(set(horizons))
+    phi = companion_powers(results, max(horizons))[horizons]
+    chol = np.linalg.cholesky(sigma)
+    # Every block has a fixed size and its own child seed, so results do not depend on n_jobs
+    sizes = [min(BLOCK, draws - start) for start in range(0, draws, BLOCK)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    if n_jobs <= 1 or len(sizes) == 1:
+        blocks = [_rotation_block(phi, chol, matrix, size, child) for size, child in zip(sizes, seeds)]
+    else:
+        n = len(sizes)
+        with ProcessPoolExecutor(max_workers=min(n_jobs, n)) as pool:
+            blocks = list(pool.map(_rotation_block, [phi] * n, [chol] * n, [matrix] * n, sizes, seeds))
+    impact = np.concatenate(blocks)
+    return {'impact': impact, 'draws': draws, 'acceptance': len(impact) / draws}
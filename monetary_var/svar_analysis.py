@@ -0,0 +1,63 @@
+import numpy as np
+from monetary_var.structural_var import recursive, structural_responses, ordering_bounds, sign_restrictions
+from monetary_var.plotting import emit_plot
+from monetary_var.results_store import record
+
+# Contractionary policy shock: the rate rises and inflation falls, on impact and the next quarter;
+# the response of unemployment growth is left open
+POLICY_SIGNS = {('dfedrate', 'dfedrate'): 1, ('inflat', 'dfedrate'): -1}
+
+def svar_analysis(final_results, horizon=20, draws=200000, shock='dfedrate', signs=POLICY_SIGNS,
+                  sign_horizons=(0, 1)):
+    """
+    Identifies structural shocks of the final VAR model (see structural_var.py): the recursive
+    responses over all variable orderings, and a policy shock identified by sign restrictions.
+    Saves them to the results store (`monetary-var show svar`) and a plot of the responses to the
+    policy shock to results/plots/.
+    Returns the final VAR model results unchanged.
+    """
+    # The ordering of the Cholesky identification is an assumption: report the range over all orderings
+    names = list(final_results.names)
+    j = names.index(shock)
+    baseline = structural_responses(final_results, recursive(final_results), horizon)
+    lower, upper = ordering_bounds(final_results, horizon)
+
+    # Sign restrictions: median and 68% band of the responses over the accepted rotations
+    identified = sign_restrictions(final_results, signs, horizons=sign_horizons, draws=draws, seed=0)
+    responses = structural_responses(final_results, identified['impact'][:, :, j:j + 1], horizon)[..., 0]
+    sign_lower, median, sign_upper = (np.quantile(responses, [0.16, 0.5, 0.84], axis=0) if len(responses)
+                                      else np.full((3, horizon + 1, len(names)), np.nan))
+
+    rows = [('svar', '', 'acceptance', identified['acceptance']),
+            ('svar', '', 'accepted', len(identified['impact']))]
+    for i, response in enumerate(names):
+        pair = f"{shock} -> {response}"
+        for h in range(horizon + 1):
+            rows += [('svar', pair, f"recursive:{h}", baseline[h, i, j]),
+                     ('svar', pair, f"order_min:{h}", lower[h, i, j]),
+                     ('svar', pair, f"order_max:{h}", upper[h, i, j]),
+                     ('svar', pair, f"sign_median:{h}", median[h, i]),
+                     ('svar', pair, f"sign_lower:{h}", sign_lower[h, i]),
+                     ('svar', pair, f"sign_upper:{h}", sign_upper[h, i])]
+    record('svar_analysis', metrics=rows)
+
+    steps = list(range(horizon + 1))
+    emit_plot({
+        'path': "results/plots/svar_policy_shock.png", 'figsize': (5 * len(names), 4), 'dpi': 100,
+        'layout': (1, len(names)), 'tight_layout': True,
+        'panels': [{'lines': [{'x': steps, 'y': median[:, i], 'label': 'sign restrictions (median)'},
+                              {'x': steps, 'y': sign_lower[:, i], 'color': 'grey'},
+                              {'x': steps, 'y': sign_upper[:, i], 'color': 'grey'},
+                              {'x': steps, 'y': baseline[:, i, j], 'label': 'recursive'},
+                              {'x': steps, 'y': lower[:, i, j], 'label': 'range over orderings', 'color': 'tan'},
+                              {'x': steps, 'y': upper[:, i, j], 'color': 'tan'}],
+                    'title': f"{shock} shock -> {response}", 'grid': True, 'legend': {'fontsize': 8} if i == 0 else None}
+                   for i, response in enumerate(names)],
+    })
+
+    return final_results
+
+if __name__ == "__main__":
+    from monetary_var.main import main
+    main(['svar_analysis'])
+    print("Structural VAR analysis completed")
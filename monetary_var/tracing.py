@@ -0,0 +1,226 @@
+import functools
+import glob
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+
+# Nestable timing spans for profiling a run, exported as a Chrome / Perfetto trace
+# (chrome://tracing or ui.perfetto.dev) plus a flat summary table.
+#
+# Tracing is off unless main() is given a trace path (--trace, or the VAR_TRACE environment
+# variable); span() then returns a shared no-op context, so instrumented code pays one check.
+# Stages run in worker processes, so every process appends its events to its own file in the
+# run's trace directory (VAR_TRACE_DIR, inherited by workers); export_trace() merges them.
+# VAR_TRACE_MEMORY=1 additionally records the tracemalloc peak of every span (slow).
+
+_NULL = nullcontext()
+_dir = os.environ.get("VAR_TRACE_DIR")
+_memory = os.environ.get("VAR_TRACE_MEMORY", "").strip().lower() in ("1", "true", "yes")
+_local = threading.local()
+_file = None
+_file_pid = None
+_lock = threading.Lock()
+
+
+def enabled():
+    return _dir is not None
+
+
+def start(trace_dir=None, memory=None):
+    """
+    Turns tracing on for this process and the worker processes it starts afterwards.
+
+    Parameters:
+    - trace_dir: str, optional, directory collecting the event files (default: a new temporary one)
+    - memory: bool, optional, record tracemalloc peaks per span (default: VAR_TRACE_MEMORY)
+
+    Returns:
+    - str, the trace directory
+    """
+    global _dir, _memory
+    _dir = trace_dir or tempfile.mkdtemp(prefix="var_trace_")
+    os.makedirs(_dir, exist_ok=True)
+    os.environ["VAR_TRACE_DIR"] = _dir
+    if memory is not None:
+        _memory = bool(memory)
+        os.environ["VAR_TRACE_MEMORY"] = "1" if memory else ""
+    return _dir
+
+
+def stop():
+    """
+    Turns tracing off and closes this process's event file.
+    """
+    global _dir, _file
+    with _lock:
+        if _file is not None:
+            _file.close()
+            _file = None
+    _dir = None
+    os.environ.pop("VAR_TRACE_DIR", None)
+    if tracemalloc.is_tracing() and _memory:
+        tracemalloc.stop()
+
+
+def _rss_mb():
+    # Resident set size from /proc (Linux); elsewhere the peak RSS from getrusage
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+    except (OSError, ValueError, AttributeError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 2 ** 10
+
+
+def _emit(events):
+    global _file, _file_pid
+    with _lock:
+        # A forked worker inherits the parent's file object: open its own instead
+        if _file is None or _file_pid != os.getpid():
+            _file = open(os.path.join(_dir, f"events-{os.getpid()}.jsonl"), "a", buffering=1)
+            _file_pid = os.getpid()
+        for event in events:
+            _file.write(json.dumps(event) + "\n")
+
+
+@contextmanager
+def _span(name, args):
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    if _memory:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        # Peaks of enclosing spans are carried on the stack, since resetting the peak is global
+        if stack:
+            stack[-1] = max(stack[-1], tracemalloc.get_traced_memory()[1])
+        tracemalloc.reset_peak()
+    stack.append(0)
+    started = time.time_ns()
+    try:
+        yield
+    finally:
+        ended = time.time_ns()
+        inner_peak = stack.pop()
+        pid, tid = os.getpid(), threading.get_ident()
+        rss = _rss_mb()
+        args = dict(args, rss_mb=round(rss, 2))
+        if _memory:
+            peak = max(inner_peak, tracemalloc.get_traced_memory()[1])
+            args['peak_mb'] = round(peak / 2 ** 20, 3)
+            if stack:
+                stack[-1] = max(stack[-1], peak)
+        _emit([{'name': name, 'ph': 'X', 'ts': started / 1000, 'dur': (ended - started) / 1000,
+                'pid': pid, 'tid': tid, 'args': args},
+               {'name': 'memory', 'ph': 'C', 'ts': ended / 1000, 'pid': pid, 'args': {'rss_mb': round(rss, 2)}}])
+
+
+def span(name, **args):
+    """
+    Context manager timing a (nestable) region of code while tracing is on; a no-op otherwise.
+
+    Parameters:
+    - name: str, span name, e.g. 'stage:merge_data' or 'fit_var'
+    - **args: values shown with the span in the trace viewer (e.g. lags=3)
+    """
+    if _dir is None:
+        return _NULL
+    return _span(name, args)
+
+
+def traced(name):
+    """
+    Decorator running the whole function inside span(name) while tracing is on.
+    """
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _dir is None:
+                return func(*args, **kwargs)
+            with _span(name, {}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def export_trace(trace_dir, path):
+    """
+    Merges the event files of a run into a Chrome trace JSON and writes a flat summary table
+    (path with a .txt suffix) aggregating the spans by name.
+
+    Parameters:
+    - trace_dir: str, directory with the events-<pid>.jsonl files
+    - path: str, output trace file, e.g. results/trace.json
+
+    Returns:
+    - str, the summary table
+    """
+    events = []
+    for name in sorted(glob.glob(os.path.join(trace_dir, "events-*.jsonl"))):
+        with open(name) as f:
+            events.extend(json.loads(line) for line in f if line.strip())
+    events.sort(key=lambda event: event['ts'])
+
+    # Name the processes: the first to emit is the main process, the others are workers
+    pids = list(dict.fromkeys(event['pid'] for event in events))
+    metadata = [{'name': 'process_name', 'ph': 'M', 'pid': pid,
+                 'args': {'name': 'main' if i == 0 else f"worker {pid}"}} for i, pid in enumerate(pids)]
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as f:
+        json.dump({'traceEvents': metadata + events, 'displayTimeUnit': 'ms'}, f)
+
+    summary = summarize(events)
+    with open(os.path.splitext(path)[0] + ".txt", "w") as f:
+        f.write(summary)
+    return summary
+
+
+def summarize(events):
+    """
+    Formats a flat table of the span events: calls, total, mean and max time, and the largest
+    resident set size (and tracemalloc peak, if recorded) at the end of a span, per span name.
+    """
+    stats = {}
+    for event in events:
+        if event['ph'] != 'X':
+            continue
+        row = stats.setdefault(event['name'], {'calls': 0, 'total': 0.0, 'max': 0.0, 'rss': 0.0, 'peak': None})
+        row['calls'] += 1
+        row['total'] += event['dur'] / 1000
+        row['max'] = max(row['max'], event['dur'] / 1000)
+        row['rss'] = max(row['rss'], event['args'].get('rss_mb', 0.0))
+        if 'peak_mb' in event['args']:
+            row['peak'] = max(row['peak'] or 0.0, event['args']['peak_mb'])
+
+    width = max([len(name) for name in stats] + [4])
+    lines = [f"{'span':<{width}}{'calls':>7}{'total ms':>12}{'mean ms':>12}{'max ms':>12}{'rss MB':>10}{'peak MB':>10}"]
+    for name, row in sorted(stats.items(), key=lambda item: -item[1]['total']):
+        peak = "" if row['peak'] is None else f"{row['peak']:.2f}"
+        lines.append(f"{name:<{width}}{row['calls']:>7}{row['total']:>12.2f}{row['total'] / row['calls']:>12.2f}"
+                     f"{row['max']:>12.2f}{row['rss']:>10.1f}{peak:>10}")
+    return "\n".join(lines) + "\n"
+
+
+@contextmanager
+def trace_run(path, memory=None):
+    """
+    Traces everything inside the block and exports the trace to path when it ends.
+
+    Parameters:
+    - path: str, output trace file (the summary goes next to it with a .txt suffix)
+    - memory: bool, optional, record tracemalloc peaks per span (default: VAR_TRACE_MEMORY)
+    """
+    trace_dir = start(memory=memory)
+    try:
+        with span("run"):
+            yield
+    finally:
+        stop()
+        print(export_trace(trace_dir, path), end="")
+        print(f"Trace written to {path} (open in ui.perfetto.dev or chrome://tracing)")
+        shutil.rmtree(trace_dir, ignore_errors=True)
@@ -0,0 +1,170 @@
+import numpy as np
+import pandas as pd
+
+# Invertible transforms from the levels of a series to the stationary variables the VAR models.
+# transform() applies one to a series and records the values its inverse needs (the last few
+# levels). inverse() maps transformed values that continue a series back to levels. Forecast
+# paths have time along the last axis, so thousands of simulated or bootstrapped paths
+# (shape (n_paths, steps)) are inverted at once with cumulative sums and products, without
+# looping over paths.
+
+
+class Transform:
+    """
+    Base class. Subclasses define memory (number of trailing levels the inverse needs),
+    _forward(values) on 1-D arrays and _inverse(values, last) on arrays with time on the last axis.
+    """
+    memory = 0
+
+    def __init__(self):
+        self.last = np.empty(0)
+
+    def transform(self, series):
+        """
+        Transforms a series (pandas Series or 1-D array) and records its last levels for inverse().
+        Leading values without enough history are NaN.
+        """
+        values = np.asarray(series, dtype=float)
+        self.last = values[len(values) - self.memory:]
+        out = self._forward(values)
+        if isinstance(series, pd.Series):
+            return pd.Series(out, index=series.index, name=series.name)
+        return out
+
+    def inverse(self, values, history=None):
+        """
+        Converts transformed values continuing a series back to levels.
+
+        Parameters:
+        - values: array-like with time on the last axis, e.g. (steps,) for one forecast path or
+          (n_paths, steps) for simulated paths; a pandas Series keeps its index
+        - history: array-like, optional, the levels up to the forecast origin
+          (default: the levels recorded by the last transform() call)
+
+        Returns:
+        - NumPy array (or Series) of levels with the shape of values
+        """
+        last = self.last if history is None else np.asarray(history, dtype=float)[len(history) - self.memory:]
+        if len(last) < self.memory:
+            raise ValueError(f"{self!r} needs the last {self.memory} levels to invert, got {len(last)}")
+        out = self._inverse(np.asarray(values, dtype=float), last)
+        if isinstance(values, pd.Series):
+            return pd.Series(out, index=values.index, name=values.name)
+        return out
+
+    def __repr__(self):
+        return f"{type(self).__name__}()"
+
+
+def _shift(values, lag):
+    out = np.full(len(values), np.nan)
+    out[lag:] = values[:len(values) - lag]
+    return out
+
+
+def _undifference(values, last, lag):
+    """
+    Inverts y[t] = x[t] + y[t - lag] given the last lag levels: the steps are split into blocks of
+    lag, and position r of every block accumulates from last[r].
+    """
+    steps = values.shape[-1]
+    pad = -steps % lag
+    blocks = np.concatenate([values, np.zeros(values.shape[:-1] + (pad,))], axis=-1)
+    blocks = blocks.reshape(values.shape[:-1] + (-1, lag))
+    levels = last + np.cumsum(blocks, axis=-2)
+    return levels.reshape(values.shape[:-1] + (-1,))[..., :steps]
+
+
+class Difference(Transform):
+    """
+    Difference of order d at a lag: lag=1 for first differences (dfedrate = fedrate.diff()),
+    lag=4 for a seasonal difference of quarterly data.
+
+    Parameters:
+    - order: int, number of times the difference is applied (default=1)
+    - lag: int, distance of the difference (default=1)
+    """
+    def __init__(self, order=1, lag=1):
+        super().__init__()
+        self.order = order
+        self.lag = lag
+        self.memory = order * lag
+
+    def _forward(self, values):
+        for _ in range(self.order):
+            values = values - _shift(values, self.lag)
+        return values
+
+    def _inverse(self, values, last):
+        # The last lag values of each intermediate difference, from the recorded levels
+        tails = [last]
+        for _ in range(self.order - 1):
+            tails.append(tails[-1][self.lag:] - tails[-1][:-self.lag])
+        for tail in reversed(tails):
+            values = _undifference(values, tail[-self.lag:], self.lag)
+        return values
+
+    def __repr__(self):
+        return f"Difference(order={self.order}, lag={self.lag})"
+
+
+class PctChange(Transform):
+    """
+    Percentage change on the previous period (unempgr = UNRATE.pct_change() * 100).
+
+    Parameters:
+    - scale: float, 100 for percent, 1 for plain rates (default=100)
+    """
+    memory = 1
+
+    def __init__(self, scale=100):
+        super().__init__()
+        self.scale = scale
+
+    def _forward(self, values):
+        return (values / _shift(values, 1) - 1) * self.scale
+
+    def _inverse(self, values, last):
+        return last[-1] * np.cumprod(1 + values / self.scale, axis=-1)
+
+    def __repr__(self):
+        return f"PctChange(scale={self.scale})"
+
+
+class Log(Transform):
+    """
+    Natural logarithm.
+    """
+    def _forward(self, values):
+        return np.log(values)
+
+    def _inverse(self, values, last):
+        return np.exp(values)
+
+
+class Chain(Transform):
+    """
+    Transforms applied in sequence, e.g. Chain(Log(), Difference()) for log growth rates.
+    The inverse undoes them in reverse order, each from the history of its own input.
+    """
+    def __init__(self, *steps):
+        super().__init__()
+        self.steps = list(steps)
+        self.memory = sum(step.memory for step in self.steps)
+
+    def _forward(self, values):
+        for step in self.steps:
+            step.last = values[len(values) - step.memory:]
+            values = step._forward(values)
+        return values
+
+    def _inverse(self, values, last):
+        histories = [last]
+        for step in self.steps[:-1]:
+            histories.append(step._forward(histories[-1]))
+        for step, history in zip(reversed(self.steps), reversed(histories)):
+            values = step._inverse(values, history[len(history) - step.memory:])
+        return values
+
+    def __repr__(self):
+        return f"Chain({', '.join(map(repr, self.steps))})"
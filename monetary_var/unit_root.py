@@ -0,0 +1,267 @@
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from statsmodels.tsa.adfvalues import mackinnonp, mackinnoncrit
+from monetary_var.tracing import traced
+
+# In-memory results, keyed by series hash, test and options; mirrored to
+# UNIT_ROOT_CACHE_DIR (one JSON file per result) when that variable is set
+_RESULTS = {}
+
+TESTS = ('adf', 'kpss', 'pp')
+
+
+def _trend_columns(n, regression, start=1):
+    columns = []
+    if regression in ('c', 'ct'):
+        columns.append(np.ones(n))
+    if regression == 'ct':
+        columns.append(np.arange(start, start + n, dtype=float))
+    return columns
+
+
+def _crit_dict(regression, nobs):
+    crit = mackinnoncrit(N=1, regression=regression, nobs=nobs)
+    return {'1%': float(crit[0]), '5%': float(crit[1]), '10%': float(crit[2])}
+
+
+def adf_test(x, regression='c', maxlag=None, autolag='aic'):
+    """
+    Augmented Dickey-Fuller test, equivalent to statsmodels' adfuller.
+
+    The lag search fits every candidate lag order on a common sample. The candidates are
+    nested (each adds one lagged difference column), so the full lagged-difference design is
+    factorised once (QR) and the residual sum of squares of every candidate is read off the
+    same factorisation. Only the chosen lag order is refitted on its own, longer sample.
+
+    Parameters:
+    - x: 1-D array-like, the series
+    - regression: str, 'n', 'c' or 'ct' (default='c')
+    - maxlag: int, optional, largest lag (default: 12 * (nobs / 100) ** (1 / 4), as in adfuller)
+    - autolag: str or None, 'aic', 'bic' or None to use maxlag directly (default='aic')
+
+    Returns:
+    - dict with 'stat', 'pvalue', 'usedlag', 'nobs', 'critical_values' and 'icbest'
+    """
+    x = np.asarray(x, dtype=float)
+    if x.max() == x.min():
+        raise ValueError("Invalid input, x is constant")
+    nobs = len(x)
+    ntrend = {'n': 0, 'c': 1, 'ct': 2}[regression]
+    if maxlag is None:
+        maxlag = min(nobs // 2 - ntrend - 1, int(np.ceil(12.0 * np.power(nobs / 100.0, 1 / 4.0))))
+        if maxlag < 0:
+            raise ValueError("sample size is too short to use selected regression component")
+    xdiff = np.diff(x)
+
+    def design(lags):
+        n = len(xdiff) - lags
+        columns = [x[lags:lags + n]] + [xdiff[lags - l:lags - l + n] for l in range(1, lags + 1)]
+        return np.column_stack(columns), xdiff[lags:]
+
+    icbest = None
+    usedlag = maxlag
+    if autolag:
+        # Candidate models are the leading columns [trend terms, level, lag 1, ..., lag maxlag]
+        X, y = design(maxlag)
+        n = len(y)
+        X = np.column_stack(_trend_columns(n, regression) + [X]) if ntrend else X
+        Q, R = np.linalg.qr(X)
+        qy = Q.T @ y
+        ssr = y @ y - np.cumsum(qy ** 2)
+        ncols = np.arange(1, X.shape[1] + 1)
+        llf = -n / 2 * (np.log(2 * np.pi) + np.log(ssr / n) + 1)
+        penalty = {'aic': 2.0, 'bic': np.log(n)}[autolag]
+        ic = -2 * llf + penalty * ncols
+        candidates = np.arange(ntrend + 1, X.shape[1] + 1)
+        best = candidates[np.argmin(ic[candidates - 1])]
+        icbest = float(ic[best - 1])
+        usedlag = int(best - ntrend - 1)
+
+    X, y = design(usedlag)
+    n = len(y)
+    if ntrend:
+        X = np.column_stack([X] + _trend_columns(n, regression, start=1))
+    beta, _, _, _ = np.linalg.lstsq(X, y, rcond=None)
+    resid = y - X @ beta
+    s2 = resid @ resid / (n - X.shape[1])
+    se = np.sqrt(s2 * np.linalg.inv(X.T @ X)[0, 0])
+    stat = float(beta[0] / se)
+    return {
+        'stat': stat,
+        'pvalue': float(mackinnonp(stat, regression=regression, N=1)),
+        'usedlag': usedlag,
+        'nobs': n,
+        'critical_values': _crit_dict(regression, n),
+        'icbest': icbest,
+    }
+
+
+def pp_test(x, regression='c', lags=None):
+    """
+    Phillips-Perron Z-tau unit root test (same null hypothesis and MacKinnon p-values as ADF).
+    Serial correlation is handled with a Newey-West (Bartlett kernel) long-run variance
+    instead of lagged differences.
+
+    Parameters:
+    - x: 1-D array-like, the series
+    - regression: str, 'n', 'c' or 'ct' (default='c')
+    - lags: int, optional, Newey-West bandwidth (default: ceil(12 * (nobs / 100) ** (1 / 4)))
+
+    Returns:
+    - dict with 'stat', 'pvalue', 'usedlag', 'nobs' and 'critical_values'
+    """
+    x = np.asarray(x, dtype=float)
+    y, n = x[1:], len(x) - 1
+    if lags is None:
+        lags = int(np.ceil(12.0 * np.power(n / 100.0, 1 / 4.0)))
+    X = np.column_stack([x[:-1]] + _trend_columns(n, regression))
+    beta, _, _, _ = np.linalg.lstsq(X, y, rcond=None)
+    resid = y - X @ beta
+    s2 = resid @ resid / (n - X.shape[1])
+    se_rho = np.sqrt(s2 * np.linalg.inv(X.T @ X)[0, 0])
+    gamma0 = resid @ resid / n
+    weights = 1 - np.arange(1, lags + 1) / (lags + 1)
+    autocov = np.array([resid[j:] @ resid[:-j] / n for j in range(1, lags + 1)])
+    lam2 = gamma0 + 2 * weights @ autocov
+    tau = (beta[0] - 1) / se_rho
+    stat = float(np.sqrt(gamma0 / lam2) * tau
+                 - 0.5 * (lam2 - gamma0) / np.sqrt(lam2) * n * se_rho / np.sqrt(s2))
+    return {
+        'stat': stat,
+        'pvalue': float(mackinnonp(stat, regression=regression, N=1)),
+        'usedlag': lags,
+        'nobs': n,
+        'critical_values': _crit_dict(regression, n),
+    }
+
+
+def kpss_test(x, regression='c', nlags='auto'):
+    """
+    KPSS stationarity test (statsmodels' kpss). Note the null hypothesis is stationarity.
+
+    Returns:
+    - dict with 'stat', 'pvalue', 'usedlag', 'nobs' and 'critical_values'
+    """
+    import warnings
+    from statsmodels.tsa.stattools import kpss
+    with warnings.catch_warnings():
+        # kpss warns when the p-value is outside its lookup table and is reported at the bound
+        warnings.simplefilter("ignore")
+        stat, pvalue, usedlag, crit = kpss(np.asarray(x, dtype=float), regression=regression, nlags=nlags)
+    return {
+        'stat': float(stat),
+        'pvalue': float(pvalue),
+        'usedlag': int(usedlag),
+        'nobs': len(x),
+        'critical_values': {k: float(v) for k, v in crit.items() if k in ('1%', '5%', '10%')},
+    }
+
+
+_TEST_FUNCTIONS = {'adf': adf_test, 'kpss': kpss_test, 'pp': pp_test}
+
+
+def _result_key(values, test, options):
+    h = hashlib.sha256(np.ascontiguousarray(values, dtype=float).tobytes())
+    h.update(f"|{test}|{sorted(options.items())}".encode())
+    return h.hexdigest()
+
+
+def _run_one(values, test, options):
+    return _TEST_FUNCTIONS[test](values, **options)
+
+
+def unit_root_test(series, test='adf', cache_dir=None, **options):
+    """
+    Runs one unit root test on one series, returning a cached result if the same series
+    (by value hash) was already tested with the same options.
+
+    Parameters:
+    - series: pandas Series or 1-D array; missing values are dropped
+    - test: str, 'adf', 'kpss' or 'pp' (default='adf')
+    - cache_dir: str, optional, directory of the on-disk cache (default: UNIT_ROOT_CACHE_DIR, off if unset)
+    - options: passed to the test function (e.g. regression='ct', autolag='bic')
+
+    Returns:
+    - dict with the test results (see adf_test, kpss_test and pp_test)
+    """
+    return run_unit_root_tests({'series': series}, tests=(test,), cache_dir=cache_dir,
+                               **options)['series'][test]
+
+
+@traced("unit_root_tests")
+def run_unit_root_tests(series, tests=('adf',), n_jobs=1, cache_dir=None, **options):
+    """
+    Runs unit root tests for many series, serving repeated series from the cache and running
+    the remaining tests on a process pool when n_jobs > 1.
+
+    Parameters:
+    - series: dict mapping names to pandas Series (or 1-D arrays); missing values are dropped
+    - tests: tuple of test names from 'adf', 'kpss', 'pp' (default=('adf',))
+    - n_jobs: int, number of worker processes (default=1, in process)
+    - cache_dir: str, optional, directory of the on-disk cache (default: UNIT_ROOT_CACHE_DIR, off if unset)
+    - options: passed to every test function (e.g. regression='ct')
+
+    Returns:
+    - dict mapping each name to a dict of {test name: result dict}
+    """
+    cache_dir = cache_dir if cache_dir is not None else os.environ.get("UNIT_ROOT_CACHE_DIR")
+    results = {name: {} for name in series}
+    pending = []
+    for name, values in series.items():
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        for test in tests:
+            if test not in _TEST_FUNCTIONS:
+                raise ValueError(f"Invalid test {test}. Use one of {TESTS}.")
+            key = _result_key(values, test, options)
+            path = os.path.join(cache_dir, f"{key}.json") if cache_dir else None
+            if key not in _RESULTS and path and os.path.exists(path):
+                with open(path) as f:
+                    _RESULTS[key] = json.load(f)
+            if key in _RESULTS:
+                results[name][test] = _RESULTS[key]
+            else:
+                pending.append((name, test, key, path, values))
+
+    # The same series can appear under several names; test each distinct one once
+    unique = {}
+    for name, test, key, path, values in pending:
+        unique.setdefault(key, (test, path, values))
+    keys = list(unique)
+    jobs = [(unique[k][2], unique[k][0], options) for k in keys]
+    if n_jobs > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            computed = list(pool.map(_run_one, *zip(*jobs), chunksize=max(1, len(jobs) // (4 * n_jobs))))
+    else:
+        computed = [_run_one(*job) for job in jobs]
+
+    for key, result in zip(keys, computed):
+        _RESULTS[key] = result
+        path = unique[key][1]
+        if path:
+            os.makedirs(cache_dir, exist_ok=True)
+            with open(path, "w") as f:
+                json.dump(result, f)
+    for name, test, key, path, values in pending:
+        results[name][test] = _RESULTS[key]
+    return results
+
+
+def select_diff_order(series, max_d=2, alpha=0.05, **options):
+    """
+    Picks the differencing order of a series: the smallest d (up to max_d) for which the ADF
+    test rejects a unit root at level alpha. ADF results come from the cache.
+
+    Returns:
+    - int, the differencing order (max_d if no order up to max_d rejects)
+    """
+    values = np.asarray(series, dtype=float)
+    values = values[~np.isnan(values)]
+    for d in range(max_d + 1):
+        if unit_root_test(values, 'adf', **options)['pvalue'] < alpha:
+            return d
+        values = np.diff(values)
+    return max_d
@@ -0,0 +1,112 @@
+import copy
+import hashlib
+import os
+import pickle
+from collections import OrderedDict
+import numpy as np
+from statsmodels.tsa.vector_ar.var_model import VAR
+from monetary_var.tracing import span
+
+# In-memory LRU of fitted VARResults, keyed by fit_key()
+_FITS = OrderedDict()
+MAX_FITS = 32
+
+# On-disk tier shared by the pipeline's worker processes (VAR_FIT_CACHE_DIR overrides it; set it
+# empty to turn the tier off)
+DEFAULT_FIT_CACHE_DIR = os.path.join(".pipeline_cache", "fits")
+
+
+def frame_hash(data):
+    """
+    Returns a SHA-256 hex digest of a DataFrame's values, column order and index.
+    """
+    h = hashlib.sha256()
+    values = np.ascontiguousarray(data.values, dtype=float)
+    h.update(str(values.shape).encode())
+    h.update(values.tobytes())
+    h.update("\0".join(map(str, data.columns)).encode())
+    h.update(np.asarray(data.index.astype(str)).astype("U").tobytes())
+    return h.hexdigest()
+
+
+def fit_key(data, lags, trend='c'):
+    """
+    Returns the cache key of a VAR fit: hash of the data, lag order and trend spec.
+    """
+    return hashlib.sha256(f"{frame_hash(data)}|{int(lags)}|{trend}".encode()).hexdigest()
+
+
+def _disk_dir(cache_dir):
+    if cache_dir is None:
+        cache_dir = os.environ.get("VAR_FIT_CACHE_DIR", DEFAULT_FIT_CACHE_DIR)
+    return cache_dir or None
+
+
+def fit_var(data, lags, trend='c', cache_dir=None):
+    """
+    Fits VAR(data) with exactly `lags` lags, reusing an earlier fit of the same data when possible.
+
+    Fits are looked up in an in-memory LRU (MAX_FITS entries) first, then in an on-disk tier
+    (pickled VARResults in cache_dir, VAR_FIT_CACHE_DIR or DEFAULT_FIT_CACHE_DIR), which stages
+    running in separate worker processes share. New fits are stored in both.
+
+    Every call returns a shallow copy of the cached fit, so setting attributes on it leaves the
+    cache unchanged; its arrays (params, sigma_u, ...) are shared with the
+    cache and must not be modified in place.
+
+    Parameters:
+    - data: pandas DataFrame with the time series variables
+    - lags: int, lag order
+    - trend: str, 'n', 'c', 'ct' or 'ctt' (default='c')
+    - cache_dir: str, optional, directory of the on-disk tier, '' for none (default: VAR_FIT_CACHE_DIR,
+      or DEFAULT_FIT_CACHE_DIR if unset)
+
+    Returns:
+    - statsmodels VARResults
+    """
+    key = fit_key(data, lags, trend)
+    if key in _FITS:
+        _FITS.move_to_end(key)
+        return _copy_fit(_FITS[key])
+
+    disk_dir = _disk_dir(cache_dir)
+    path = os.path.join(disk_dir, f"{key}.pkl") if disk_dir else None
+    results = None
+    if path and os.path.exists(path):
+        try:
+            with open(path, "rb") as f:
+                results = pickle.load(f)
+        except Exception as e:
+            print(f"Ignoring unreadable cached VAR fit {path}: {e}")
+    if results is None:
+        with span("fit_var", lags=lags, nobs=len(data)):
+            results = VAR(data).fit(maxlags=lags, trend=trend)
+        if path:
+            os.makedirs(disk_dir, exist_ok=True)
+            with open(path + ".tmp", "wb") as f:
+                pickle.dump(results, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(path + ".tmp", path)
+
+    _FITS[key] = results
+    if len(_FITS) > MAX_FITS:
+        _FITS.popitem(last=False)
+    return _copy_fit(results)
+
+
+def _copy_fit(results):
+    # The wrapper and the results it wraps, which hold the attributes
+    copied = copy.copy(results)
+    copied._results = copy.copy(results._results)
+    return copied
+
+
+def clear_fit_cache(cache_dir=None):
+    """
+    Empties the in-memory LRU and, if a disk tier is configured, deletes its pickled fits.
+    """
+    _FITS.clear()
+    disk_dir = _disk_dir(cache_dir)
+    if disk_dir and os.path.isdir(disk_dir):
+        for name in os.listdir(disk_dir):
+            if name.endswith(".pkl"):
+                os.remove(os.path.join(disk_dir, name))
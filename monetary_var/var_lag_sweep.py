@@ -0,0 +1,147 @@
+import numpy as np
+import pandas as pd
+from monetary_var.var_cache import frame_hash
+from monetary_var.tracing import traced
+
+TRENDS = {'n': 0, 'c': 1, 'ct': 2}
+
+# Recent sweep tables, so repeated sweeps of the same data in a process are computed once
+_SWEEP_CACHE = {}
+_SWEEP_CACHE_SIZE = 16
+
+
+def lag_design(values, maxlags, trend='c', full_rank=True):
+    """
+    Builds the max-lag VAR design matrix on the common sample (the first maxlags rows are
+    used only as lags), with the same column order statsmodels uses: deterministic terms
+    first, then one block of k columns per lag, L1 block first.
+
+    Parameters:
+    - values: NumPy array with shape (nobs, k)
+    - maxlags: int, largest lag order
+    - trend: str, 'n' (none), 'c' (constant) or 'ct' (constant and linear trend) (default='c')
+    - full_rank: bool, require more observations than regressors, as least squares does
+      (penalized fits can do without) (default=True)
+
+    Returns:
+    - (Z, Y): design matrix with shape (nobs - maxlags, ntrend + k * maxlags) and targets
+      with shape (nobs - maxlags, k). The first ntrend + k * p columns of Z are the design
+      of the lag p model.
+    """
+    if trend not in TRENDS:
+        raise ValueError("Invalid trend. Use 'n', 'c' or 'ct'.")
+    values = np.asarray(values, dtype=float)
+    nobs, k = values.shape
+    T = nobs - maxlags
+    if T <= (TRENDS[trend] + k * maxlags if full_rank else 0):
+        raise ValueError("maxlags is too large for the number of observations.")
+    columns = []
+    if trend in ('c', 'ct'):
+        columns.append(np.ones((T, 1)))
+    if trend == 'ct':
+        columns.append(np.arange(maxlags + 1, nobs + 1, dtype=float)[:, None])
+    for lag in range(1, maxlags + 1):
+        columns.append(values[maxlags - lag:nobs - lag])
+    Z = np.hstack(columns) if columns else np.empty((T, 0))
+    return Z, values[maxlags:]
+
+
+def _copy_sweep(sweep):
+    """
+    Copy of a sweep table, nested sigma_u and resid_corr frames included, so callers cannot alter the cache.
+    """
+    sweep = sweep.copy()
+    for column in ('sigma_u', 'resid_corr'):
+        sweep[column] = [frame.copy() for frame in sweep[column]]
+    return sweep
+
+
+@traced("lag_sweep")
+def lag_sweep(data, maxlags=8, trend='c', min_lag=None):
+    """
+    Evaluates every VAR lag order from min_lag to maxlags in a single pass.
+
+    The max-lag design is built once on a common sample and factorised once (QR). Because
+    the design of a lag p model is a leading block of columns of the max-lag design, the
+    residual cross-product of every lag order follows from the same factorisation:
+    Y'Y minus the first ntrend + k * p rows of Q'Y. No model is refitted.
+
+    Parameters:
+    - data: pandas DataFrame with the (stationary) time series variables
+    - maxlags: int, maximum number of lags to evaluate (default=8)
+    - trend: str, 'n', 'c' or 'ct' (default='c')
+    - min_lag: int, optional, smallest lag order (default: 0, or 1 when trend='n')
+
+    Returns:
+    - DataFrame indexed by lag order with columns aic, bic, hqic, fpe, llf, nobs, and the
+      object columns sigma_u (residual covariance) and resid_corr (residual correlations),
+      each holding a k x k DataFrame. Information criteria match VAR.select_order.
+      Repeated calls with the same data and settings return a copy of the cached table.
+    """
+    names = list(data.columns)
+    key = (frame_hash(data), maxlags, trend, min_lag)
+    if key in _SWEEP_CACHE:
+        return _copy_sweep(_SWEEP_CACHE[key])
+    Z, Y = lag_design(data.values, maxlags, trend)
+    T, k = Y.shape
+    ntrend = TRENDS[trend]
+    if min_lag is None:
+        min_lag = 0 if ntrend else 1
+
+    Q, R = np.linalg.qr(Z)
+    C = Q.T @ Y
+    YY = Y.T @ Y
+
+    rows = {}
+    for p in range(min_lag, maxlags + 1):
+        m = ntrend + k * p
+        ssr = YY - C[:m].T @ C[:m]
+        sigma_mle = ssr / T
+        df_resid = T - m
+        sign, ld = np.linalg.slogdet(sigma_mle)
+        free_params = p * k ** 2 + k * ntrend
+        sigma_u = ssr / df_resid
+        sd = np.sqrt(np.diag(sigma_u))
+        rows[p] = {
+            'aic': ld + (2.0 / T) * free_params,
+            'bic': ld + (np.log(T) / T) * free_params,
+            'hqic': ld + (2.0 * np.log(np.log(T)) / T) * free_params,
+            'fpe': ((T + m) / df_resid) ** k * np.exp(ld),
+            'llf': -(T * k / 2) * np.log(2 * np.pi) - (T / 2) * ld - k * T / 2,
+            'nobs': T,
+            'sigma_u': pd.DataFrame(sigma_u, index=names, columns=names),
+            'resid_corr': pd.DataFrame(sigma_u / np.outer(sd, sd), index=names, columns=names),
+        }
+    sweep = pd.DataFrame.from_dict(rows, orient='index')
+    sweep.index.name = 'lag'
+    if len(_SWEEP_CACHE) >= _SWEEP_CACHE_SIZE:
+        _SWEEP_CACHE.pop(next(iter(_SWEEP_CACHE)))
+    _SWEEP_CACHE[key] = sweep
+    return _copy_sweep(sweep)
+
+
+def select_lag(sweep, ic='aic', min_lag=1):
+    """
+    Returns the lag order (at least min_lag) with the lowest information criterion in a sweep table.
+    """
+    if ic not in ('aic', 'bic', 'hqic', 'fpe'):
+        raise ValueError("Invalid information criterion. Use 'aic', 'bic', 'hqic' or 'fpe'.")
+    values = sweep.loc[sweep.index >= min_lag, ic]
+    if values.empty:
+        raise ValueError("No valid VAR models were fitted.")
+    return int(values.idxmin())
+
+
+def format_lag_table(sweep):
+    """
+    Formats the information criteria of a sweep table as text, marking the minimum of each
+    criterion with '*' (the layout of VAR.select_order(...).summary()).
+    """
+    ics = ['aic', 'bic', 'fpe', 'hqic']
+    best = {ic: sweep[ic].idxmin() for ic in ics}
+    lines = [f"VAR Order Selection (* highlights the minimums), nobs = {sweep['nobs'].iloc[0]}",
+             f"{'lag':>5}" + "".join(f"{ic.upper():>14}" for ic in ics)]
+    for lag, row in sweep.iterrows():
+        cells = "".join(f"{row[ic]:>13.4g}{'*' if lag == best[ic] else ' '}" for ic in ics)
+        lines.append(f"{lag:>5}" + cells)
+    return "\n".join(lines) + "\n"
@@ -1,4 +1,4 @@
 #!/bin/bash
 
-# Run the main script to execute the entire pipeline in memory
-python scripts/main.py
\ No newline at end of file
+# Run the entire pipeline (stages are cached in .pipeline_cache/) and print the key findings
+python -m monetary_var report "$@"
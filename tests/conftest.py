@@ -0,0 +1,10 @@
+import pytest
+from monetary_var.benchmark import simulate_var
+
+
+@pytest.fixture(scope="session")
+def var_data():
+    """
+    A stable simulated VAR(2) with the column names of the model variables, 240 quarters.
+    """
+    return simulate_var(240, neqs=3, lags=2, seed=3)
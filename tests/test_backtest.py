@@ -0,0 +1,23 @@
+import numpy as np
+import pytest
+from statsmodels.tsa.api import VAR
+from monetary_var.backtest import backtest
+
+
+@pytest.mark.parametrize("window", [None, 60])
+def test_forecasts_match_refits(var_data, window):
+    # refit_every=10: most origins use recursive updates, a few are full refits
+    forecasts, actuals, origins = backtest(var_data, lags=2, steps=4, min_train=60, window=window, refit_every=10)
+    for i in (0, 1, 7, 10, 23, len(origins) - 1):
+        end = var_data.index.get_loc(origins[i]) + 1
+        train = var_data.iloc[:end] if window is None else var_data.iloc[end - window:end]
+        results = VAR(train).fit(2)
+        expected = results.forecast(train.values[-2:], 4)
+        np.testing.assert_allclose(forecasts[i], expected, rtol=1e-9, atol=1e-10)
+        np.testing.assert_allclose(actuals[i], var_data.values[end:end + 4])
+
+
+def test_parallel_matches_serial(var_data):
+    serial = backtest(var_data, lags=2, steps=4, min_train=60)
+    parallel = backtest(var_data, lags=2, steps=4, min_train=60, n_jobs=2)
+    np.testing.assert_allclose(parallel[0], serial[0], rtol=1e-12)
@@ -0,0 +1,37 @@
+import numpy as np
+from statsmodels.tsa.api import VAR
+from monetary_var.bayesian_var import (DEFAULT_LAMBDAS, bayesian_var, cross_products, log_marginal_likelihood,
+                                       minnesota_prior)
+
+
+def test_loose_prior_is_least_squares(var_data):
+    results = bayesian_var(var_data, 2, lam=1e6, const_var=1e12)
+    expected = VAR(var_data).fit(2)
+    np.testing.assert_allclose(results.params.values, expected.params.values, rtol=1e-6, atol=1e-8)
+    # Sn is the prior scale plus the residual cross-products, which OLS divides by its degrees of freedom
+    cp = cross_products(var_data, 2)
+    S0 = minnesota_prior(cp['sigma'], 2, 1, 1e6)[2]
+    np.testing.assert_allclose((results.Sn - S0) / expected.df_resid, expected.sigma_u, rtol=1e-6)
+    np.testing.assert_allclose(results.forecast(var_data.values[-2:], 4),
+                               expected.forecast(var_data.values[-2:], 4), rtol=1e-6, atol=1e-8)
+
+
+def test_posterior_draws_average_to_the_posterior_mean(var_data):
+    results = bayesian_var(var_data, 2)
+    n = 40000
+    B, S, R = results.posterior_draws(n, seed=0)
+    # Within five Monte Carlo standard errors
+    np.testing.assert_array_less(np.abs(B.mean(axis=0) - results.params.values),
+                                 5 * results.stderr.values / np.sqrt(n))
+    np.testing.assert_allclose(S.mean(axis=0), results.sigma_u.values, rtol=0.02, atol=1e-3)
+    np.testing.assert_allclose(R @ R.transpose(0, 2, 1), S)
+
+
+def test_marginal_likelihood_peaks_inside_the_grid(var_data):
+    grid = log_marginal_likelihood(cross_products(var_data, 2), 2)
+    assert np.isfinite(grid).all()
+    best = int(np.argmax(grid.values))
+    assert 0 < best < len(DEFAULT_LAMBDAS) - 1
+    results = bayesian_var(var_data, 2)
+    assert results.lam == grid.index[best]
+    np.testing.assert_allclose(results.log_ml, grid.max())
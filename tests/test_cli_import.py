@@ -0,0 +1,29 @@
+import json
+import subprocess
+import sys
+import time
+
+# The CLI answers --help and `show` without the scientific stack: only the subcommands that run
+# stages import pandas, numpy, statsmodels or matplotlib.
+
+HEAVY = ('pandas', 'numpy', 'scipy', 'statsmodels', 'matplotlib')
+
+# Wall-clock budget of `python -m monetary_var --help`, interpreter startup included
+HELP_BUDGET = 0.5
+
+
+def test_cli_import_is_lightweight():
+    code = ("import json, sys; import monetary_var.cli; "
+            f"print(json.dumps([m for m in {HEAVY!r} if m in sys.modules]))")
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert json.loads(out.stdout) == []
+
+
+def test_help_within_budget():
+    # Best of a few runs, so a busy machine does not fail the test on one slow start
+    times = []
+    for _ in range(3):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, "-m", "monetary_var", "--help"], capture_output=True, check=True)
+        times.append(time.perf_counter() - started)
+    assert min(times) < HELP_BUDGET
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+from statsmodels.tsa.api import VAR
+from monetary_var.conditional_forecast import conditional_forecast, scenario_map
+from monetary_var.impulse_response import impulse_responses
+
+
+@pytest.fixture(scope="module")
+def results(var_data):
+    return VAR(var_data).fit(2)
+
+
+@pytest.fixture(scope="module")
+def y(var_data):
+    return var_data.values[-2:]
+
+
+def test_variable_follows_its_path(results, y):
+    rng = np.random.default_rng(0)
+    paths = rng.normal(0.0, 1.0, (5, 8))
+    forecasts = conditional_forecast(results, y, paths, 'dfedrate', steps=8)
+    assert forecasts.shape == (5, 8, 3)
+    np.testing.assert_allclose(forecasts[:, :, 1], paths, atol=1e-10)
+    # A path over the first quarters only fixes those quarters
+    partial = conditional_forecast(results, y, paths[:, :3], 'dfedrate', steps=8)
+    np.testing.assert_allclose(partial[:, :3, 1], paths[:, :3], atol=1e-10)
+    single = conditional_forecast(results, y, paths[2], 'dfedrate', steps=8)
+    np.testing.assert_allclose(single, forecasts[2], atol=1e-12)
+
+
+def test_unconditional_path_returns_unconditional_forecast(results, y):
+    unconditional = results.forecast(y, 8)
+    for shocks in (None, ['dfedrate']):
+        forecast = conditional_forecast(results, y, unconditional[:, 1], 'dfedrate', steps=8, shocks=shocks)
+        np.testing.assert_allclose(forecast, unconditional, atol=1e-10)
+
+
+def test_policy_shock_on_impact(results, y):
+    # One quarter fixed by the dfedrate shock alone: the revisions are its orthogonalized
+    # responses, scaled to the deviation on impact
+    unconditional = results.forecast(y, 6)
+    forecast = conditional_forecast(results, y, [unconditional[0, 1] + 0.5], 'dfedrate', steps=6, shocks=['dfedrate'])
+    orth = impulse_responses(results, 5, 'orth')[:, :, 1]
+    np.testing.assert_allclose(forecast - unconditional, orth * 0.5 / orth[0, 1], atol=1e-10)
+
+
+def test_rank_deficient_shocks_raise(results):
+    # inflat is ordered after dfedrate, so its shock cannot move dfedrate on impact
+    with pytest.raises(ValueError):
+        scenario_map(results, 8, 'dfedrate', shocks=['inflat'])
+    with pytest.raises(ValueError):
+        scenario_map(results, 8, 'dfedrate', conditioned=9)
+    K = scenario_map(results, 8, 'dfedrate', shocks=['dfedrate'])
+    assert K.shape == (8 * 3, 8)
@@ -0,0 +1,26 @@
+import numpy as np
+import pytest
+from statsmodels.tsa.stattools import acf, ccf, pacf
+from monetary_var.correlogram import correlogram
+
+
+# acf warns that its tuple return will become a result object
+@pytest.mark.filterwarnings("ignore::FutureWarning")
+def test_matches_statsmodels(var_data):
+    result = correlogram(var_data, nlags=12, cross=True)
+    for j, name in enumerate(var_data.columns):
+        values, confint = acf(var_data[name], nlags=12, alpha=0.05)
+        np.testing.assert_allclose(result['acf'][:, j], values, atol=1e-12)
+        np.testing.assert_allclose(result['acf_bound'][:, j], confint[:, 1] - values, atol=1e-12)
+        np.testing.assert_allclose(result['pacf'][:, j], pacf(var_data[name], nlags=12, method='ywm'), atol=1e-12)
+        for i, other in enumerate(var_data.columns):
+            # [h, i, j]: column i at t + h against column j at t
+            expected = ccf(var_data[other], var_data[name], adjusted=False)[:13]
+            np.testing.assert_allclose(result['ccf'][:, i, j], expected, atol=1e-12)
+
+
+def test_rejects_missing_values(var_data):
+    data = var_data.copy()
+    data.iloc[5, 0] = np.nan
+    with pytest.raises(ValueError):
+        correlogram(data)
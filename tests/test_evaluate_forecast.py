@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+from scipy import stats
+from monetary_var.evaluate_forecast import DieboldMariano, ForecastMetrics, calculate_forecast_metrics
+
+COLUMNS = ['a', 'b']
+STEPS = 4
+
+
+def _forecasts(n=301, seed=0):
+    rng = np.random.default_rng(seed)
+    actual = rng.normal(2.0, 1.0, (n, STEPS, len(COLUMNS)))
+    # MA(h - 1) dependence across origins, as in overlapping h-step errors
+    shocks = rng.normal(size=(n + STEPS, STEPS, len(COLUMNS)))
+    errors = sum(shocks[j:n + j] for j in range(STEPS))
+    return actual + 0.5 * errors, actual + 0.6 * rng.normal(size=actual.shape), actual
+
+
+def test_chunked_metrics_match_whole_sample():
+    forecast, _, actual = _forecasts()
+    whole = ForecastMetrics(COLUMNS, STEPS).update(forecast, actual).by_horizon()
+    chunked = ForecastMetrics(COLUMNS, STEPS)
+    for i in range(0, len(forecast), 37):
+        chunked.update(forecast[i:i + 37], actual[i:i + 37])
+    np.testing.assert_allclose(chunked.by_horizon().values, whole.values, rtol=1e-12)
+
+    errors = forecast - actual
+    for j, col in enumerate(COLUMNS):
+        for h in range(STEPS):
+            e = errors[:, h, j]
+            row = whole.loc[(col, h + 1)]
+            np.testing.assert_allclose(row['ME'], e.mean(), rtol=1e-12)
+            np.testing.assert_allclose(row['MAE'], np.abs(e).mean(), rtol=1e-12)
+            np.testing.assert_allclose(row['MAPE'], np.abs(e / actual[:, h, j]).mean() * 100, rtol=1e-12)
+            np.testing.assert_allclose(row['RMSE'], np.sqrt((e ** 2).mean()), rtol=1e-12)
+            assert row['count'] == len(e)
+    pooled = calculate_forecast_metrics(forecast, actual, COLUMNS)
+    np.testing.assert_allclose(pooled['b']['RMSE'], np.sqrt((errors[:, :, 1] ** 2).mean()), rtol=1e-12)
+
+
+def test_metrics_skip_missing_pairs():
+    forecast, _, actual = _forecasts(n=50)
+    forecast[3, 1, 0] = np.nan
+    table = ForecastMetrics(COLUMNS, STEPS).update(forecast, actual).by_horizon()
+    assert table.loc[('a', 2), 'count'] == 49
+    e = np.delete(forecast[:, 1, 0] - actual[:, 1, 0], 3)
+    np.testing.assert_allclose(table.loc[('a', 2), 'MAE'], np.abs(e).mean(), rtol=1e-12)
+
+
+def _reference_dm(d, h):
+    """Textbook DM test with the HLN correction for one h-step loss differential series."""
+    n = len(d)
+    mean = d.mean()
+    centred = d - mean
+    gammas = [centred[j:] @ centred[:n - j] / n for j in range(h)]
+    variance = gammas[0] + 2 * sum(gammas[1:])
+    statistic = mean / np.sqrt(variance / n) * np.sqrt((n + 1 - 2 * h + h * (h - 1) / n) / n)
+    return mean, statistic, 2 * stats.t.sf(abs(statistic), df=n - 1)
+
+
+@pytest.mark.parametrize('loss', ['squared', 'absolute'])
+def test_diebold_mariano_matches_reference(loss):
+    forecast_a, forecast_b, actual = _forecasts()
+    whole = DieboldMariano(COLUMNS, STEPS, loss).update(forecast_a, forecast_b, actual).result()
+    # Batches shorter than the lag window exercise the retained head and tail of d
+    chunked = DieboldMariano(COLUMNS, STEPS, loss)
+    for size in (1, 2, 5, 40, 253):
+        start = int(chunked.n)
+        chunked.update(forecast_a[start:start + size], forecast_b[start:start + size], actual[start:start + size])
+    assert chunked.n == len(actual)
+    np.testing.assert_allclose(chunked.result().values, whole.values, rtol=1e-10)
+
+    errors_a, errors_b = forecast_a - actual, forecast_b - actual
+    if loss == 'squared':
+        d = errors_a ** 2 - errors_b ** 2
+    else:
+        d = np.abs(errors_a) - np.abs(errors_b)
+    for j, col in enumerate(COLUMNS):
+        for h in range(1, STEPS + 1):
+            mean, statistic, pvalue = _reference_dm(d[:, h - 1, j], h)
+            row = whole.loc[(col, h)]
+            np.testing.assert_allclose(row['mean_loss_diff'], mean, rtol=1e-12)
+            np.testing.assert_allclose(row['statistic'], statistic, rtol=1e-9)
+            np.testing.assert_allclose(row['pvalue'], pvalue, rtol=1e-9)
@@ -0,0 +1,63 @@
+import http.client
+import pytest
+from monetary_var import fred_fetch
+from monetary_var.fred_fetch import fetch_fred_csv, fetch_quarterly
+from monetary_var.fred_server import start_server, synthetic_series
+
+SERIES = ['UNRATE', 'FEDFUNDS', 'FLEXCPIM679SFRBATL', 'SERIES3', 'SERIES4']
+START, END = "1970-01-01", "2019-12-31"
+
+
+@pytest.fixture
+def server():
+    server, base_url = start_server()
+    yield server, base_url
+    server.shutdown()
+
+
+def test_concurrent_fetch_matches_serial(server, tmp_path):
+    _, base_url = server
+    serial = fetch_quarterly(SERIES, START, END, max_workers=1, base_url=base_url,
+                             cache_dir=str(tmp_path / "serial"), offline=False)
+    concurrent = fetch_quarterly(SERIES, START, END, max_workers=4, base_url=base_url,
+                                 cache_dir=str(tmp_path / "concurrent"), offline=False)
+    assert list(concurrent) == SERIES
+    for series_id in SERIES:
+        assert concurrent[series_id].equals(serial[series_id])
+        # Last value of every quarter of the monthly series
+        expected = synthetic_series(series_id).loc[START:END].resample('3ME').last()
+        assert concurrent[series_id][series_id].tolist() == expected.tolist()
+        assert (concurrent[series_id].index == expected.index).all()
+
+
+def test_retries_recover_from_failures(server):
+    srv, base_url = server
+    srv.fail_every = 2
+    # Every second request answers 503: each series needs at most one retry
+    for series_id in SERIES[:3]:
+        frame = fetch_fred_csv(series_id, START, END, base_url=base_url, backoff=0.001)
+        assert len(frame) == len(synthetic_series(series_id).loc[START:END])
+    assert srv.requests > 3
+
+
+def test_persistent_failure_raises(server):
+    srv, base_url = server
+    srv.fail_every = 1
+    with pytest.raises(RuntimeError, match="after 3 attempts"):
+        fetch_fred_csv('UNRATE', START, END, base_url=base_url, retries=2, backoff=0.001)
+    assert srv.requests == 3
+
+
+def test_worker_connections_are_closed(server, tmp_path, monkeypatch):
+    _, base_url = server
+    opened = []
+
+    class Tracked(http.client.HTTPConnection):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            opened.append(self)
+
+    monkeypatch.setattr(fred_fetch.http.client, 'HTTPConnection', Tracked)
+    fetch_quarterly(SERIES, START, END, max_workers=3, base_url=base_url, cache_dir=str(tmp_path), offline=False)
+    assert 0 < len(opened) <= 3
+    assert all(conn.sock is None for conn in opened)
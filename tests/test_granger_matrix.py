@@ -0,0 +1,45 @@
+import numpy as np
+from statsmodels.tsa.api import VAR
+from statsmodels.tsa.stattools import grangercausalitytests
+from monetary_var.granger_matrix import pairwise_granger, var_granger_block, var_granger_matrix
+
+
+def test_pairwise_matches_grangercausalitytests(var_data):
+    out = pairwise_granger(var_data, maxlag=3)
+    names = out['names']
+    for i, cause in enumerate(names):
+        for j, effect in enumerate(names):
+            if i == j:
+                assert np.isnan(out['F'][:, i, j]).all()
+                continue
+            expected = grangercausalitytests(var_data[[effect, cause]], maxlag=3)
+            for lag in range(1, 4):
+                tests = expected[lag][0]
+                np.testing.assert_allclose(out['F'][lag - 1, i, j], tests['ssr_ftest'][0], rtol=1e-9)
+                np.testing.assert_allclose(out['F_pvalue'][lag - 1, i, j], tests['ssr_ftest'][1], rtol=1e-8)
+                np.testing.assert_allclose(out['chi2'][lag - 1, i, j], tests['ssr_chi2test'][0], rtol=1e-9)
+                np.testing.assert_allclose(out['lr'][lag - 1, i, j], tests['lrtest'][0], rtol=1e-8)
+
+
+def test_var_matrix_matches_test_causality(var_data):
+    out = var_granger_matrix(var_data, maxlag=3)
+    names = out['names']
+    for lag in range(1, 4):
+        results = VAR(var_data).fit(lag)
+        for i, cause in enumerate(names):
+            for j, effect in enumerate(names):
+                if i == j:
+                    continue
+                expected = results.test_causality(effect, [cause], kind='f')
+                np.testing.assert_allclose(out['F'][lag - 1, i, j], expected.test_statistic, rtol=1e-9)
+                np.testing.assert_allclose(out['F_pvalue'][lag - 1, i, j], expected.pvalue, rtol=1e-8)
+                wald = results.test_causality(effect, [cause], kind='wald')
+                np.testing.assert_allclose(out['wald'][lag - 1, i, j], wald.test_statistic, rtol=1e-9)
+
+
+def test_block_matches_test_causality(var_data):
+    names = list(var_data.columns)
+    out = var_granger_block(var_data, names[:2], names[2:], lags=2)
+    expected = VAR(var_data).fit(2).test_causality(names[2:], names[:2], kind='f')
+    np.testing.assert_allclose(out['F'], expected.test_statistic, rtol=1e-9)
+    np.testing.assert_allclose(out['F_pvalue'], expected.pvalue, rtol=1e-8)
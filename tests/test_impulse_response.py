@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+from statsmodels.tsa.api import VAR
+from monetary_var.impulse_response import BLOCK, fevd, impulse_responses, response_bands
+
+
+@pytest.fixture(scope="module")
+def results(var_data):
+    return VAR(var_data).fit(2)
+
+
+def test_responses_match_statsmodels(results):
+    irf = results.irf(12)
+    np.testing.assert_allclose(impulse_responses(results, 12, 'simple'), irf.irfs, rtol=1e-10, atol=1e-14)
+    np.testing.assert_allclose(impulse_responses(results, 12, 'orth'), irf.orth_irfs, rtol=1e-10, atol=1e-14)
+    np.testing.assert_allclose(impulse_responses(results, 12, 'cumulative'), irf.orth_cum_effects,
+                               rtol=1e-10, atol=1e-14)
+
+
+def test_generalized_responses(results):
+    # Pesaran-Shin: the response to shock j is Phi_h Sigma e_j / sqrt(sigma_jj); for the first
+    # variable in the ordering it equals the orthogonalized response
+    generalized = impulse_responses(results, 12, 'generalized')
+    np.testing.assert_allclose(generalized[:, :, 0], impulse_responses(results, 12, 'orth')[:, :, 0], rtol=1e-10)
+
+
+def test_fevd_matches_statsmodels(results):
+    ours = fevd(results, 10)
+    expected = results.fevd(10).decomp  # [variable, h, shock]
+    np.testing.assert_allclose(ours, expected.transpose(1, 0, 2), rtol=1e-10)
+    np.testing.assert_allclose(ours.sum(axis=2), 1)
+
+
+def test_bands_do_not_depend_on_workers(results):
+    # More than two blocks, so the n_jobs=2 call maps blocks over the process pool
+    reps = 2 * BLOCK + 100
+    serial = response_bands(results, 8, kinds=('orth', 'fevd'), reps=reps, seed=1)
+    parallel = response_bands(results, 8, kinds=('orth', 'fevd'), reps=reps, seed=1, n_jobs=2)
+    for kind, (lower, upper) in serial.items():
+        np.testing.assert_array_equal(parallel[kind][0], lower)
+        np.testing.assert_array_equal(parallel[kind][1], upper)
+        assert (lower <= upper).all()
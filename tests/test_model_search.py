@@ -0,0 +1,101 @@
+import numpy as np
+import pandas as pd
+import pytest
+from statsmodels.tsa.api import VAR
+from monetary_var import model_search as search
+from monetary_var.benchmark import simulate_var
+from monetary_var.model_search import (TARGETS, TRANSFORM_SETS, VARIABLE_SETS, _datasets, _score_dataset,
+                                       candidate_grid, model_search)
+
+
+@pytest.fixture(scope="module")
+def levels():
+    """
+    Levels with the columns of the feature-engineered data, integrated from a simulated VAR.
+    """
+    x = simulate_var(160, neqs=3, lags=2, seed=7)
+    return pd.DataFrame({'UNRATE': 6 * np.cumprod(1 + x['unempgr'].values / 100),
+                         'fedrate': 4 + np.cumsum(0.3 * x['dfedrate'].values),
+                         'inflat': x['inflat'].values + 2}, index=x.index)
+
+
+def _refit_sse(values, level_values, transforms, roles, lags, trend, origin, steps, maxlag):
+    # One statsmodels fit on the rows before the origin, with the same first target row
+    fit = VAR(values[maxlag - lags:origin]).fit(lags, trend=trend)
+    forecast = fit.forecast(values[origin - lags:origin], steps)
+    sse = []
+    for t, role in enumerate(TARGETS):
+        j = roles.index(role)
+        transform = transforms[role]
+        predicted = forecast[:, j] if transform is None else transform.inverse(forecast[:, j], level_values[:origin, t])
+        sse.append(((predicted - level_values[origin:origin + steps, t]) ** 2).sum())
+    return np.array(sse)
+
+
+@pytest.mark.parametrize('transforms', ['pipeline', 'all_differenced'])
+def test_batched_scores_match_refits(levels, transforms):
+    candidates = [(1, 'n'), (2, 'c'), (3, 'ct'), (4, 'ct')]
+    maxlag, steps = 4, 6
+    data, common = _datasets(levels, [{'variables': 'full', 'transforms': transforms}])
+    values = data[('full', transforms)].values
+    level_values = common[list(TARGETS)].values
+    roles = list(VARIABLE_SETS['full'])
+    origins = [60, 61, 97, len(values) - steps]
+    batched = _score_dataset(values, level_values, TRANSFORM_SETS[transforms], roles, candidates, origins,
+                             steps, maxlag)
+    for c, (lags, trend) in enumerate(candidates):
+        expected = sum(_refit_sse(values, level_values, TRANSFORM_SETS[transforms], roles, lags, trend, o,
+                                  steps, maxlag) for o in origins)
+        np.testing.assert_allclose(batched[c], expected, rtol=1e-8)
+
+
+def test_leaderboard_reuse_skips_scored_candidates(levels, tmp_path, monkeypatch):
+    path = str(tmp_path / "leaderboard.csv")
+    settings = dict(steps=4, min_train=60, rounds=3, margin=None, path=path)
+    first = model_search(levels, candidate_grid(lags=[1, 2], trends=['c']), **settings)
+
+    scored = []
+    score = search._score_dataset
+
+    def counting(values, levels, transforms, roles, candidates, *args):
+        scored.extend(candidates)
+        return score(values, levels, transforms, roles, candidates, *args)
+
+    monkeypatch.setattr(search, '_score_dataset', counting)
+    again = model_search(levels, candidate_grid(lags=[1, 2], trends=['c']), **settings)
+    assert scored == []
+    pd.testing.assert_frame_equal(again, first)
+
+    # Only the new trend is evaluated; the earlier rows are kept
+    extended = model_search(levels, candidate_grid(lags=[1, 2], trends=['c', 'ct']), **settings)
+    assert set(scored) == {(1, 'ct'), (2, 'ct')}
+    assert len(extended) == 2 * len(first)
+    merged = extended.set_index('candidate')['score']
+    np.testing.assert_allclose(merged[first['candidate']].values, first['score'].values)
+
+    # Different settings (here a larger maxlag, so a shorter common sample) are scored from scratch
+    scored.clear()
+    model_search(levels, candidate_grid(lags=[1, 3], trends=['c']), **settings)
+    assert set(scored) == {(1, 'c'), (3, 'c')}
+
+
+def test_early_stopping_keeps_the_best(levels):
+    candidates = candidate_grid(lags=[1, 2, 4], trends=['c', 'ct'])
+    settings = dict(steps=4, min_train=60, rounds=4, min_rounds=2, path=None)
+    full = model_search(levels, candidates, margin=None, **settings).set_index('candidate')
+    pruned = model_search(levels, candidates, margin=0.0, **settings)
+    assert not full['stopped'].any()
+    # With no margin everything but the leader after min_rounds is stopped
+    assert pruned['stopped'].sum() == len(candidates) - 1
+    leader = pruned.iloc[0]
+    assert not leader['stopped'] and leader['origins'] == full.loc[leader['candidate'], 'origins']
+    np.testing.assert_allclose(leader['score'], full.loc[leader['candidate'], 'score'], rtol=1e-12)
+    assert (pruned.loc[pruned['stopped'], 'origins'] < leader['origins']).all()
+
+    # A generous margin stops only candidates far behind, never the overall best
+    relaxed = model_search(levels, candidates, margin=0.25, **settings).set_index('candidate')
+    best = full['score'].idxmin()
+    assert not relaxed.loc[best, 'stopped']
+    kept = relaxed.index[~relaxed['stopped']]
+    np.testing.assert_allclose(relaxed.loc[kept, 'score'], full.loc[kept, 'score'], rtol=1e-12)
+    assert (full.loc[relaxed.index[relaxed['stopped']], 'score'] > full['score'].min()).all()
@@ -0,0 +1,66 @@
+import os
+from monetary_var import plotting, results_store
+from monetary_var.pipeline import Stage, run_pipeline
+
+
+def produce(value):
+    return value * 2
+
+
+def write_summary(doubled, path):
+    with open(path, "w") as f:
+        f.write(str(doubled))
+    plotting.emit_plot({'kind': 'line', 'path': path + ".png"})
+
+
+def save_metric(doubled):
+    results_store.record('save_metric', metrics=[('check', '', 'doubled', doubled)])
+
+
+def _statuses(stages, cache, capsys):
+    capsys.readouterr()
+    run_pipeline(stages, cache_dir=cache, executor='serial')
+    # "[    ran] name (0.001s)" or "[skipped] name"
+    return {line[10:].split(" ")[0]: line[1:8].strip() for line in capsys.readouterr().out.splitlines()}
+
+
+def test_missing_output_files_rerun_the_stage(tmp_path, monkeypatch, capsys):
+    monkeypatch.delenv("VAR_NO_PLOTS", raising=False)
+    # Plot specs are recorded but not rendered; the stage's own file stands in for the plot
+    rendered = []
+    monkeypatch.setattr(plotting, 'submit_plot', lambda spec: rendered.append(spec['path']) or
+                        open(spec['path'], "w").close())
+    summary = str(tmp_path / "summary.txt")
+    stages = [Stage('produce', produce, outputs=['doubled'], kwargs={'value': 21}),
+              Stage('summary', write_summary, inputs=['doubled'], kwargs={'path': summary}, files=[summary])]
+    cache = str(tmp_path / "cache")
+
+    assert _statuses(stages, cache, capsys) == {'produce': 'ran', 'summary': 'ran'}
+    assert _statuses(stages, cache, capsys) == {'produce': 'skipped', 'summary': 'skipped'}
+    os.remove(summary)
+    assert _statuses(stages, cache, capsys) == {'produce': 'skipped', 'summary': 'ran'}
+    assert open(summary).read() == "42"
+    os.remove(summary + ".png")
+    assert _statuses(stages, cache, capsys) == {'produce': 'skipped', 'summary': 'ran'}
+    assert rendered == [summary + ".png"] * 3
+
+
+def test_lost_results_rerun_the_stage(tmp_path, monkeypatch, capsys):
+    db = str(tmp_path / "results.db")
+    monkeypatch.setenv("VAR_RESULTS_DB", db)
+    monkeypatch.setenv("VAR_RUN_ID", "")
+    stages = [Stage('produce', produce, outputs=['doubled'], kwargs={'value': 21}),
+              Stage('save_metric', save_metric, inputs=['doubled'], records=True)]
+    cache = str(tmp_path / "cache")
+
+    results_store.start_run()
+    assert _statuses(stages, cache, capsys) == {'produce': 'ran', 'save_metric': 'ran'}
+    results_store.start_run()
+    assert _statuses(stages, cache, capsys) == {'produce': 'skipped', 'save_metric': 'skipped'}
+    os.remove(db)
+    results_store.start_run()
+    assert _statuses(stages, cache, capsys) == {'produce': 'skipped', 'save_metric': 'ran'}
+    assert results_store.fetch('metrics', 'save_metric')[0]['value'] == 42
+    # Runs under another label (another batch dataset) do not see the results of this one
+    results_store.start_run('other')
+    assert _statuses(stages, cache, capsys) == {'produce': 'skipped', 'save_metric': 'ran'}
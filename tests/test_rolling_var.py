@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+from statsmodels.tsa.api import VAR
+from monetary_var.benchmark import simulate_var
+from monetary_var.rolling_var import rolling_granger, rolling_var
+
+
+@pytest.mark.parametrize("trend", ['n', 'c', 'ct'])
+def test_windows_match_statsmodels(var_data, trend):
+    fits = rolling_var(var_data, window=80, lags=3, trend=trend)
+    for s in (0, 50, len(var_data) - 80):
+        expected = VAR(var_data.iloc[s:s + 80]).fit(3, trend=trend)
+        np.testing.assert_allclose(fits['coefs'][s], expected.params.values, rtol=1e-8, atol=1e-10)
+        np.testing.assert_allclose(fits['sigma_u'][s], expected.sigma_u.values, rtol=1e-8)
+        assert fits['ends'][s] == var_data.index[s + 79]
+
+
+def test_granger_matches_test_causality(var_data):
+    out = rolling_granger(var_data, window=80, maxlag=2, trend='ct')
+    names = out['names']
+    results = VAR(var_data.iloc[100:180]).fit(2, trend='ct')
+    for i, cause in enumerate(names):
+        for j, effect in enumerate(names):
+            if i != j:
+                expected = results.test_causality(effect, [cause], kind='f')
+                np.testing.assert_allclose(out['F'][100, 1, i, j], expected.test_statistic, rtol=1e-8)
+
+
+@pytest.mark.parametrize("trend", ['c', 'ct'])
+def test_long_sample_windows_match_statsmodels(trend):
+    # Away from zero and far into a long sample, where one running sum over the whole sample
+    # cancels most of its digits in every window
+    data = simulate_var(12000, neqs=3, lags=2, seed=11) + 50
+    fits = rolling_var(data, window=40, lags=2, trend=trend)
+    for s in (0, 255, 256, 6000, len(data) - 40):
+        expected = VAR(data.iloc[s:s + 40]).fit(2, trend=trend)
+        # The normal equations lose cond(Z'Z) * eps (about 1e-8 here) whatever the window
+        np.testing.assert_allclose(fits['coefs'][s], expected.params.values, rtol=0, atol=1e-8)
+        np.testing.assert_allclose(fits['sigma_u'][s], expected.sigma_u.values, rtol=0, atol=5e-8)
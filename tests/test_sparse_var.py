@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+from statsmodels.tsa.api import VAR
+from monetary_var.sparse_var import _PenaltyPath, alpha_grid, sparse_var
+from monetary_var.var_lag_sweep import lag_design
+
+
+@pytest.mark.parametrize("penalty", ['lasso', 'group'])
+def test_no_penalty_is_least_squares(var_data, penalty):
+    results = sparse_var(var_data, 2, penalty=penalty, alpha=1e-10, tol=1e-12, max_iter=100000)
+    expected = VAR(var_data).fit(2)
+    np.testing.assert_allclose(results.params.values, expected.params.values, rtol=1e-6, atol=1e-8)
+    np.testing.assert_allclose(results.forecast(var_data.values[-2:], 4),
+                               expected.forecast(var_data.values[-2:], 4), rtol=1e-6, atol=1e-8)
+
+
+def test_group_penalty_drops_whole_lags(var_data):
+    # The data are a VAR(2): fitted with 5 lags, the group penalty should drop the extra lag matrices
+    results = sparse_var(var_data, 5, penalty='group')
+    zero = [not results.coefs[lag].any() for lag in range(5)]
+    for lag in range(5):
+        # Each lag matrix is either dropped entirely or kept entirely
+        assert zero[lag] or np.count_nonzero(results.coefs[lag]) == results.coefs[lag].size
+    assert any(zero) and not all(zero)
+    assert not zero[0]
+
+
+@pytest.mark.parametrize("penalty", ['lasso', 'group'])
+def test_warm_starts_match_cold_fits(var_data, penalty):
+    Z, Y = lag_design(var_data.values, 3, 'c', full_rank=False)
+    alphas = alpha_grid(var_data, 3, penalty, n_alphas=12)
+    # One warm-started walk down the grid against fits from zero at a few of its penalties
+    warm = _PenaltyPath(Z, Y, 1, 3, penalty, 1e-10, 100000)
+    fits = [warm.fit(alpha) for alpha in alphas]
+    for i in (1, 5, 11):
+        cold = _PenaltyPath(Z, Y, 1, 3, penalty, 1e-10, 100000).fit(alphas[i])
+        np.testing.assert_allclose(fits[i], cold, atol=1e-7)
@@ -0,0 +1,73 @@
+import itertools
+import numpy as np
+import pytest
+from statsmodels.tsa.api import VAR
+from monetary_var import structural_var
+from monetary_var.benchmark import simulate_var
+from monetary_var.structural_var import (ab_identify, ordering_bounds, recursive, sign_restrictions,
+                                         structural_responses)
+
+
+@pytest.fixture(scope="module")
+def results(var_data):
+    return VAR(var_data).fit(2)
+
+
+def test_recursive_factors_sigma(results):
+    sigma = results.sigma_u.values
+    np.testing.assert_allclose(recursive(results), np.linalg.cholesky(sigma), rtol=1e-12)
+    impact = recursive(results, order=['inflat', 'unempgr', 'dfedrate'])
+    np.testing.assert_allclose(impact @ impact.T, sigma, rtol=1e-10)
+    # inflat comes first, so only its own shock moves it on impact
+    assert impact[2, 0] == 0 and impact[2, 1] == 0
+    np.testing.assert_allclose(structural_responses(results, impact, 12)[0], impact, rtol=1e-12)
+
+
+def test_ab_default_reproduces_cholesky(results):
+    fit = ab_identify(results)
+    assert fit['converged']
+    np.testing.assert_allclose(fit['impact'], np.linalg.cholesky(results.sigma_u.values), rtol=1e-4, atol=1e-6)
+    np.testing.assert_allclose(fit['A'], np.eye(3))
+
+
+def test_ab_rejects_unidentified(results):
+    with pytest.raises(ValueError):
+        ab_identify(results, A=np.full((3, 3), np.nan))
+
+
+def test_accepted_draws_satisfy_signs(results):
+    signs = {('dfedrate', 'dfedrate'): 1, ('inflat', 'dfedrate'): 1, ('unempgr', 'dfedrate'): -1}
+    horizons = (0, 1, 4)
+    out = sign_restrictions(results, signs, horizons=horizons, draws=5000, seed=2)
+    impact = out['impact']
+    assert 0 < len(impact) < 5000
+    assert out['acceptance'] == len(impact) / 5000
+    np.testing.assert_allclose(impact @ impact.transpose(0, 2, 1),
+                               np.broadcast_to(results.sigma_u.values, impact.shape), rtol=1e-8, atol=1e-12)
+    responses = structural_responses(results, impact, max(horizons))[:, list(horizons)]
+    names = list(results.names)
+    for (response, shock), sign in signs.items():
+        assert (responses[:, :, names.index(response), names.index(shock)] * sign > 0).all()
+
+
+def test_sign_draws_do_not_depend_on_workers(results, monkeypatch):
+    monkeypatch.setattr(structural_var, 'BLOCK', 1000)
+    signs = {('dfedrate', 'dfedrate'): 1, ('inflat', 'dfedrate'): -1}
+    serial = sign_restrictions(results, signs, draws=3500, seed=4)
+    parallel = sign_restrictions(results, signs, draws=3500, seed=4, n_jobs=2)
+    np.testing.assert_array_equal(parallel['impact'], serial['impact'])
+
+
+def test_ordering_bounds_cover_all_permutations(monkeypatch):
+    # Four variables: 24 orderings, in batches of 5 so the last batch is partial
+    results = VAR(simulate_var(200, neqs=4, lags=2, seed=5)).fit(2)
+    monkeypatch.setattr(structural_var, 'BLOCK', 5)
+    lower, upper = ordering_bounds(results, horizon=8)
+    responses = np.array([structural_responses(results, recursive(results, order), 8)
+                          for order in itertools.permutations(range(4))])
+    assert len(responses) == 24
+    np.testing.assert_allclose(lower, responses.min(axis=0), rtol=1e-12, atol=1e-15)
+    np.testing.assert_allclose(upper, responses.max(axis=0), rtol=1e-12, atol=1e-15)
+    parallel = ordering_bounds(results, horizon=8, n_jobs=2)
+    np.testing.assert_array_equal(parallel[0], lower)
+    np.testing.assert_array_equal(parallel[1], upper)
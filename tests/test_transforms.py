@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+import pytest
+from monetary_var.feature_engineering import feature_transforms
+from monetary_var.invert_transformation import invert_paths
+from monetary_var.transforms import Chain, Difference, Log, PctChange
+
+TRANSFORMS = [Difference(), Difference(order=2), Difference(lag=4), Difference(order=2, lag=4),
+              PctChange(), PctChange(scale=1), Log(), Chain(Log(), Difference()),
+              Chain(Log(), Difference(lag=4), Difference())]
+
+
+def _levels(n=60, seed=0):
+    rng = np.random.default_rng(seed)
+    return 5.0 * np.exp(np.cumsum(rng.normal(0.0, 0.05, n)))
+
+
+@pytest.mark.parametrize('transform', TRANSFORMS, ids=repr)
+def test_inverse_recovers_levels(transform):
+    levels = _levels()
+    origin = 40
+    transformed = transform.transform(levels)
+    assert np.isnan(transformed[:transform.memory]).all()
+    recovered = transform.inverse(transformed[origin:], levels[:origin])
+    np.testing.assert_allclose(recovered, levels[origin:], rtol=1e-12)
+    # Without a history the levels recorded by transform() continue the series
+    future = _levels(n=12, seed=1) * levels[-1] / 5.0
+    continued = transform.transform(np.concatenate([levels, future]))[len(levels):]
+    transform.transform(levels)
+    np.testing.assert_allclose(transform.inverse(continued), future, rtol=1e-12)
+
+
+@pytest.mark.parametrize('transform', TRANSFORMS, ids=repr)
+def test_batched_paths_match_single_paths(transform):
+    levels = _levels()
+    rng = np.random.default_rng(2)
+    history = levels[:40]
+    paths = transform.transform(levels)[40:] + rng.normal(0.0, 0.01, (25, 20))
+    batched = transform.inverse(paths, history)
+    assert batched.shape == paths.shape
+    for path, expected in zip(paths, batched):
+        np.testing.assert_allclose(transform.inverse(path, history), expected, rtol=1e-12)
+        # Transforming the inverted path extends the history with the same values
+        np.testing.assert_allclose(transform.transform(np.concatenate([history, expected]))[40:], path,
+                                   rtol=1e-9, atol=1e-12)
+
+
+def test_series_keep_their_index():
+    index = pd.period_range('2000Q1', periods=60, freq='Q')
+    series = pd.Series(_levels(), index=index, name='UNRATE')
+    transform = PctChange()
+    transformed = transform.transform(series)
+    pd.testing.assert_series_equal(transformed, series.pct_change() * 100)
+    recovered = transform.inverse(transformed.iloc[40:], series.iloc[:40])
+    pd.testing.assert_series_equal(recovered, series.iloc[40:])
+
+
+def test_inverse_needs_enough_history():
+    with pytest.raises(ValueError):
+        Difference(order=2, lag=4).inverse(np.zeros(3), np.ones(7))
+
+
+def test_invert_paths_matches_the_feature_transforms():
+    index = pd.period_range('2000Q1', periods=60, freq='Q')
+    history = pd.DataFrame({'UNRATE': _levels(), 'fedrate': _levels(seed=3)}, index=index)
+    columns = ['unempgr', 'dfedrate', 'inflat']
+    rng = np.random.default_rng(4)
+    paths = rng.normal(0.0, 0.5, (30, 8, len(columns)))
+    levels = invert_paths(paths, columns, history)
+    assert sorted(levels) == ['UNRATE', 'fedrate']
+    for name, (column, transform) in feature_transforms('UNRATE').items():
+        assert levels[column].shape == (30, 8)
+        for path, expected in zip(paths[..., columns.index(name)], levels[column]):
+            np.testing.assert_allclose(transform.inverse(path, history[column].values), expected, rtol=1e-12)
+    # One forecast path gives one path of levels
+    single = invert_paths(paths[0], columns, history)
+    np.testing.assert_allclose(single['fedrate'], levels['fedrate'][0], rtol=1e-12)
+    np.testing.assert_allclose(single['fedrate'], history['fedrate'].iloc[-1] + np.cumsum(paths[0, :, 1]), rtol=1e-12)
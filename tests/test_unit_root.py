@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+from statsmodels.tsa.stattools import adfuller
+from monetary_var.unit_root import adf_test, run_unit_root_tests, unit_root_test
+
+
+@pytest.fixture(scope="module")
+def walk():
+    return np.cumsum(np.random.default_rng(7).standard_normal(250))
+
+
+# adfuller warns that its tuple return will become a result object
+@pytest.mark.filterwarnings("ignore::FutureWarning")
+@pytest.mark.parametrize("regression", ['n', 'c', 'ct'])
+@pytest.mark.parametrize("autolag", ['aic', 'bic', None])
+def test_adf_matches_adfuller(walk, var_data, regression, autolag):
+    for x in (walk, var_data['inflat'].values):
+        ours = adf_test(x, regression=regression, autolag=autolag)
+        expected = adfuller(x, regression=regression, autolag=autolag)
+        np.testing.assert_allclose(ours['stat'], expected[0], rtol=1e-9)
+        np.testing.assert_allclose(ours['pvalue'], expected[1], rtol=1e-9)
+        assert ours['usedlag'] == expected[2]
+        assert ours['nobs'] == expected[3]
+        if autolag:
+            np.testing.assert_allclose(ours['icbest'], expected[5], rtol=1e-9)
+
+
+def test_pp_matches_arch(walk):
+    unitroot = pytest.importorskip("arch.unitroot")
+    for trend in ('n', 'c', 'ct'):
+        ours = run_unit_root_tests({'walk': walk}, tests=('pp',), regression=trend)['walk']['pp']
+        expected = unitroot.PhillipsPerron(walk, trend=trend, lags=ours['usedlag'])
+        np.testing.assert_allclose(ours['stat'], expected.stat, rtol=1e-8)
+
+
+def test_cached_result_is_the_same(walk):
+    first = unit_root_test(walk, regression='ct')
+    assert unit_root_test(walk, regression='ct') == first
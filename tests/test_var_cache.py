@@ -0,0 +1,24 @@
+import numpy as np
+from statsmodels.tsa.api import VAR
+from monetary_var import var_cache
+from monetary_var.var_cache import fit_var
+
+
+def test_cached_fits_are_copies(var_data, tmp_path, monkeypatch):
+    monkeypatch.setattr(var_cache, '_FITS', type(var_cache._FITS)())
+    first = fit_var(var_data, 2, cache_dir=str(tmp_path))
+    second = fit_var(var_data, 2, cache_dir=str(tmp_path))
+    assert first is not second and first._results is not second._results
+    np.testing.assert_array_equal(second.params, VAR(var_data).fit(2).params)
+
+    # Changing one caller's fit leaves the cache and the other callers' fits alone
+    first.k_ar = 99
+    first._results.names = ['a', 'b', 'c']
+    third = fit_var(var_data, 2, cache_dir=str(tmp_path))
+    assert second.k_ar == third.k_ar == 2 and third.names == list(var_data.columns)
+    np.testing.assert_array_equal(third.forecast(var_data.values[-2:], 4), second.forecast(var_data.values[-2:], 4))
+
+    # The disk tier serves a fresh process the same fit
+    monkeypatch.setattr(var_cache, '_FITS', type(var_cache._FITS)())
+    np.testing.assert_array_equal(fit_var(var_data, 2, cache_dir=str(tmp_path)).params, second.params)
+    assert len(list(tmp_path.glob("*.pkl"))) == 1
@@ -0,0 +1,21 @@
+import numpy as np
+import pytest
+from statsmodels.tsa.api import VAR
+from monetary_var.var_lag_sweep import lag_sweep, select_lag
+
+
+@pytest.mark.parametrize("trend", ['n', 'c', 'ct'])
+def test_information_criteria_match_select_order(var_data, trend):
+    sweep = lag_sweep(var_data, maxlags=6, trend=trend)
+    expected = VAR(var_data).select_order(6, trend=trend)
+    for ic in ('aic', 'bic', 'hqic', 'fpe'):
+        # statsmodels lists every order from 0 (from 1 without a constant)
+        np.testing.assert_allclose(sweep[ic].values, expected.ics[ic], rtol=1e-10)
+        assert select_lag(sweep, ic=ic) == expected.selected_orders[ic]
+
+
+def test_sigma_u_matches_fit(var_data):
+    sweep = lag_sweep(var_data, maxlags=4)
+    # A lag 2 fit on the common sample of the sweep (the first 4 rows only serve as lags)
+    results = VAR(var_data.iloc[2:]).fit(2)
+    np.testing.assert_allclose(sweep.loc[2, 'sigma_u'].values, results.sigma_u, rtol=1e-10)